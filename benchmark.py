@@ -0,0 +1,376 @@
+"""
+    Filename: Benchmark.py
+
+    Performance benchmarks for WellPlate.
+
+    Run `python benchmark.py` to time, at each plate size (96, 384 and
+    1536 wells):
+
+        - models: bulk edits (fills, numbering, dilutions, copy/paste,
+          editor binding), with the app's undo, search and validation
+          listeners attached;
+        - views: building a plate view, its first paint, wiring it into
+          the controller, and the latency from a click on a well to the
+          sample editor showing it (run under QT_QPA_PLATFORM=offscreen);
+        - formats: saving and loading a plate as binary (.wpl), CSV and
+          JSON, and reading one plate out of a large plate library.
+
+    The plate database is timed for bulk saves and cross-plate sample
+    lookups, reformatting for quadrant stamping and compression of
+    hundreds of plates, worklists for ordering 100,000 cherry-picked
+    transfers, and kinetic stores for building pyramids and drawing
+    curves from them.
+
+    Every benchmark records its best wall time and the peak Python memory
+    (tracemalloc) of one further run. `--save-baseline` stores the results
+    in benchmark_baseline.json; later runs are compared against it and
+    exit with status 1, listing each regression, when a benchmark is
+    slower or uses more memory than the baseline allows (`--tolerance`).
+    `--only models,views` runs some of the suites.
+"""
+
+# Import modules
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import kinetics
+import model
+import plateio
+import reformat
+import repository
+import worklist
+
+# Plate sizes of the per-format benchmarks
+SIZES = (96, 384, 1536)
+
+# Stored results of a reference run
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "benchmark_baseline.json")
+
+# Fraction by which a result may exceed its baseline
+TOLERANCE = 0.25
+
+# Differences below these are noise, never regressions (ms, KiB)
+NOISE_MS = 0.05
+NOISE_KIB = 64
+
+# Results of the benchmarks run: name -> {"ms": wall time, "kib": peak}
+RESULTS = {}
+
+def timeit(fn, repeat=5):
+    """Return the Best Wall Time of `repeat` Calls to `fn` (Seconds)"""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peakMemory(fn):
+    """Return the Peak Python Memory Allocated During a Call to `fn` (Bytes)
+
+    Measured apart from the timed calls, which tracing would slow down.
+    """
+
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def randomPlate(wells=384, barcode="", seed=0):
+    """Return a Fully Populated Plate of Random Samples"""
+
+    rng = np.random.default_rng(seed)
+    plate = model.PlateModel(wells, barcode)
+    plate.fill(
+        sampleID=["S%07d" % i for i in range(seed * wells, (seed + 1) * wells)],
+        volume=rng.uniform(1, 200, wells).round(1),
+        sampleType=rng.integers(1, len(model.SAMPLE_TYPES) + 1, wells),
+        concentration=rng.uniform(0, 100, wells).round(2),
+        description="benchmark sample",
+    )
+    return plate
+
+def report(name, seconds, peak=None):
+    """Print and Record One Benchmark Result"""
+
+    RESULTS[name] = {"ms": seconds * 1000, "kib": None if peak is None else peak / 1024}
+    line = "%-44s %10.3f ms" % (name, seconds * 1000)
+    if peak is not None:
+        line += " %10.1f KiB" % (peak / 1024)
+    print(line)
+
+def measure(name, fn, repeat=5):
+    """Time `fn`, Measure its Peak Memory, and Report Both"""
+    report(name, timeit(fn, repeat), peakMemory(fn))
+
+def benchFormats(wells=384, plates=2000, sizes=SIZES):
+    """Compare the Binary, CSV and JSON Plate Formats"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Single plate save/load, at every size
+        for size in sizes:
+            plate = randomPlate(size, "BENCH")
+            for extension in (".wpl", ".csv", ".json"):
+                path = os.path.join(tmp, "plate" + extension)
+                measure("save %d-well plate (%s)" % (size, extension),
+                        lambda: plateio.savePlate(path, plate))
+                measure("load %d-well plate (%s)" % (size, extension),
+                        lambda: plateio.loadPlates(path))
+                print("%-44s %10d B" % ("  file size", os.path.getsize(path)))
+
+        # Random access into a large library
+        path = os.path.join(tmp, "library.wpl")
+        library = [randomPlate(wells, "P%05d" % i, i) for i in range(plates)]
+        measure("write library of %d plates" % plates,
+                lambda: plateio.writePlates(path, library), repeat=1)
+        rng = np.random.default_rng(1)
+
+        def openOne():
+            with plateio.PlateLibrary(path) as lib:
+                lib[int(rng.integers(plates))]
+
+        measure("open 1 plate from library of %d" % plates, openOne)
+        measure("read all %d plates from library" % plates,
+                lambda: plateio.loadPlates(path), repeat=1)
+
+def benchRepository(wells=384, plates=2000):
+    """Time Bulk Saves and Indexed Lookups in the Plate Database"""
+
+    library = [randomPlate(wells, "P%05d" % i, i) for i in range(plates)]
+    with tempfile.TemporaryDirectory() as tmp:
+        with repository.PlateRepository(os.path.join(tmp, "plates.db")) as repo:
+            measure("save %d plates to database" % plates,
+                    lambda: repo.savePlates(library), repeat=1)
+            sampleID = "S%07d" % (plates * wells // 2)
+            measure("find plates holding one sample ID",
+                    lambda: repo.findSample(sampleID))
+            measure("find plates holding a sample type",
+                    lambda: repo.platesWithType("DNA"))
+            measure("load 1 plate from database",
+                    lambda: repo.loadPlate("P%05d" % (plates // 2)))
+
+def benchReformat(plates=400):
+    """Time Quadrant Stamping and Compression of Many Plates"""
+
+    for wells in (96, 384):
+        stack = model.PlateStack.fromPlates(
+            [randomPlate(wells, "P%05d" % i, i) for i in range(plates)]
+        )
+        measure("stamp %d %d-well plates into %d-well" % (plates, wells, wells * 4),
+                lambda: reformat.applyMap(
+                    reformat.quadrantMap(wells, plates), stack))
+    # Sparse plates, one well in ten occupied
+    stack = model.PlateStack(plates, 384)
+    stack.fill(wells=np.arange(0, 384, 10), sampleID="S", sampleType="DNA")
+    measure("compress %d sparse 384-well plates" % plates,
+            lambda: reformat.applyMap(
+                reformat.compressMap(stack.occupied()), stack))
+
+def benchWorklist(transfers=100000, seed=0):
+    """Time Ordering a Large Cherry-Picking Worklist"""
+
+    rng = np.random.default_rng(seed)
+    # Hits scattered over sparse 384-well plates, packed onto 1536-well plates
+    sources = model.PlateStack(transfers // 96, 384)
+    occupied = rng.random((len(sources), 384)) < 0.25
+    sources.columns["sampleID"][occupied] = "S"
+    sources.columns["volume"][occupied] = 5.0
+    packed = reformat.compressMap(occupied, 1536)
+    # ... listed in no particular order
+    shuffle = rng.permutation(len(packed))
+    wellMap = reformat.WellMap(
+        384, 1536, packed.srcPlate[shuffle], packed.srcWell[shuffle],
+        packed.dstPlate[shuffle], packed.dstWell[shuffle]
+    )
+    picks = worklist.Worklist.fromPlates(wellMap, sources)
+    before = picks.travel()
+    measure("order worklist of %d transfers" % len(picks),
+            picks.optimize, repeat=1)
+    print("%-44s %10.1f %%" % ("  travel saved", 100 * (1 - picks.travel() / before)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "worklist.csv")
+        measure("write worklist of %d transfers" % len(picks),
+                lambda: picks.write(path), repeat=1)
+
+def benchKinetics(wells=1536, timepoints=20000, seed=0):
+    """Time Building a Kinetic Store's Pyramids and Fetching Curves from it"""
+
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = kinetics.KineticStore.create(
+            os.path.join(tmp, "read" + kinetics.EXTENSION), 1, wells,
+            np.arange(timepoints, dtype=np.float64)
+        )
+        for start in range(0, timepoints, kinetics.CHUNK_POINTS):
+            stop = min(start + kinetics.CHUNK_POINTS, timepoints)
+            store.write(0, start, rng.random((wells, stop - start), dtype=np.float32))
+        measure("build pyramids, %d wells x %d points" % (wells, timepoints),
+                store.buildPyramids, repeat=1)
+        plate = store.plate(0)
+        measure("sparklines of %d wells" % wells, plate.sparklines)
+        measure("plot one well at 800 px", lambda: plate.series(7, points=800))
+        measure("plot one well, zoomed to 500 points",
+                lambda: plate.series(7, 9000, 9500, points=800))
+        store.close()
+
+def benchModels(sizes=SIZES):
+    """Time Bulk Edits of a Plate, with the App's Listeners Attached"""
+
+    import history
+    import search
+    import validation
+    for wells in sizes:
+        plate = randomPlate(wells, "BENCH")
+        # Every plate the app shows is watched by these
+        commands = history.CommandStack()
+        commands.watch(plate)
+        search.SearchIndex().addPlate(plate)
+        validation.Validator().watch(plate)
+        everything = np.arange(wells)
+        ids = np.array(["N%07d" % i for i in range(wells)], dtype=model.STRING)
+        measure("%d wells: fill every well" % wells,
+                lambda: plate.fill(everything, sampleID=ids, volume=50.0, sampleType="DNA"))
+        measure("%d wells: number sample IDs" % wells,
+                lambda: plate.incrementIDs(everything, "S-", 1, 1, 5))
+        measure("%d wells: serial dilution" % wells,
+                lambda: plate.serialDilution(everything, 100.0))
+        clip = plate.copyWells(plate.geometry.rectIndices(0, 0, 3, 3))
+        measure("%d wells: paste 4x4 wells" % wells,
+                lambda: plate.pasteWells(clip, wells // 2))
+        measure("%d wells: edit one well" % wells,
+                lambda: plate.setSample(wells // 3, sampleID="EDIT", volume=12.5))
+        measure("%d wells: bind editor to every well" % wells,
+                lambda: plate.commonValues(everything))
+        measure("%d wells: clear every well" % wells, lambda: plate.clear())
+
+def benchViews(sizes=SIZES):
+    """Time Plate Views: Building, First Paint, Wiring and Click-to-Editor"""
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QPoint, Qt
+    from PyQt6.QtTest import QTest
+    from PyQt6.QtWidgets import QApplication
+    import controller
+    import view
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = view.MainWindow()
+    ctrl = controller.PlateCtrl(None, window, restore=False)
+    window.show()
+
+    def build(wells):
+        view.PlateWidget(wells).deleteLater()
+
+    for wells in sizes:
+        plate = randomPlate(wells, "BENCH")
+        measure("%d wells: build plate view" % wells, lambda: build(wells))
+        plateView = view.PlateWidget(wells)
+        plateView.setPlate(plate)
+        plateView.resize(1000, 600)
+        measure("%d wells: paint plate view" % wells, plateView.grab)
+        measure("%d wells: build and wire view in controller" % wells,
+                lambda: ctrl.createPlateView(plate).deleteLater())
+        ctrl.showPlate(plate)
+        app.processEvents()
+        clicks = iter(range(10**9))
+
+        def click():
+            # A different well each time, as when stepping through a plate;
+            # wells move when the editor docks, so their rects are read now
+            index = next(clicks) % wells
+            QTest.mouseClick(ctrl.plateLayout, Qt.MouseButton.LeftButton,
+                             pos=ctrl.plateLayout.wellRects[index].center().toPoint())
+            app.processEvents()
+            # A click that missed its well would pass for a fast one
+            if ctrl.editing is None or list(ctrl.editing) != [index] \
+                    or not ctrl.editor.isVisible():
+                raise RuntimeError("Click on well %s did not open it in the editor"
+                                   % plate.geometry.names[index])
+
+        # The first click docks the editor, resizing the plate view
+        click()
+        measure("%d wells: click well to editor shown" % wells, click, repeat=20)
+        app.processEvents()
+    window.close()
+
+def compare(baseline, results, tolerance=TOLERANCE):
+    """Return a Description of Every Result Worse than its Baseline"""
+
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key, unit, noise in (("ms", "ms", NOISE_MS), ("kib", "KiB", NOISE_KIB)):
+            now, then = result.get(key), base.get(key)
+            if now is None or then is None:
+                continue
+            if now > then * (1 + tolerance) and now - then > noise:
+                regressions.append("%s: %.3f %s, baseline %.3f %s (+%.0f%%)" % (
+                    name, now, unit, then, unit, 100 * (now / then - 1) if then else 100
+                ))
+    return regressions
+
+# Benchmark suites, by name
+SUITES = {
+    "models": benchModels,
+    "views": benchViews,
+    "formats": benchFormats,
+    "repository": benchRepository,
+    "reformat": benchReformat,
+    "worklist": benchWorklist,
+    "kinetics": benchKinetics,
+}
+
+def main(argv=None):
+    """Run the Benchmarks; Return 1 if Any Regressed Against the Baseline"""
+
+    parser = argparse.ArgumentParser(description="WellPlate benchmarks.")
+    parser.add_argument("--only", help="comma-separated suites: %s" % ", ".join(SUITES))
+    parser.add_argument("--baseline", default=BASELINE, help="baseline results (JSON)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown or growth, as a fraction")
+    args = parser.parse_args(argv)
+    names = args.only.split(",") if args.only else list(SUITES)
+    for name in names:
+        if name not in SUITES:
+            parser.error("unknown suite: %s" % name)
+    for name in names:
+        print("== %s" % name)
+        SUITES[name]()
+    if args.save_baseline:
+        # Suites not run keep their stored results
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        baseline.update(RESULTS)
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=1, sort_keys=True)
+        print("Baseline saved to %s" % args.baseline)
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with; run with --save-baseline first")
+        return 0
+    with open(args.baseline) as file:
+        regressions = compare(json.load(file), RESULTS, args.tolerance)
+    if regressions:
+        print("\n%d REGRESSIONS against %s:" % (len(regressions), args.baseline))
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print("No regressions against %s" % args.baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+    Filename: BuildResources.py
+
+    Compiles `resources.qrc` into the importable resource module
+    `resources_rc.py`.
+
+    PyQt6 no longer ships `pyrcc`, so this writes the same Qt resource
+    tables (version 1 layout) that `rcc` would. Importing the generated
+    module registers every file under `:/`, so icons no longer depend on
+    the working directory the application is started from.
+
+    Run `python buildresources.py` after editing `resources.qrc`.
+"""
+
+# Import modules
+import os
+import struct
+import sys
+import xml.etree.ElementTree as ElementTree
+import zlib
+
+# Node flags of the resource tree
+COMPRESSED = 0x01
+DIRECTORY = 0x02
+
+# Compress a file only when that saves at least this fraction of it
+COMPRESS_THRESHOLD = 0.3
+
+def qtHash(name):
+    """Return Qt's Hash of a Resource Name (Used to Order Directory Entries)"""
+
+    h = 0
+    for char in name:
+        h = (h << 4) + ord(char)
+        h ^= (h & 0xF0000000) >> 23
+        h &= 0x0FFFFFFF
+    return h
+
+def readQrc(path):
+    """Return {Resource Path: File Path} for the Files Listed in a .qrc"""
+
+    base = os.path.dirname(os.path.abspath(path))
+    files = {}
+    for resource in ElementTree.parse(path).getroot().iter("qresource"):
+        prefix = resource.get("prefix", "/").strip("/")
+        for entry in resource.iter("file"):
+            alias = entry.get("alias") or entry.text.strip()
+            name = "/".join(part for part in (prefix, alias) if part)
+            files[name] = os.path.join(base, entry.text.strip())
+    return files
+
+def buildTree(files):
+    """Nest Resource Paths into Directories: {Name: Subtree or File Path}"""
+
+    tree = {}
+    for name, path in files.items():
+        *dirs, leaf = name.split("/")
+        node = tree
+        for part in dirs:
+            node = node.setdefault(part, {})
+        node[leaf] = path
+    return tree
+
+def compileResources(files):
+    """Return the (Struct, Names, Data) Tables for a Set of Resource Files"""
+
+    names, data = bytearray(), bytearray()
+    nameOffsets = {}
+
+    def addName(name):
+        if name not in nameOffsets:
+            nameOffsets[name] = len(names)
+            names.extend(struct.pack(">HI", len(name), qtHash(name)))
+            names.extend(name.encode("utf-16-be"))
+        return nameOffsets[name]
+
+    def addData(path):
+        with open(path, "rb") as file:
+            content = file.read()
+        flags = 0
+        packed = struct.pack(">I", len(content)) + zlib.compress(content, 9)
+        if len(packed) <= len(content) * (1 - COMPRESS_THRESHOLD):
+            content, flags = packed, COMPRESSED
+        offset = len(data)
+        data.extend(struct.pack(">I", len(content)))
+        data.extend(content)
+        return offset, flags
+
+    # Nodes are written breadth-first so every directory's children are
+    # contiguous, sorted by name hash as Qt's lookup expects
+    nodes = [None]
+    queue = [(0, "", buildTree(files))]
+    while queue:
+        index, name, tree = queue.pop(0)
+        first = len(nodes)
+        children = sorted(tree.items(), key=lambda item: qtHash(item[0]))
+        nodes.extend([None] * len(children))
+        nodes[index] = struct.pack(
+            ">IHII", addName(name) if name else 0, DIRECTORY, len(children), first
+        )
+        for k, (child, entry) in enumerate(children):
+            if isinstance(entry, dict):
+                queue.append((first + k, child, entry))
+            else:
+                offset, flags = addData(entry)
+                nodes[first + k] = struct.pack(
+                    ">IHHHI", addName(child), flags, 0, 1, offset
+                )
+    return b"".join(nodes), bytes(names), bytes(data)
+
+def formatBytes(name, blob, width=76):
+    """Return Python Source Assigning a Bytes Literal, Wrapped to `width`"""
+
+    text = "".join("\\x%02x" % byte for byte in blob)
+    step = width - (width % 4)
+    lines = ['    b"%s"' % text[i:i + step] for i in range(0, len(text), step)]
+    return "%s = (\n%s\n)\n" % (name, "\n".join(lines))
+
+def writeModule(qrc, output):
+    """Compile a .qrc File into a Python Resource Module"""
+
+    tables = compileResources(readQrc(qrc))
+    with open(output, "w", encoding="utf-8") as file:
+        file.write(
+            "# Resource object code, generated from %s by buildresources.py\n"
+            "# Do not edit: changes are lost when the module is rebuilt\n\n"
+            "from PyQt6 import QtCore\n\n" % os.path.basename(qrc)
+        )
+        for name, blob in zip(("qt_resource_struct", "qt_resource_name",
+                               "qt_resource_data"), tables):
+            file.write(formatBytes(name, blob) + "\n")
+        file.write(
+            "def qInitResources():\n"
+            "    QtCore.qRegisterResourceData(\n"
+            "        0x01, qt_resource_struct, qt_resource_name, qt_resource_data\n"
+            "    )\n\n"
+            "def qCleanupResources():\n"
+            "    QtCore.qUnregisterResourceData(\n"
+            "        0x01, qt_resource_struct, qt_resource_name, qt_resource_data\n"
+            "    )\n\n"
+            "qInitResources()\n"
+        )
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    qrc = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, "resources.qrc")
+    output = sys.argv[2] if len(sys.argv) > 2 else os.path.join(here, "resources_rc.py")
+    writeModule(qrc, output)
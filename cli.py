@@ -0,0 +1,389 @@
+"""
+    Filename: CLI.py
+
+    Headless command line for batch work on plate files, e.g. in pipelines:
+
+        wellplate.py validate PATH... [--rules FILE]
+        wellplate.py convert PATH... --to {wpl,csv,json} [-o DIR]
+        wellplate.py reformat PATH... {--stamp | --split | --compress}
+                              -o FILE.wpl [--worklist FILE.csv]
+        wellplate.py export PATH... -o FILE.csv
+        wellplate.py merge PATH... -o FILE.wpl
+
+    A PATH is a plate file (a .wpl plate library, .csv or .json) or a
+    directory, searched for plate files; CSV files there without a Well
+    column (e.g. worklists) are skipped with a warning. Files are read
+    and processed in parallel, one file per worker process (--jobs; by
+    default one per core), and results are reported in file order.
+
+    Nothing here imports Qt, and NumPy and the plate modules are only
+    imported once a command runs, so the GUI entry point can hand off to
+    the command line without paying for either.
+"""
+
+# Import modules
+import argparse
+import os
+import sys
+
+# Plate file extensions found in directories
+PLATE_EXTENSIONS = (".wpl", ".csv", ".json")
+
+# Formats `convert` writes
+CONVERT_FORMATS = ("wpl", "csv", "json")
+
+# Commands, by name
+COMMANDS = ("validate", "convert", "reformat", "export", "merge")
+
+def isPlateCSV(path):
+    """Check Whether a CSV File Lists Wells (has a Well Column)"""
+
+    import csv
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            header = next(csv.reader(file), [])
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return False
+    return "Well" in header
+
+def plateFiles(paths):
+    """Expand Paths to Plate Files, Searching Directories (in Name Order)"""
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    extension = os.path.splitext(name)[1].lower()
+                    if extension not in PLATE_EXTENSIONS:
+                        continue
+                    found = os.path.join(root, name)
+                    if extension == ".csv" and not isPlateCSV(found):
+                        print("warning: skipping %s: not a plate file (no Well column)"
+                              % found, file=sys.stderr)
+                        continue
+                    files.append(found)
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError("No such file or directory: %s" % path)
+    return files
+
+def runParallel(fn, items, jobs=None):
+    """Return `fn(item)` for Every Item, Computed Across Worker Processes"""
+
+    items = list(items)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(items) < 2:
+        return [fn(item) for item in items]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(min(jobs, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+def plateName(path, plate, number):
+    """Name a Plate in Reports: its Barcode, or its Number in the File"""
+    return "%s:%s" % (path, plate.barcode or "#%d" % (number + 1))
+
+# Worker functions: top-level, so worker processes can run them
+
+def readFile(path):
+    """Read Every Plate of a File; Errors Name the File"""
+
+    import struct
+    import plateio
+    try:
+        return plateio.loadPlates(path)
+    except (ValueError, KeyError, struct.error) as err:
+        message = str(err.args[0]) if err.args else str(err)
+        if path not in message:
+            message = "%s: %s" % (path, message)
+        raise ValueError(message) from err
+
+def validateFile(job):
+    """Check the Plates of a File; Return Issues and the Sample IDs Used
+
+    Across-plate duplicate checks need every plate, so they are left to
+    the caller, which gets (sample ID, plate name, well) for each sample.
+    """
+
+    path, rulesPath = job
+    import validation
+    rules = validation.loadRules(rulesPath) if rulesPath else validation.defaultRules()
+    across = any(isinstance(rule, validation.DuplicateRule) and rule.acrossPlates
+                 for rule in rules)
+    validator = validation.Validator([
+        rule for rule in rules
+        if not (isinstance(rule, validation.DuplicateRule) and rule.acrossPlates)
+    ])
+    issues, ids = [], []
+    for number, plate in enumerate(readFile(path)):
+        name = plateName(path, plate, number)
+        validator.watch(plate)
+        issues += [(name,) + issue for issue in validator.issues(plate)]
+        validator.unwatch(plate)
+        if across:
+            wells = plate.sampleID != ""
+            ids += zip(plate.sampleID[wells].tolist(), [name] * int(wells.sum()),
+                       plate.geometry.names[wells].tolist())
+    return issues, ids
+
+def convertFile(job):
+    """Convert a Plate File; Return the Paths Written"""
+
+    path, extension, directory, stem = job
+    import plateio
+    plates = readFile(path)
+    if extension == "wpl":
+        targets = [(os.path.join(directory, stem + ".wpl"), plates)]
+    elif len(plates) == 1:
+        targets = [(os.path.join(directory, "%s.%s" % (stem, extension)), plates)]
+    else:
+        # One file per plate of a library, named by barcode; plates
+        # without one, or repeating one, are told apart by their number
+        barcodes = [plate.barcode for plate in plates]
+        names = [
+            barcode if barcode and barcodes.count(barcode) == 1
+            else "%s-%03d" % (barcode, number + 1) if barcode
+            else "%03d" % (number + 1)
+            for number, barcode in enumerate(barcodes)
+        ]
+        targets = [
+            (os.path.join(directory, "%s-%s.%s" % (stem, name, extension)), [plate])
+            for name, plate in zip(names, plates)
+        ]
+    written = []
+    for target, contents in targets:
+        if os.path.abspath(target) == os.path.abspath(path):
+            raise ValueError("Converting %s would overwrite it" % path)
+        if extension == "wpl":
+            plateio.writePlates(target, contents)
+        else:
+            plateio.savePlate(target, contents[0])
+        written.append(target)
+    return written
+
+def exportFile(path):
+    """Return the Samples of a File's Plates as CSV Rows (Occupied Wells Only)"""
+
+    import model
+    import plateio
+    rows = []
+    for number, plate in enumerate(readFile(path)):
+        wells = plate.occupied()
+        columns = [plate.columns[field][wells].tolist() for field in plateio.CSV_COLUMNS]
+        columns[2] = [model.typeName(code) for code in columns[2]]
+        for k in (1, 3):
+            columns[k] = ["" if v != v else repr(v) for v in columns[k]]
+        barcode = plate.barcode or "%s#%d" % (os.path.basename(path), number + 1)
+        rows += [
+            [barcode, name] + values
+            for name, *values in zip(plate.geometry.names[wells].tolist(), *columns)
+        ]
+    return rows
+
+# Commands: each takes the parsed arguments and returns the exit status
+
+def readAll(files, jobs):
+    """Read the Plates of Every File, in Parallel; Return them in File Order"""
+    return [plate for plates in runParallel(readFile, files, jobs) for plate in plates]
+
+def validate(args):
+    """Check Plates Against the Validation Rules; Fail if Any Error is Found"""
+
+    if args.rules:
+        # Fail on a bad rules file once, before any worker reads it
+        import validation
+        try:
+            validation.loadRules(args.rules)
+        except ValueError as err:
+            raise ValueError("%s: %s" % (args.rules, err)) from err
+    files = plateFiles(args.paths)
+    results = runParallel(validateFile, [(path, args.rules) for path in files], args.jobs)
+    issues = [issue for fileIssues, _ in results for issue in fileIssues]
+    # Sample IDs shared by wells of different plates
+    owners = {}
+    for _, ids in results:
+        for sampleID, name, well in ids:
+            owners.setdefault(sampleID, []).append((name, well))
+    for sampleID, wells in owners.items():
+        plates = {name for name, _ in wells}
+        if len(plates) < 2:
+            continue
+        for name, well in wells:
+            others = sum(other != name for other, _ in wells)
+            issues.append((name, well, "error", "Sample ID %s is used by %d other well%s "
+                           "on other plates" % (sampleID, others, "s" if others > 1 else "")))
+    for name, well, severity, message in issues:
+        print("%s:%s: %s: %s" % (name, well, severity, message))
+    errors = sum(severity == "error" for _, _, severity, _ in issues)
+    print("%d files: %d errors, %d warnings" % (
+        len(files), errors, len(issues) - errors
+    ), file=sys.stderr)
+    return 1 if errors else 0
+
+def convertJobs(files, extension, output):
+    """Return the Jobs of `convertFile`: (Path, Format, Directory, Stem)
+
+    Files written to one directory are named after their source, so
+    sources differing only by extension (one.csv, one.json) keep it in
+    the name (one-csv, one-json).
+    """
+
+    places = [
+        (output or os.path.dirname(path), os.path.splitext(os.path.basename(path)))
+        for path in files
+    ]
+    shared = {}
+    for directory, (stem, _) in places:
+        key = os.path.normcase(os.path.join(directory, stem))
+        shared[key] = shared.get(key, 0) + 1
+    jobs = []
+    for path, (directory, (stem, source)) in zip(files, places):
+        if shared[os.path.normcase(os.path.join(directory, stem))] > 1:
+            stem = "%s-%s" % (stem, source.lstrip(".").lower())
+        jobs.append((path, extension, directory, stem))
+    return jobs
+
+def convert(args):
+    """Convert Plate Files to Another Format"""
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    files = plateFiles(args.paths)
+    jobs = convertJobs(files, args.to, args.output)
+    sources = {}
+    for path, written in zip(files, runParallel(convertFile, jobs, args.jobs)):
+        for target in written:
+            key = os.path.normcase(os.path.abspath(target))
+            if key in sources:
+                raise ValueError("%s was written from both %s and %s" % (
+                    target, sources[key], path
+                ))
+            sources[key] = path
+            print(target)
+    return 0
+
+def reformatPlates(args):
+    """Stamp, Split or Compress Plates into a New Plate Library"""
+
+    import model
+    import plateio
+    import reformat
+    plates = readAll(plateFiles(args.paths), args.jobs)
+    if not plates:
+        raise ValueError("No plates to reformat")
+    wells = plates[0].wells
+    if any(plate.wells != wells for plate in plates):
+        raise ValueError("Only plates of one format can be reformatted together")
+    source = model.PlateStack.fromPlates(plates)
+    if args.stamp:
+        wellMap = reformat.quadrantMap(wells, len(plates))
+    elif args.split:
+        wellMap = reformat.splitMap(wells, len(plates))
+    else:
+        wellMap = reformat.compressMap(source.occupied(), args.dest_wells or wells)
+    stem = args.barcode or os.path.splitext(os.path.basename(args.output))[0]
+    barcodes = ["%s-%02d" % (stem, k + 1) for k in range(wellMap.destPlates)]
+    dest = reformat.applyMap(wellMap, source, barcodes=barcodes)
+    plateio.writePlates(args.output, list(dest))
+    print("%d plates of %d wells written to %s" % (len(dest), dest.wells, args.output))
+    if args.worklist:
+        import worklist
+        transfers = worklist.Worklist.fromPlates(wellMap, source, barcodes)
+        transfers.optimize()
+        transfers.write(args.worklist)
+        print("%d transfers with %d tips written to %s" % (
+            len(transfers), transfers.tipChanges(), args.worklist
+        ))
+    return 0
+
+def export(args):
+    """Write the Samples of Every Plate to One CSV Table"""
+
+    import csv
+    import plateio
+    files = plateFiles(args.paths)
+    with open(args.output, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Plate", "Well"] + list(plateio.CSV_COLUMNS.values()))
+        count = 0
+        for rows in runParallel(exportFile, files, args.jobs):
+            writer.writerows(rows)
+            count += len(rows)
+    print("%d samples written to %s" % (count, args.output))
+    return 0
+
+def merge(args):
+    """Gather the Plates of Many Files into One Plate Library"""
+
+    import plateio
+    plates = readAll(plateFiles(args.paths), args.jobs)
+    barcodes = [plate.barcode for plate in plates if plate.barcode]
+    repeated = len(barcodes) - len(set(barcodes))
+    if repeated:
+        print("warning: %d plates repeat a barcode" % repeated, file=sys.stderr)
+    plateio.writePlates(args.output, plates)
+    print("%d plates written to %s" % (len(plates), args.output))
+    return 0
+
+def createParser():
+    """Build the Argument Parser of Every Command"""
+
+    parser = argparse.ArgumentParser(
+        prog="wellplate.py", description="Batch processing of WellPlate plate files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name, fn, help):
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.add_argument("paths", nargs="+", metavar="PATH",
+                         help="plate files, or directories of plate files")
+        sub.add_argument("-j", "--jobs", type=int, default=None,
+                         help="worker processes (default: one per core)")
+        sub.set_defaults(run=fn)
+        return sub
+
+    sub = command("validate", validate, "Check plates against the validation rules")
+    sub.add_argument("--rules", help="JSON rule specs (default: the built-in rules)")
+
+    sub = command("convert", convert, "Convert plate files to another format")
+    sub.add_argument("--to", choices=CONVERT_FORMATS, required=True)
+    sub.add_argument("-o", "--output", help="output directory (default: beside each file)")
+
+    sub = command("reformat", reformatPlates, "Stamp, split or compress plates")
+    mode = sub.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--stamp", action="store_true",
+                      help="stamp plates into the quadrants of 4x-well plates")
+    mode.add_argument("--split", action="store_true",
+                      help="split plates into their four quadrants")
+    mode.add_argument("--compress", action="store_true",
+                      help="pack the occupied wells onto as few plates as possible")
+    sub.add_argument("--dest-wells", type=int, help="format compressed onto")
+    sub.add_argument("--barcode", help="barcode stem of the new plates")
+    sub.add_argument("--worklist", help="also write the transfer worklist (CSV)")
+    sub.add_argument("-o", "--output", required=True, help="plate library to write")
+
+    sub = command("export", export, "Write every sample to one CSV table")
+    sub.add_argument("-o", "--output", required=True, help="CSV file to write")
+
+    sub = command("merge", merge, "Gather plates into one plate library")
+    sub.add_argument("-o", "--output", required=True, help="plate library to write")
+    return parser
+
+def wants(argv):
+    """Check Whether Command-Line Arguments Ask for a Batch Command"""
+    return bool(argv) and argv[0] in COMMANDS + ("-h", "--help")
+
+def main(argv=None):
+    """Run a Command; Return the Exit Status"""
+
+    args = createParser().parse_args(argv)
+    try:
+        return args.run(args)
+    except (OSError, ValueError, KeyError) as err:
+        print("wellplate: error: %s" % err, file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
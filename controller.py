@@ -15,74 +15,964 @@
 """
 
 # Import libraries and modules
-from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QApplication, QFileDialog, QInputDialog, QMessageBox, QProgressDialog
+)
+from collections import deque
 from functools import partial
-from random import randint
+import os
+import time
+import numpy as np
 import view
 import model
+import history
+import search
+import session
+import validation
+import workers
+# File formats, the plate database and the session journal are imported
+# when first used (see choosePlate, getRepository, restoreSession and
+# workers), to keep start-up fast
+
+# Window size for each plate format
+WINDOW_SIZES = {96: (800, 500), 384: (1400, 800), 1536: (1400, 800)}
+
+# File types offered by the open and save dialogs
+FILE_FILTER = (
+    "Plate Files (*.wpl *.csv *.json);;WellPlate Library (*.wpl);;"
+    "CSV Files (*.csv);;JSON Files (*.json)"
+)
+
+# Maximum number of search results listed
+SEARCH_LIMIT = 200
+
+# Orders in which bulk operations walk the selected wells
+ORDERS = ["Row by row", "Column by column"]
+
+# Milliseconds a task runs before its progress dialog appears
+PROGRESS_DELAY = 400
+
+# Seconds of each event-loop pass spent opening plates delivered by tasks
+RECEIVE_SLICE = 0.02
+
+# File types offered when importing sample manifests
+MANIFEST_FILTER = "Sample Manifests (*.csv *.tsv *.txt);;All Files (*)"
+
+# Manifest import order that follows the wells selected on the plate shown
+SELECTED_ORDER = "Selected wells"
+
+# File types offered when exporting liquid-handler worklists
+WORKLIST_FILTER = "CSV Files (*.csv)"
+
+# Library entry that loads every plate of a plate library
+ALL_PLATES = "All plates"
+
+# File types offered when importing plate-reader data
+READOUT_FILTER = "Plate Reader Data (*.csv *.tsv *.txt);;All Files (*)"
+
+# File types offered when importing kinetic reads
+KINETIC_FILTER = (
+    "Kinetic Reads (*.csv *.tsv *.txt);;Kinetic Stores (*.wpk);;All Files (*)"
+)
+
+# Points of the kinetic curve drawn inside each well
+SPARKLINE_POINTS = 32
+
+# Milliseconds between checks whether the session journal needs compacting
+AUTOSAVE_INTERVAL = 30000
+
+# Rule problems listed below the sample editor
+ISSUES_SHOWN = 5
+
+# Slots timed when profiling (--profile): the plate launchers, file and
+# database actions, well clicks and edits
+PROFILED_SLOTS = (
+    "launch94Plate", "launch384Plate", "launch1536Plate", "showPlate",
+    "loadPlate", "savePlate", "openFromDatabase", "saveToDatabase",
+    "importManifest", "importReadout", "importKinetics", "receivePlates",
+    "editWell", "editSelection", "saveSample", "undo", "redo", "copyWells",
+    "pasteWells", "clearWells", "incrementIDs", "serialDilution", "searchText",
+    "flushScans",
+)
+
+# File types offered when saving profiles
+PROFILE_FILTER = "JSON Files (*.json)"
+
+# Milliseconds between refreshes of the profiler panel
+PROFILER_REFRESH = 1000
+
+# Milliseconds scans gather before they are assigned together
+SCAN_FLUSH_DELAY = 30
+
+# Scans listed in the rapid-entry panel
+SCANS_LISTED = 200
+
+# Numeric sample fields and their labels in the sample editor
+NUMERIC_FIELDS = {"volume": "Volume", "concentration": "Concentration"}
 
 class PlateCtrl:
     """Controller Class for WellPlate"""
 
-    def __init__(self, model, view):
-        """Class Initializer"""
+    def __init__(self, model, view, restore=True, profile=False):
+        """Class Initializer
+
+        Without `restore` the last session is not offered and edits are
+        not journaled (e.g. for benchmarks). With `profile` slot run
+        times, paint times and event-loop lag are recorded (see
+        profiling.py).
+        """
 
         # First, we need to get an instance of the view
         # This instance will allow access to the view's public interface
         self.view = view
         self.model = model
+        # The plate database is opened on first use
+        self.repository = None
+        # Text index over every plate loaded in this session
+        self.searchIndex = search.SearchIndex()
+        self.searchPanel = None
+        # Rule checks of every plate open, shown as well outlines
+        self.validator = validation.Validator(self.loadRules())
+        self.validator.addListener(self.validityChanged)
+        # Imported plate-reader reads, normalized, and their heatmaps by read
+        self.readoutPanel = None
+        self.reads = None
+        self.levels = None
+        self.scales = None
+        self.heatmaps = {}
+        # Plot of the kinetic read of the well clicked
+        self.kineticPanel = None
+        # Map, source plates and barcodes of the last reformat, for its worklist
+        self.lastReformat = None
+        # Open plates and their cached views; built with the window chrome
+        self.session = None
+        self.overview = None
+        self.plateLayout = None
+        # Undo/redo history of every plate shown
+        self.history = history.CommandStack()
+        # Wells copied with Copy, for Paste into any plate
+        self.clipboard = None
+        # The sample editor is built once, then re-bound on every click
+        self.editor = None
+        self.editing = None
+        # Barcode-scanner entry, while it is on
+        self.rapidEntry = None
+        self.scanPanel = None
+        # Background tasks, and plates they delivered waiting to be opened
+        self.tasks = workers.TaskRunner()
+        self.arrivals = deque()
+        self.receiving = False
+        # Journal of every edit, for recovery at the next start-up; started
+        # once the event loop runs, after offering to restore the last session
+        self.journal = None
+        self.autosave = QTimer(self.view)
+        self.autosave.setInterval(AUTOSAVE_INTERVAL)
+        self.autosave.timeout.connect(self.compactJournal)
+        if restore:
+            QTimer.singleShot(0, self.restoreSession)
+        # Slots are wrapped before any signal is connected to them
+        self.profiler = None
+        self.profilerPanel = None
+        if profile:
+            self.startProfiling()
         # Connect Signals and slots
         self.connectStartUpSignals()
 
     def launch94Plate(self):
         """Launch 94-Well Plate Interface"""
-
-        # Set window properties
-        self.view.setWindowTitle("WellPlate: 94-Well Plate")
-        self.view.setFixedSize(800, 500)
-        # Create menus and toolbars
-        self.view.createActions()
-        self.view.createMenus()
-        self.view.createToolBars()
-        # Create plate layout and set is as the central widget
-        self.plateLayout = view.Plate96()
-        self.view.setCentralWidget(self.plateLayout)
-        # Connect signals and slots
-        self.connectActions()
-        # Connect Plate Buttons
-        self.connectWells()
+        self.showPlate(model.PlateModel(96))
 
     def launch384Plate(self):
         """Launch 384-Well Plate Interface"""
+        self.showPlate(model.PlateModel(384))
+
+    def launch1536Plate(self):
+        """Launch 1536-Well Plate Interface"""
+        self.showPlate(model.PlateModel(1536))
 
+    def showPlate(self, plate):
+        """Show a Plate Model in the Matching Plate Interface"""
+
+        self.openPlates([plate], show=False)
         # Set window properties
-        self.view.setWindowTitle("WellPlate: 384-Well Plate")
-        self.view.setFixedSize(1400, 800)
-        # Create menus and toolbars
+        self.view.setWindowTitle("WellPlate: %d-Well Plate" % plate.wells)
+        self.view.setFixedSize(*WINDOW_SIZES.get(plate.wells, (1400, 800)))
+        # Raise the plate's view, built only if it is not cached
+        if self.plateLayout is not None:
+            self.plateLayout.setHeatmap(None)
+        self.plateLayout = self.session.show(plate)
+        self.model = plate
+        self.overview.setCurrent(plate)
+        self.overlayRead()
+        self.showKinetics()
+        self.plateLayout.setProblems(self.validator.severities(plate))
+        # Keep search matches highlighted on whichever plate is shown
+        if self.searchPanel is not None and self.searchPanel.isVisible():
+            self.plateLayout.setHighlighted(search.matchWells(
+                plate, self.searchPanel.findText.text(),
+                self.searchPanel.matchCase.isChecked()
+            ))
+        # Scans carry on into the plate shown
+        if self.rapidEntry is not None:
+            self.rapidEntry.setPlate(plate, self.excludedWells(plate))
+            self.flushScans()
+            return
+        # The view keeps its selection; re-open it in the editor
+        selection = self.plateLayout.selection()
+        if len(selection):
+            self.editWells(selection)
+        else:
+            self.editing = None
+            self.editor.hide()
+
+    def openPlates(self, plates, show=True):
+        """Add Plates to the Session, Showing the First
+
+        Plates are only indexed and listed in the plate overview here; a
+        plate widget is built when a plate is first shown.
+        """
+
+        # Menus, toolbars and docks are built for the first plate only
+        if self.session is None:
+            self.createChrome()
+        for plate in plates:
+            if plate in self.session:
+                continue
+            self.session.open(plate)
+            self.searchIndex.addPlate(plate)
+            self.history.watch(plate)
+            self.validator.watch(plate)
+            if self.journal is not None:
+                self.journal.watch(plate)
+            self.overview.addPlate(plate)
+        if len(self.session) > 1 and not self.overview.isVisible():
+            self.overview.show()
+        if show:
+            self.showPlate(plates[0])
+
+    def loadRules(self):
+        """Return the Validation Rules of ~/.wellplate/rules.json, or the Defaults"""
+
+        if not os.path.exists(validation.RULES_PATH):
+            return None
+        try:
+            return validation.loadRules(validation.RULES_PATH)
+        except (OSError, ValueError, TypeError) as err:
+            QMessageBox.warning(
+                self.view, "Validation Rules",
+                "Cannot read %s; using the default rules:\n%s" % (validation.RULES_PATH, err)
+            )
+            return None
+
+    def validityChanged(self, plate, wells):
+        """Redraw the Wells of the Plate Shown that Started or Stopped Failing"""
+
+        if plate is self.model and self.plateLayout is not None:
+            self.plateLayout.setProblems(self.validator.severities(plate), wells)
+
+    def createChrome(self):
+        """Create the Menus, Toolbars, Sample Editor and Plate Stack"""
+
         self.view.createActions()
         self.view.createMenus()
         self.view.createToolBars()
-        # Create plate layout and set is as the central widget
-        self.plateLayout = view.Plate384()
-        self.view.setCentralWidget(self.plateLayout)
+        self.session = session.PlateSession(
+            self.view.createPlateStack(), self.createPlateView
+        )
+        self.createEditor()
+        # Plate overview, shown once a second plate is opened
+        self.overview = view.PlateOverview(self.view)
+        self.view.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.overview)
+        self.overview.hide()
+        self.overview.plateActivated.connect(self.showPlate)
         # Connect signals and slots
         self.connectActions()
+
+    def createPlateView(self, plate):
+        """Build the View of a Plate; it Repaints Itself as the Plate Changes"""
+
+        plateView = view.PlateWidget(plate.wells)
+        plateView.setPlate(plate)
+        if self.profiler is not None:
+            self.profiler.watchPaints(plateView, "%d-well plate" % plate.wells)
         # Connect Plate Buttons
-        self.connectWells()
+        self.connectWells(plateView)
+        return plateView
+
+    def listPlates(self):
+        """Fill the Plates Menu with the Plates Open in this Session"""
+
+        menu = self.view.menu_plates
+        menu.clear()
+        menu.addAction(self.overview.toggleViewAction())
+        menu.addSeparator()
+        menu.addAction(self.view.action_stampQuadrants)
+        menu.addAction(self.view.action_splitQuadrants)
+        menu.addAction(self.view.action_compressPlates)
+        menu.addSeparator()
+        for number, plate in enumerate(self.session.plates, 1):
+            action = menu.addAction("%d. %s (%d wells)" % (
+                number, plate.barcode or "Untitled", plate.wells
+            ))
+            action.setCheckable(True)
+            action.setChecked(plate is self.model)
+            action.triggered.connect(partial(self.showPlate, plate))
+
+    def stampQuadrants(self):
+        """Stamp the Open Plates of the Shown Format, Four at a Time, into Quadrants"""
+
+        import reformat
+        plates = [p for p in self.session.plates if p.wells == self.model.wells]
+        try:
+            wellMap = reformat.quadrantMap(self.model.wells, len(plates))
+        except ValueError as err:
+            QMessageBox.information(self.view, "Stamp into Quadrants", str(err))
+            return
+        self.reformatPlates("Stamp into Quadrants", wellMap, plates)
+
+    def splitQuadrants(self):
+        """Split the Plate Shown into Four Plates, One per Quadrant"""
+
+        import reformat
+        try:
+            wellMap = reformat.splitMap(self.model.wells)
+        except ValueError as err:
+            QMessageBox.information(self.view, "Split into Quadrants", str(err))
+            return
+        self.reformatPlates("Split into Quadrants", wellMap, [self.model])
+
+    def compressPlates(self):
+        """Pack the Samples of the Open Plates of the Shown Format onto New Plates"""
+
+        import reformat
+        title = "Compress Plates"
+        plates = [p for p in self.session.plates if p.wells == self.model.wells]
+        order, ok = QInputDialog.getItem(self.view, title, "Fill wells:", ORDERS, 0, False)
+        if not ok:
+            return
+        stack = model.PlateStack.fromPlates(plates)
+        wellMap = reformat.compressMap(
+            stack.occupied(), order="column" if order == ORDERS[1] else "row"
+        )
+        if not len(wellMap):
+            QMessageBox.information(self.view, title, "The plates hold no samples")
+            return
+        self.reformatPlates(title, wellMap, stack)
+
+    def reformatPlates(self, title, wellMap, source):
+        """Carry Out a Reformat onto New Plates and Open Them"""
+
+        import reformat
+        stem, ok = QInputDialog.getText(
+            self.view, title, "Barcode stem for the new plates:",
+            text=self.model.barcode or "PLATE"
+        )
+        if not ok or not stem.strip():
+            return
+        barcodes = [
+            "%s-%02d" % (stem.strip(), k) for k in range(1, wellMap.destPlates + 1)
+        ]
+        if not isinstance(source, model.PlateStack):
+            source = model.PlateStack.fromPlates(source)
+        stack = reformat.applyMap(wellMap, source, barcodes=barcodes)
+        # The stacked source is a copy, kept for the reformat's worklist
+        self.lastReformat = (wellMap, source, barcodes)
+        self.view.action_exportWorklist.setEnabled(True)
+        self.openPlates(list(stack))
+        self.view.statusBar().showMessage(
+            "Moved %d samples onto %d %d-well plates"
+            % (np.count_nonzero(stack.occupied()), len(stack), stack.wells)
+        )
+
+    def exportWorklist(self):
+        """Write the Transfers of the Last Reformat as a Liquid-Handler Worklist"""
+
+        import worklist
+        title = "Export Worklist"
+        wellMap, source, barcodes = self.lastReformat
+        try:
+            transfers = worklist.Worklist.fromPlates(wellMap, source, barcodes)
+        except ValueError as err:
+            QMessageBox.information(self.view, title, str(err))
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self.view, title, barcodes[0] + "-worklist.csv", WORKLIST_FILTER
+        )
+        if not path:
+            return
+        # Ordering the transfers can take a few seconds for large worklists
+        self.runTask(
+            title, "Ordering %d transfers" % len(transfers),
+            workers.writeWorklist, path, transfers,
+            onResult=lambda tips: self.view.statusBar().showMessage(
+                "Wrote %d transfers (%d tips) to %s"
+                % (len(transfers), tips, os.path.basename(path))
+            )
+        )
 
     def loadPlate(self):
         """Load Saved Plate Interface"""
 
-        # Generate random color hex code
-        r = lambda: randint(0,255)
-        # Give button a random color
-        self.view.StartUpBtns["load"].setStyleSheet("""
-            font-size: 16px; font-weight: bold;
-            background-color: #%02X%02X%02X
-        """ % (r(), r(), r()))
+        # Ask for a plate file
+        path, _ = QFileDialog.getOpenFileName(
+            self.view, "Load Plate Layout", "", FILE_FILTER
+        )
+        if not path:
+            return
+        try:
+            ok, index = self.choosePlate(path)
+        except (OSError, ValueError, KeyError) as err:
+            QMessageBox.critical(
+                self.view, "Load Plate Layout",
+                "Could not load %s:\n%s" % (path, err)
+            )
+            return
+        if not ok:
+            return
+        # Plates are read on a worker thread and opened as they arrive;
+        # the first one is shown
+        first = [True]
+
+        def receive(plates):
+            self.receivePlates(plates, show=first[0])
+            first[0] = False
+
+        self.runTask(
+            "Load Plate Layout", "Loading %s" % os.path.basename(path),
+            workers.readPlates, path, index, onPartial=receive
+        )
+
+    def importManifest(self):
+        """Import a Sample Manifest into New Plates"""
+
+        title = "Import Manifest"
+        path, _ = QFileDialog.getOpenFileName(self.view, title, "", MANIFEST_FILTER)
+        if not path:
+            return
+        formats = [str(wells) for wells in WINDOW_SIZES]
+        wells, ok = QInputDialog.getItem(self.view, title, "Plate format:", formats, 0, False)
+        if not ok:
+            return
+        wells = int(wells)
+        # Samples may also follow the wells selected on a plate of that format
+        orders = list(ORDERS)
+        if self.plateLayout is not None and self.model.wells == wells \
+                and len(self.plateLayout.selection()):
+            orders.append(SELECTED_ORDER)
+        order, ok = QInputDialog.getItem(
+            self.view, title, "Fill wells (unless the manifest names them):",
+            orders, 0, False
+        )
+        if not ok:
+            return
+        if order == SELECTED_ORDER:
+            order = self.plateLayout.selection()
+        else:
+            order = "column" if order == ORDERS[1] else "row"
+        # Plates are opened as they are filled; the first one is shown
+        first = [True]
+
+        def receive(plates):
+            self.receivePlates(plates, show=first[0])
+            first[0] = False
+
+        import importer
+        self.runTask(
+            title, "Importing %s" % os.path.basename(path),
+            workers.importManifest, path, wells, order, importer.stem(path),
+            onPartial=receive,
+            onResult=lambda samples: self.view.statusBar().showMessage(
+                "Imported %d samples from %s" % (samples, os.path.basename(path))
+            )
+        )
+
+    def choosePlate(self, path):
+        """Ask Which Plate of a Plate Library to Load
+
+        Returns (ok, index), where index None loads every plate.
+        """
+
+        import plateio
+        if not path.lower().endswith(plateio.EXTENSION):
+            return True, None
+        # Only the library's index is read here
+        with plateio.PlateLibrary(path) as library:
+            if len(library) == 1:
+                return True, None
+            names = [ALL_PLATES] + [
+                barcode or "Plate %d" % (i + 1)
+                for i, barcode in enumerate(library.barcodes())
+            ]
+        name, ok = QInputDialog.getItem(
+            self.view, "Load Plate Layout", "Plate:", names, 0, False
+        )
+        if not ok or name == ALL_PLATES:
+            return ok, None
+        return True, names.index(name) - 1
+
+    def receivePlates(self, plates, show=False):
+        """Queue Plates Delivered by a Task, to be Opened a Slice at a Time"""
+
+        if not plates:
+            return
+        self.arrivals.append((plates[0], show))
+        self.arrivals.extend((plate, False) for plate in plates[1:])
+        if not self.receiving:
+            self.receiving = True
+            QTimer.singleShot(0, self.openArrivals)
+
+    def openArrivals(self):
+        """Open Queued Plates for One Time Slice, then Yield to the Event Loop"""
+
+        deadline = time.perf_counter() + RECEIVE_SLICE
+        while self.arrivals and time.perf_counter() < deadline:
+            plate, show = self.arrivals.popleft()
+            self.openPlates([plate], show)
+        if self.arrivals:
+            QTimer.singleShot(0, self.openArrivals)
+        else:
+            self.receiving = False
+
+    def runTask(self, title, message, fn, *args, onResult=None, onPartial=None):
+        """Run an I/O Task on the Thread Pool, with a Cancellable Progress Dialog
+
+        The dialog only appears if the task takes more than a moment.
+        """
+
+        task = workers.Task(fn, *args)
+        progress = QProgressDialog(message, "Cancel", 0, 0, self.view)
+        progress.setWindowTitle(title)
+        progress.setMinimumDuration(PROGRESS_DELAY)
+        progress.setAutoReset(False)
+        progress.canceled.connect(task.cancel)
+        task.signals.progress.connect(
+            lambda done, total: (progress.setMaximum(total), progress.setValue(done))
+        )
+        if onPartial is not None:
+            task.signals.partial.connect(onPartial)
+        if onResult is not None:
+            task.signals.result.connect(onResult)
+        task.signals.error.connect(
+            lambda err: QMessageBox.critical(
+                self.view, title, "%s failed:\n%s" % (message, err)
+            )
+        )
+        task.signals.finished.connect(progress.deleteLater)
+        return self.tasks.start(task)
+
+    def savePlate(self):
+        """Save the Current Plate to a File"""
+
+        path, _ = QFileDialog.getSaveFileName(
+            self.view, "Save Plate Layout", self.model.barcode, FILE_FILTER
+        )
+        if not path:
+            return
+        # The worker writes a copy, so editing can carry on meanwhile
+        self.runTask(
+            "Save Plate Layout", "Saving %s" % os.path.basename(path),
+            workers.writePlate, path, self.model.copy()
+        )
+
+    def getRepository(self):
+        """Return the Plate Database, Opening it on First Use"""
+
+        if self.repository is None:
+            import repository
+            self.repository = repository.PlateRepository()
+        return self.repository
+
+    def openFromDatabase(self):
+        """Open a Plate Stored in the Plate Database"""
+
+        barcodes = self.getRepository().barcodes()
+        if not barcodes:
+            QMessageBox.information(
+                self.view, "Open from Database", "The plate database is empty."
+            )
+            return
+        barcode, ok = QInputDialog.getItem(
+            self.view, "Open from Database", "Plate:", barcodes, 0, False
+        )
+        if ok:
+            self.openStored(barcode)
+
+    def openStored(self, barcode):
+        """Show a Stored Plate, Loading it Unless it is Already Open"""
+
+        plate = self.session.find(barcode) if self.session else None
+        if plate is not None:
+            self.showPlate(plate)
+            return
+        self.runTask(
+            "Open from Database", "Loading plate %s" % barcode,
+            workers.loadStored, self.getRepository().path, barcode,
+            onResult=lambda plate: self.receivePlates([plate], show=True)
+        )
+
+    def saveToDatabase(self):
+        """Store the Current Plate in the Plate Database"""
+
+        # Plates are stored by barcode, so ask for one if it is missing
+        if not self.model.barcode:
+            barcode, ok = QInputDialog.getText(
+                self.view, "Save to Database", "Plate barcode:"
+            )
+            if not ok or not barcode.strip():
+                return
+            self.model.barcode = barcode.strip()
+            self.overview.markStale(self.model)
+            if self.journal is not None:
+                self.journal.rename(self.model)
+        self.runTask(
+            "Save to Database", "Saving plate %s" % self.model.barcode,
+            workers.storePlates, self.getRepository().path, [self.model.copy()]
+        )
+
+    def importReadout(self):
+        """Import Plate-Reader Data and Show it as a Heatmap"""
+
+        import readout
+        title = "Import Readout"
+        path, _ = QFileDialog.getOpenFileName(self.view, title, "", READOUT_FILTER)
+        if not path:
+            return
+        try:
+            reads = readout.readReads(path)
+        except (OSError, ValueError) as err:
+            QMessageBox.warning(self.view, title, "Cannot read %s:\n%s" % (
+                os.path.basename(path), err
+            ))
+            return
+        # The panel is built once and reused
+        if self.readoutPanel is None:
+            self.readoutPanel = view.ReadoutPanel(readout.METHODS, self.view)
+            self.view.addDockWidget(
+                Qt.DockWidgetArea.RightDockWidgetArea, self.readoutPanel
+            )
+            self.readoutPanel.reads.currentRowChanged.connect(self.overlayRead)
+            self.readoutPanel.method.currentTextChanged.connect(self.normalizeReads)
+            self.readoutPanel.visibilityChanged.connect(self.overlayRead)
+        self.reads = reads
+        self.readoutPanel.showReads(reads.names, "%d reads of %d-well plates from %s" % (
+            len(reads), reads.wells, os.path.basename(path)
+        ))
+        self.readoutPanel.show()
+        self.normalizeReads()
+        self.readoutPanel.reads.setCurrentRow(0)
+
+    def normalizeReads(self):
+        """Normalize Every Read at Once, on Colour Scales Shared Across Plates"""
+
+        method = self.readoutPanel.method.currentText()
+        controls = None
+        if method == "Percent of control":
+            # The wells selected on the plate are the controls
+            if self.plateLayout is not None and self.model.wells == self.reads.wells:
+                controls = self.plateLayout.selection()
+            if controls is None or not len(controls):
+                self.view.statusBar().showMessage("Select the control wells first")
+                self.readoutPanel.method.setCurrentIndex(0)
+                return
+        values = self.reads.normalized(method, controls)
+        self.levels, self.scales = self.reads.colourLevels(values, method)
+        self.heatmaps = {}
+        self.overlayRead()
+
+    def overlayRead(self, *args):
+        """Show the Chosen Read over the Plate Shown, if the Formats Match
+
+        Heatmaps are rendered once per read and normalization, so stepping
+        through the reads only swaps images.
+        """
+
+        if self.plateLayout is None:
+            return
+        row = self.readoutPanel.reads.currentRow() if self.readoutPanel else -1
+        if row < 0 or not self.readoutPanel.isVisible() \
+                or self.reads.wells != self.plateLayout.wells:
+            self.plateLayout.setHeatmap(None)
+            return
+        if row not in self.heatmaps:
+            self.heatmaps[row] = view.renderHeatmap(self.levels[row], self.reads.geometry)
+        self.plateLayout.setHeatmap(self.heatmaps[row])
+        self.readoutPanel.showScale(*self.scales[row])
+
+    def importKinetics(self):
+        """Import a Kinetic Read for the Plate Shown
+
+        Reads are converted to a kinetic store next to the file, on the
+        thread pool; a store (.wpk) is opened directly.
+        """
+
+        import kinetics
+        title = "Import Kinetic Read"
+        path, _ = QFileDialog.getOpenFileName(self.view, title, "", KINETIC_FILTER)
+        if not path:
+            return
+        if path.lower().endswith(kinetics.EXTENSION):
+            self.attachKinetics(self.model, path)
+            return
+        storePath = os.path.splitext(path)[0] + kinetics.EXTENSION
+        self.runTask(
+            title, "Importing %s" % os.path.basename(path), workers.importKinetics,
+            path, storePath, self.model.wells,
+            onResult=partial(self.attachKinetics, self.model)
+        )
+
+    def attachKinetics(self, plate, path):
+        """Open a Kinetic Store and Attach One of its Plates to a Plate"""
+
+        import kinetics
+        title = "Import Kinetic Read"
+        try:
+            store = kinetics.KineticStore(path)
+        except (OSError, ValueError) as err:
+            QMessageBox.warning(self.view, title, "Cannot open %s:\n%s" % (
+                os.path.basename(path), err
+            ))
+            return
+        if store.wells != plate.wells:
+            QMessageBox.warning(self.view, title, "%s holds %d-well plates" % (
+                os.path.basename(path), store.wells
+            ))
+            return
+        number = 1
+        if len(store) > 1:
+            number, ok = QInputDialog.getInt(
+                self.view, title, "Plate of the store:", 1, 1, len(store)
+            )
+            if not ok:
+                return
+        plate.kinetics = store.plate(number - 1)
+        # The panel is built once and reused
+        if self.kineticPanel is None:
+            self.kineticPanel = view.KineticPanel(self.view)
+            self.view.addDockWidget(
+                Qt.DockWidgetArea.BottomDockWidgetArea, self.kineticPanel
+            )
+        self.kineticPanel.show()
+        if plate is self.model:
+            self.showKinetics()
+
+    def showKinetics(self):
+        """Draw the Kinetic Curves of the Plate Shown, and Plot the Well Edited"""
+
+        if self.plateLayout is None:
+            return
+        kinetics = self.model.kinetics
+        self.plateLayout.setSparklines(
+            kinetics.sparklines(SPARKLINE_POINTS) if kinetics is not None else None
+        )
+        if self.kineticPanel is not None:
+            if kinetics is not None and self.editing is not None and len(self.editing) == 1:
+                well = int(self.editing[0])
+                self.kineticPanel.plot.setSeries(
+                    kinetics, well, "Well %s" % self.model.geometry.names[well]
+                )
+            else:
+                self.kineticPanel.plot.setSeries(None)
+
+    def showSearch(self, replace=False):
+        """Show the Find/Replace Panel"""
+
+        # The panel is built once and reused
+        if self.searchPanel is None:
+            self.searchPanel = view.SearchPanel(self.view)
+            self.view.addDockWidget(
+                Qt.DockWidgetArea.RightDockWidgetArea, self.searchPanel
+            )
+            self.searchPanel.findText.textChanged.connect(self.searchText)
+            self.searchPanel.matchCase.toggled.connect(self.searchText)
+            self.searchPanel.replaceBtn.clicked.connect(self.replaceAll)
+            self.searchPanel.results.itemActivated.connect(self.openResult)
+        self.searchPanel.show()
+        field = self.searchPanel.replaceText if replace else self.searchPanel.findText
+        field.setFocus()
+        field.selectAll()
+
+    def searchText(self):
+        """Search Loaded and Stored Plates as the Query is Typed"""
+
+        query = self.searchPanel.findText.text()
+        matchCase = self.searchPanel.matchCase.isChecked()
+        # Highlight matches on the plate on screen
+        if self.plateLayout is not None:
+            self.plateLayout.setHighlighted(
+                search.matchWells(self.model, query, matchCase)
+            )
+        if not query:
+            self.searchPanel.showResults([], "")
+            return
+
+        # Loaded plates come from the in-memory index
+        results = []
+        loaded = set()
+        for plate, wells in self.searchIndex.search(
+                query, matchCase, SEARCH_LIMIT).items():
+            loaded.add(plate.barcode)
+            for well in wells.tolist():
+                results.append((
+                    "%s  %s  %s" % (
+                        plate.barcode or "(unsaved)",
+                        plate.geometry.names[well], plate.sampleID[well]
+                    ),
+                    plate
+                ))
+        # Stored plates come from the database, unless already loaded
+        import repository
+        if self.repository is not None or os.path.exists(repository.DEFAULT_PATH):
+            for barcode, well, sampleID in self.getRepository().searchText(
+                    query, SEARCH_LIMIT):
+                if barcode not in loaded:
+                    results.append(("%s  %s  %s" % (barcode, well, sampleID), barcode))
+        results = results[:SEARCH_LIMIT]
+        self.searchPanel.showResults(results, "%d%s matches" % (
+            len(results), "+" if len(results) == SEARCH_LIMIT else ""
+        ))
+
+    def replaceAll(self):
+        """Replace the Search Text in Every Loaded Plate"""
+
+        query = self.searchPanel.findText.text()
+        if not query:
+            return
+        replacement = self.searchPanel.replaceText.text()
+        matchCase = self.searchPanel.matchCase.isChecked()
+        changed = 0
+        # Replace All is undone as a single step
+        with self.history.group():
+            for plate, wells in self.searchIndex.containing(query, matchCase).items():
+                # One vectorized update per field and plate
+                for field in search.FIELDS:
+                    changed += len(plate.replaceText(
+                        field, query, replacement, wells, matchCase
+                    ))
+        self.searchPanel.findText.setText(replacement)
+        self.searchPanel.status.setText("Replaced text in %d fields" % changed)
+
+    def openResult(self, item):
+        """Open the Plate of a Search Result"""
+
+        plate = item.data(Qt.ItemDataRole.UserRole)
+        if isinstance(plate, str):
+            self.openStored(plate)
+        else:
+            self.showPlate(plate)
+
+    def startProfiling(self):
+        """Time the Controller's Slots and Watch the Event Loop for Lag"""
+
+        import profiling
+        self.profiler = profiling.Profiler()
+        self.profiler.instrument(self, PROFILED_SLOTS)
+        self.profiler.startHeartbeat(self.view)
+
+    def showProfiler(self):
+        """Show the Profiler Panel, Refreshed While it is Open"""
+
+        # The panel is built once and reused
+        if self.profilerPanel is None:
+            self.profilerPanel = view.ProfilerPanel(self.view)
+            self.view.addDockWidget(
+                Qt.DockWidgetArea.BottomDockWidgetArea, self.profilerPanel
+            )
+            self.profilerPanel.clearBtn.clicked.connect(self.clearProfile)
+            self.profilerPanel.dumpBtn.clicked.connect(self.saveProfile)
+            self.profilerTimer = QTimer(self.profilerPanel)
+            self.profilerTimer.setInterval(PROFILER_REFRESH)
+            self.profilerTimer.timeout.connect(self.refreshProfiler)
+            self.profilerPanel.visibilityChanged.connect(
+                lambda visible: self.profilerTimer.start() if visible
+                else self.profilerTimer.stop()
+            )
+        self.profilerPanel.show()
+        self.refreshProfiler()
+
+    def refreshProfiler(self):
+        """Show the Latest Timings in the Profiler Panel"""
+
+        events = self.profiler.events
+        self.profilerPanel.showSummary(
+            self.profiler.summary(),
+            "%d events held of %d recorded" % (len(events), events.count)
+        )
+
+    def clearProfile(self):
+        """Forget Every Timing Recorded"""
+
+        self.profiler.clear()
+        self.refreshProfiler()
+
+    def saveProfile(self):
+        """Write the Timings Recorded to a JSON File"""
+
+        path, _ = QFileDialog.getSaveFileName(
+            self.view, "Save Profile", "profile.json", PROFILE_FILTER
+        )
+        if not path:
+            return
+        try:
+            self.profiler.dump(path)
+        except OSError as err:
+            QMessageBox.critical(self.view, "Save Profile", str(err))
+            return
+        self.view.statusBar().showMessage("Profile saved to %s" % path)
+
+    def restoreSession(self):
+        """Offer to Reopen the Plates of the Last Session, then Start Autosave"""
+
+        import journal
+        title = "Restore Session"
+        self.journal = journal.Journal()
+        try:
+            plates = journal.recover(self.journal.directory)
+        except (OSError, ValueError) as err:
+            plates = []
+            QMessageBox.warning(
+                self.view, title, "The last session could not be restored:\n%s" % err
+            )
+        if plates and QMessageBox.question(
+                self.view, title,
+                "Reopen the %d plates of your last session?" % len(plates)
+        ) != QMessageBox.StandardButton.Yes:
+            plates = []
+        if plates:
+            self.openPlates(plates)
+            self.view.statusBar().showMessage("Restored %d plates" % len(plates))
+        # Plates opened before the journal existed are journaled from here
+        for plate in self.session.plates if self.session is not None else []:
+            self.journal.watch(plate)
+        try:
+            self.journal.start()
+        except OSError as err:
+            self.journal = None
+            self.view.statusBar().showMessage("Autosave is off: %s" % err)
+            return
+        self.autosave.start()
+        QApplication.instance().aboutToQuit.connect(self.closeJournal)
+
+    def compactJournal(self):
+        """Snapshot the Session Once its Change Log has Grown Long"""
+
+        if self.journal is not None and self.journal.needsCompaction():
+            self.journal.compact()
+
+    def closeJournal(self):
+        """Snapshot the Session and Stop the Journal Writer"""
+
+        self.autosave.stop()
+        if self.journal is not None:
+            self.journal.close()
 
     def terminate(self):
         """Terminate Application"""
+
+        self.closeJournal()
+        self.tasks.shutdown()
+        if self.repository is not None:
+            self.repository.close()
         self.view.close()
 
     def connectStartUpSignals(self):
@@ -91,22 +981,388 @@ class PlateCtrl:
         # Connect Start-Up Buttons
         self.view.StartUpBtns["new94"].clicked.connect(self.launch94Plate)
         self.view.StartUpBtns["new384"].clicked.connect(self.launch384Plate)
+        self.view.StartUpBtns["new1536"].clicked.connect(self.launch1536Plate)
         self.view.StartUpBtns["load"].clicked.connect(self.loadPlate)
 
     def connectActions(self):
         """Connect Menu and ToolBar Actions"""
 
         # Connect menu actions
+        self.view.action_open.triggered.connect(self.loadPlate)
+        self.view.action_save.triggered.connect(self.savePlate)
+        self.view.action_openDB.triggered.connect(self.openFromDatabase)
+        self.view.action_saveDB.triggered.connect(self.saveToDatabase)
+        self.view.action_importManifest.triggered.connect(self.importManifest)
+        self.view.action_exportWorklist.triggered.connect(self.exportWorklist)
+        self.view.action_importReadout.triggered.connect(self.importReadout)
+        self.view.action_importKinetics.triggered.connect(self.importKinetics)
+        self.view.action_undo.triggered.connect(self.undo)
+        self.view.action_redo.triggered.connect(self.redo)
+        self.view.action_copy.triggered.connect(self.copyWells)
+        self.view.action_paste.triggered.connect(self.pasteWells)
+        self.view.action_clearWells.triggered.connect(self.clearWells)
+        self.view.action_selectAll.triggered.connect(
+            lambda: self.selectWells(np.arange(self.model.wells))
+        )
+        for quadrant, action in enumerate(self.view.action_selectQuadrant):
+            action.triggered.connect(partial(self.selectQuadrant, quadrant))
+        self.view.action_incrementIDs.triggered.connect(self.incrementIDs)
+        self.view.action_serialDilution.triggered.connect(self.serialDilution)
+        self.view.action_flagWells.triggered.connect(self.flagWells)
+        self.view.action_rapidEntry.toggled.connect(self.toggleRapidEntry)
+        self.view.action_stampQuadrants.triggered.connect(self.stampQuadrants)
+        self.view.action_splitQuadrants.triggered.connect(self.splitQuadrants)
+        self.view.action_compressPlates.triggered.connect(self.compressPlates)
+        self.view.action_find.triggered.connect(self.showSearch)
+        self.view.action_replace.triggered.connect(lambda: self.showSearch(True))
         self.view.action_exit.triggered.connect(self.terminate)
+        if self.profiler is not None:
+            self.view.action_profiler.setVisible(True)
+            self.view.action_profiler.triggered.connect(self.showProfiler)
+        self.view.menu_plates.aboutToShow.connect(self.listPlates)
+
+    def connectWells(self, plateView):
+        """Connect Wells to the Sample Editor"""
+
+        # The plate hit-tests clicks itself and reports the well name
+        plateView.wellClicked.connect(self.editWell)
+        plateView.selectionChanged.connect(self.editSelection)
+
+    def editSelection(self):
+        """Bind the Sample Editor to a Multi-Well Selection"""
+
+        # Single wells are opened through `wellClicked`
+        selection = self.plateLayout.selection()
+        if len(selection) > 1 and self.rapidEntry is None:
+            self.editWells(selection)
+
+    def selectWells(self, indices):
+        """Select Wells on the Plate and Open them in the Editor"""
+
+        self.plateLayout.setSelection(indices, notify=False)
+        if len(indices):
+            self.editWells(indices)
+
+    def selectQuadrant(self, quadrant):
+        """Select Every Well of a Quadrant"""
+
+        try:
+            self.selectWells(self.model.geometry.quadrantIndices(quadrant))
+        except ValueError as err:
+            QMessageBox.information(self.view, "Select Quadrant", str(err))
+
+    def undo(self):
+        """Undo the Last Edit, Showing its Plate First"""
+
+        self.showEdited(self.history.undoPlates())
+        self.history.undo()
+        self.rebindEditor()
+
+    def redo(self):
+        """Redo the Last Undone Edit, Showing its Plate First"""
+
+        self.showEdited(self.history.redoPlates())
+        self.history.redo()
+        self.rebindEditor()
+
+    def showEdited(self, plates):
+        """Show the Plate an Undo or Redo Changes, Unless One it Changes is Shown
+
+        The history spans every plate, so without this an undo could
+        change a plate out of sight.
+        """
+
+        if plates and not any(plate is self.model for plate in plates):
+            self.showPlate(plates[0])
+
+    def rebindEditor(self):
+        """Show the Current Values of the Wells Being Edited"""
+
+        if self.editing is not None:
+            self.editWells(self.editing)
+
+    def copyWells(self):
+        """Copy the Selected Wells"""
+
+        selection = self.plateLayout.selection()
+        if len(selection):
+            self.clipboard = self.model.copyWells(selection)
+
+    def pasteWells(self):
+        """Paste Copied Wells at the Top-Left of the Selection"""
+
+        selection = self.plateLayout.selection()
+        if self.clipboard is None or not len(selection):
+            return
+        tables = self.model.geometry
+        anchor = tables.index(tables.row[selection].min(), tables.col[selection].min())
+        pasted = self.model.pasteWells(self.clipboard, anchor)
+        self.selectWells(pasted)
+
+    def clearWells(self):
+        """Empty the Selected Wells"""
+
+        selection = self.plateLayout.selection()
+        if len(selection):
+            self.model.clear(selection)
+            self.editWells(selection)
+
+    def flagWells(self):
+        """Flag the Selected Wells, or Unflag Them if All are Flagged"""
+
+        selection = self.plateLayout.selection()
+        if len(selection):
+            self.model.flag(selection, not self.model.flagged[selection].all())
+
+    def incrementIDs(self):
+        """Number the Sample IDs of the Selected Wells"""
+
+        selection = self.plateLayout.selection()
+        if not len(selection):
+            return
+        title = "Number Sample IDs"
+        prefix, ok = QInputDialog.getText(self.view, title, "Prefix:", text="S-")
+        if not ok:
+            return
+        start, ok = QInputDialog.getInt(self.view, title, "First number:", 1, 0)
+        if not ok:
+            return
+        order, ok = QInputDialog.getItem(self.view, title, "Order:", ORDERS, 0, False)
+        if not ok:
+            return
+        # Pad every number to the width of the largest
+        width = len(str(start + len(selection) - 1))
+        self.model.incrementIDs(
+            selection, prefix, start, 1, width, byColumn=order == ORDERS[1]
+        )
+        self.editWells(selection)
+
+    def serialDilution(self):
+        """Fill the Selected Wells with Serial Dilutions"""
+
+        selection = self.plateLayout.selection()
+        if not len(selection):
+            return
+        title = "Serial Dilution"
+        start, ok = QInputDialog.getDouble(
+            self.view, title, "Starting concentration (ng/uL):", 100, 0, 1e9, 3
+        )
+        if not ok:
+            return
+        factor, ok = QInputDialog.getDouble(
+            self.view, title, "Dilution factor:", 2, 1, 1e6, 3
+        )
+        if not ok:
+            return
+        order, ok = QInputDialog.getItem(
+            self.view, title, "Dilute along:", ["Rows", "Columns"], 0, False
+        )
+        if not ok:
+            return
+        self.model.serialDilution(selection, start, factor, order == "Columns")
+        self.editWells(selection)
+
+    def createEditor(self):
+        """Build the Sample Editor (Once, Off the Click Path)"""
+
+        if self.editor is not None:
+            return
+        self.editor = view.SampleEditor(model.SAMPLE_TYPES, self.view)
+        self.view.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.editor)
+        self.editor.hide()
+        # Enter in any line saves, for rapid data entry
+        self.editor.SampleSaveBtn.clicked.connect(self.saveSample)
+        for lineEdit in self.editor.lineEdits.values():
+            lineEdit.returnPressed.connect(self.saveSample)
+
+    def editWell(self, name):
+        """Open a Single Well in the Sample Editor, and Plot its Kinetic Read"""
+
+        # During rapid entry a click picks the well the next scan goes to
+        if self.rapidEntry is not None:
+            self.moveScanCursor(name)
+            return
+        self.editWells(self.model.wellIndices(name))
+        if self.model.kinetics is not None and self.kineticPanel is not None:
+            self.showKinetics()
+
+    def editWells(self, indices, saved=False):
+        """Bind the Sample Editor to One or More Wells, Listing their Problems"""
+
+        self.editing = indices
+        if len(indices) == 1:
+            title = "Well %s" % self.model.geometry.names[indices[0]]
+        else:
+            title = "%d Wells" % len(indices)
+        self.editor.bind(title, self.model.commonValues(indices))
+        self.editor.show()
+        self.editor.SampleID.setFocus()
+        issues = self.validator.issues(self.model, indices)
+        lines = ["%s: %s" % (well, message) for well, _, message in issues[:ISSUES_SHOWN]]
+        if len(issues) > ISSUES_SHOWN:
+            lines.append("(%d more)" % (len(issues) - ISSUES_SHOWN))
+        if saved:
+            lines.insert(0, "Saved, but:" if issues else "Saved")
+        if lines:
+            self.editor.showStatus("\n".join(lines), error=bool(issues))
+
+    def saveSample(self):
+        """Write the Edited Fields into the Plate Model"""
+
+        if self.editing is None:
+            return
+        values = {}
+        for field, text in self.editor.edits().items():
+            if field in NUMERIC_FIELDS:
+                try:
+                    values[field] = float(text) if text.strip() else np.nan
+                except ValueError:
+                    self.editor.showStatus(
+                        "%s must be a number" % NUMERIC_FIELDS[field], error=True
+                    )
+                    return
+            else:
+                values[field] = text
+        # All edited fields of all bound wells are written in one update
+        if values:
+            self.model.fill(self.editing, **values)
+        self.editWells(self.editing, saved=True)
+
+    def toggleRapidEntry(self, checked):
+        """Turn Barcode-Scanner Entry On or Off (Edit Menu Toggle)"""
+
+        if checked:
+            self.startRapidEntry()
+        else:
+            self.stopRapidEntry()
+
+    def startRapidEntry(self):
+        """Assign Scanned Sample IDs to the Wells of the Plate Shown
+
+        With several wells selected, only those are filled.
+        """
+
+        import scanner
+        # The panel is built once and reused
+        if self.scanPanel is None:
+            self.scanPanel = view.ScanPanel(scanner.WALK_ORDERS, self.view)
+            self.view.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.scanPanel)
+            self.scanPanel.scanText.returnPressed.connect(self.scanEntered)
+            self.scanPanel.order.currentTextChanged.connect(self.restartWalk)
+            self.scanPanel.skipOccupied.toggled.connect(self.restartWalk)
+            # Closing the panel (not minimizing the window) ends rapid entry
+            self.scanPanel.visibilityChanged.connect(
+                lambda visible: self.scanPanel.isHidden()
+                and self.view.action_rapidEntry.setChecked(False)
+            )
+            self.scanTimer = QTimer(self.scanPanel)
+            self.scanTimer.setSingleShot(True)
+            self.scanTimer.setInterval(SCAN_FLUSH_DELAY)
+            self.scanTimer.timeout.connect(self.flushScans)
+        selection = self.plateLayout.selection()
+        self.rapidEntry = scanner.RapidEntry(
+            self.model, self.scanPanel.order.currentText(),
+            wells=selection if len(selection) > 1 else None,
+            skipOccupied=self.scanPanel.skipOccupied.isChecked(),
+            exclude=self.excludedWells(self.model)
+        )
+        self.editing = None
+        self.editor.hide()
+        self.scanPanel.show()
+        self.showScanCursor()
+        self.scanPanel.scanText.setFocus()
+
+    def excludedWells(self, plate):
+        """Return the Mask of Wells Rapid Entry Never Fills
+
+        These are flagged wells and the control positions of the
+        validation rules.
+        """
+
+        excluded = plate.flagged.copy()
+        for rule in self.validator.rules:
+            if isinstance(rule, validation.ControlRule):
+                excluded |= rule.positions(plate)
+        return excluded
+
+    def scanEntered(self):
+        """Queue a Scan; Scans Arriving Together are Assigned Together"""
+
+        text = self.scanPanel.scanText.text()
+        self.scanPanel.scanText.clear()
+        if self.rapidEntry is not None and self.rapidEntry.scan(text) \
+                and not self.scanTimer.isActive():
+            self.scanTimer.start()
+
+    def flushScans(self):
+        """Assign the Queued Scans to their Wells, in One Plate Update"""
+
+        if self.rapidEntry is None:
+            return
+        wells, codes = self.rapidEntry.flush()
+        names = self.model.geometry.names
+        self.scanPanel.addScans(
+            ["%s  %s" % (names[well], code) for well, code in zip(wells.tolist(), codes)],
+            SCANS_LISTED
+        )
+        self.showScanCursor()
+
+    def restartWalk(self):
+        """Apply New Walk Settings, Walking from the First Free Well"""
+
+        if self.rapidEntry is None:
+            return
+        self.rapidEntry.order = self.scanPanel.order.currentText()
+        self.rapidEntry.skipOccupied = self.scanPanel.skipOccupied.isChecked()
+        self.rapidEntry.setPlate(self.model)
+        self.flushScans()
+        self.scanPanel.scanText.setFocus()
+
+    def moveScanCursor(self, name):
+        """Send the Next Scan to a Well"""
+
+        try:
+            self.rapidEntry.moveTo(name)
+        except ValueError as err:
+            self.scanPanel.status.setText(str(err))
+        self.showScanCursor()
+        # Keep the scanner's keystrokes going to the scan line
+        self.scanPanel.scanText.setFocus()
+
+    def showScanCursor(self):
+        """Select the Well the Next Scan Goes to, and Report Progress"""
 
-    def connectWells(self):
-        """Connect Wells (Buttons) to the Sample Pop-Up Method"""
+        well = self.rapidEntry.nextWell()
+        waiting = len(self.rapidEntry)
+        self.plateLayout.setSelection([] if well is None else [well], notify=False)
+        status = "%d scanned." % self.rapidEntry.assigned
+        if well is None:
+            status += " The plate is full"
+            if waiting:
+                status += "; %d scans wait for the next plate" % waiting
+            status += "."
+        else:
+            status += " Next well: %s." % self.model.geometry.names[well]
+        self.scanPanel.status.setText(status)
 
-        # Connect signals for all buttons
-        for txt, btn in self.plateLayout.Wells.items():
-            if isinstance(btn, QPushButton):
-                btn.clicked.connect(partial(self.view.sampleForm, txt))
+    def stopRapidEntry(self):
+        """Turn Rapid Entry Off, Reporting Scans Left Without a Well"""
 
+        if self.rapidEntry is None:
+            return
+        self.scanTimer.stop()
+        self.flushScans()
+        left = list(self.rapidEntry.queue)
+        self.rapidEntry = None
+        self.scanPanel.hide()
+        if left:
+            # Scans are never lost: those without a well go to the clipboard
+            QApplication.clipboard().setText("\n".join(left))
+            QMessageBox.warning(
+                self.view, "Rapid Entry",
+                "%d scans had no free well and were not assigned; they have "
+                "been copied to the clipboard." % len(left)
+            )
 
     # def connectSignals(self):
     #     """Connect signals and slots"""
@@ -0,0 +1,167 @@
+"""
+    Filename: Geometry.py
+
+    Plate geometry for the standard SBS (ANSI/SLAS) microplate formats.
+    Every supported format, from 6 to 1536 wells, is generated here rather
+    than typed out by hand. The lookup tables are built once per format
+    and cached, so converting between well names ("B7"), grid positions
+    (row, column) and linear well indices is a constant-time table lookup.
+
+    Wells are always numbered in row-major order: A1 is index 0, A2 is
+    index 1, and the last well of the plate has index `wells - 1`.
+"""
+
+# Import modules
+from functools import lru_cache
+import numpy as np
+
+# SBS plate formats: number of wells -> (rows, columns)
+FORMATS = {
+    6: (2, 3), 12: (3, 4), 24: (4, 6), 48: (6, 8),
+    96: (8, 12), 384: (16, 24), 1536: (32, 48)
+}
+
+# Centre-to-centre well spacing in mm for each format
+PITCH = {
+    6: 39.12, 12: 26.01, 24: 19.3, 48: 13.08,
+    96: 9.0, 384: 4.5, 1536: 2.25
+}
+
+# SBS plate footprint in mm (length, width)
+FOOTPRINT = (127.76, 85.48)
+
+def rowLabel(row):
+    """Return the Letter Label for a 0-Based Plate Row (A..Z, AA..)"""
+
+    label = ""
+    row += 1
+    while row:
+        row, rem = divmod(row - 1, 26)
+        label = chr(ord("A") + rem) + label
+    return label
+
+class PlateGeometry:
+    """Precomputed Lookup Tables for One Plate Format"""
+
+    def __init__(self, wells):
+        """Class Initializer"""
+
+        if wells not in FORMATS:
+            raise ValueError(
+                "Unsupported plate format: %r wells (expected one of %s)"
+                % (wells, ", ".join(map(str, FORMATS)))
+            )
+        self.wells = wells
+        self.rows, self.cols = FORMATS[wells]
+
+        # Row and column labels
+        self.rowLabels = [rowLabel(r) for r in range(self.rows)]
+        self.colLabels = [str(c + 1) for c in range(self.cols)]
+
+        # Linear index -> (row, column)
+        index = np.arange(wells)
+        self.row = (index // self.cols).astype(np.int16)
+        self.col = (index % self.cols).astype(np.int16)
+        # Linear index -> name, and name -> linear index
+        self.names = np.array([
+            r + c for r in self.rowLabels for c in self.colLabels
+        ])
+        self.nameToIndex = {str(n): i for i, n in enumerate(self.names)}
+
+        # Physical well centres in mm from the plate's top-left corner
+        self.pitch = PITCH[wells]
+        offsetX = (FOOTPRINT[0] - (self.cols - 1) * self.pitch) / 2
+        offsetY = (FOOTPRINT[1] - (self.rows - 1) * self.pitch) / 2
+        self.x = offsetX + self.col * self.pitch
+        self.y = offsetY + self.row * self.pitch
+
+        # Wells on the outer edge of the plate
+        self.edgeMask = (
+            (self.row == 0) | (self.row == self.rows - 1)
+            | (self.col == 0) | (self.col == self.cols - 1)
+        )
+
+        # Neighbour table: N, S, W, E, NW, NE, SW, SE (-1 when off-plate)
+        self.neighbourTable = np.full((wells, 8), -1, dtype=np.int32)
+        offsets = [(-1, 0), (1, 0), (0, -1), (0, 1),
+                   (-1, -1), (-1, 1), (1, -1), (1, 1)]
+        for k, (dr, dc) in enumerate(offsets):
+            r, c = self.row + dr, self.col + dc
+            valid = (r >= 0) & (r < self.rows) & (c >= 0) & (c < self.cols)
+            self.neighbourTable[valid, k] = r[valid] * self.cols + c[valid]
+
+    def __repr__(self):
+        return "PlateGeometry(%d)" % self.wells
+
+    def indexOf(self, name):
+        """Return the Linear Index of a Well Name"""
+
+        try:
+            return self.nameToIndex[name]
+        except KeyError:
+            pass
+        # Accept lower case, surrounding whitespace and zero-padded columns
+        label = name.strip().upper()
+        split = len(label.rstrip("0123456789"))
+        key = label[:split] + label[split:].lstrip("0")
+        if key in self.nameToIndex:
+            return self.nameToIndex[key]
+        raise KeyError("No well named %r on a %d-well plate" % (name, self.wells))
+
+    def indicesOf(self, names):
+        """Return the Linear Indices of Several Well Names"""
+        return np.fromiter(
+            (self.indexOf(n) for n in names), dtype=np.intp, count=len(names)
+        )
+
+    def index(self, row, col):
+        """Return Linear Indices for Row/Column Positions (Vectorized)"""
+        return np.asarray(row) * self.cols + np.asarray(col)
+
+    def rowIndices(self, row):
+        """Return the Indices of Every Well in a Row"""
+        return np.arange(self.cols) + row * self.cols
+
+    def colIndices(self, col):
+        """Return the Indices of Every Well in a Column"""
+        return np.arange(self.rows) * self.cols + col
+
+    def rectIndices(self, row0, col0, row1, col1):
+        """Return the Indices of a Rectangle of Wells (Inclusive Corners)"""
+
+        row0, row1 = sorted((row0, row1))
+        col0, col1 = sorted((col0, col1))
+        rows = np.arange(row0, row1 + 1)[:, None]
+        cols = np.arange(col0, col1 + 1)[None, :]
+        return (rows * self.cols + cols).ravel()
+
+    def quadrantOf(self, index):
+        """Return the Quadrant (0-3) of Wells When Interleaving 4 Plates"""
+        return (self.row[index] % 2) * 2 + self.col[index] % 2
+
+    def quadrantIndices(self, quadrant):
+        """Return the Indices of Every Well in a Quadrant (0-3)"""
+
+        if self.rows % 2 or self.cols % 2:
+            raise ValueError("%d-well plates have no quadrants" % self.wells)
+        rows = np.arange(quadrant // 2, self.rows, 2)[:, None]
+        cols = np.arange(quadrant % 2, self.cols, 2)[None, :]
+        return (rows * self.cols + cols).ravel()
+
+    def walkOrder(self, indices=None, byColumn=False):
+        """Sort Wells Row by Row (A1, A2, ..) or Column by Column (A1, B1, ..)"""
+
+        indices = np.arange(self.wells) if indices is None else np.asarray(indices)
+        if not byColumn:
+            return np.sort(indices)
+        keys = self.col[indices].astype(np.intp) * self.rows + self.row[indices]
+        return indices[np.argsort(keys, kind="stable")]
+
+    def neighbours(self, index, diagonal=False):
+        """Return Neighbouring Well Indices (-1 Where Off-Plate)"""
+        return self.neighbourTable[index, :8 if diagonal else 4]
+
+@lru_cache(maxsize=None)
+def getGeometry(wells):
+    """Return the Shared Geometry for a Plate Format"""
+    return PlateGeometry(wells)
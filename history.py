@@ -0,0 +1,230 @@
+"""
+    Filename: History.py
+
+    Undo/redo for plate edits.
+
+    The command stack listens to the plates it watches and records every
+    mutation as a column-wise delta: for each field touched, only the
+    wells whose value actually changed, with their old and new values.
+    No plate is ever copied, so undoing a full-plate fill costs
+    O(changed wells) in time and memory.
+
+    Consecutive edits of the same single well (e.g. correcting a typo in
+    the sample editor) are coalesced into one undo step, and the oldest
+    steps are dropped once the stack exceeds its memory budget.
+"""
+
+# Import modules
+from collections import deque
+from contextlib import contextmanager
+import time
+import numpy as np
+
+def arrayBytes(array):
+    """Return the Memory Held by an Array, Including String Contents"""
+
+    if array.dtype.kind == "T":
+        return array.nbytes + int(np.strings.str_len(array).sum())
+    return array.nbytes
+
+# * Delta Class
+class Delta:
+    """Column-Wise Change to One Plate
+
+    `fields` maps a field name to (well indices, old values, new values),
+    holding only the wells whose value changed.
+    """
+
+    def __init__(self, plate, fields):
+        """Class Initializer"""
+
+        self.plate = plate
+        self.fields = fields
+        self.time = time.monotonic()
+        self.nbytes = sum(
+            sum(arrayBytes(array) for array in entry)
+            for entry in fields.values()
+        )
+
+    def wells(self):
+        """Return Every Well Index Touched by the Delta"""
+        return np.unique(np.concatenate([e[0] for e in self.fields.values()]))
+
+    def undo(self):
+        """Write the Old Values Back"""
+        for field, (indices, old, new) in self.fields.items():
+            self.plate.assign(indices, {field: old})
+
+    def redo(self):
+        """Write the New Values Again"""
+        for field, (indices, old, new) in self.fields.items():
+            self.plate.assign(indices, {field: new})
+
+    def absorb(self, other):
+        """Merge a Later Delta on the Same Single Well into this One"""
+
+        for field, (indices, old, new) in other.fields.items():
+            if field in self.fields:
+                self.fields[field] = (self.fields[field][0], self.fields[field][1], new)
+            else:
+                self.fields[field] = (indices, old, new)
+        self.time = other.time
+        self.nbytes = sum(
+            sum(arrayBytes(array) for array in entry)
+            for entry in self.fields.values()
+        )
+
+# * Command Stack Class
+class CommandStack:
+    """Undo/Redo Stack of Plate Edits
+
+    Each command is a list of deltas that are undone and redone together.
+    """
+
+    def __init__(self, budget=64 * 2**20, coalesceWindow=2.0):
+        """Class Initializer"""
+
+        # Memory budget in bytes for recorded commands
+        self.budget = budget
+        # Seconds within which edits of the same well are merged
+        self.coalesceWindow = coalesceWindow
+        self.undoStack = deque()
+        self.redoStack = []
+        self.nbytes = 0
+        # Set while undoing/redoing, so those writes are not recorded
+        self.applying = False
+        # Open group collecting deltas into one command, if any
+        self.grouping = None
+
+    def watch(self, plate):
+        """Record Every Edit of a Plate"""
+        if self.record not in plate.listeners:
+            plate.addListener(self.record)
+
+    def unwatch(self, plate):
+        """Stop Recording Edits of a Plate and Forget its History"""
+
+        plate.removeListener(self.record)
+        self.undoStack = deque(
+            command for command in self.undoStack
+            if all(delta.plate is not plate for delta in command)
+        )
+        self.redoStack = [
+            command for command in self.redoStack
+            if all(delta.plate is not plate for delta in command)
+        ]
+        self.nbytes = sum(commandBytes(command) for command in self.undoStack)
+
+    def canUndo(self):
+        return bool(self.undoStack)
+
+    def canRedo(self):
+        return bool(self.redoStack)
+
+    def undoPlates(self):
+        """Return the Plates the Next Undo Touches"""
+        return [delta.plate for delta in self.undoStack[-1]] if self.undoStack else []
+
+    def redoPlates(self):
+        """Return the Plates the Next Redo Touches"""
+        return [delta.plate for delta in self.redoStack[-1]] if self.redoStack else []
+
+    def record(self, change):
+        """Turn a Plate Change into a Delta of the Values that Changed"""
+
+        if self.applying:
+            return
+        fields = {}
+        for field in change.fields:
+            old, new = change.old[field], change.new[field]
+            differs = old != new
+            if old.dtype.kind == "f":
+                differs &= ~(np.isnan(old) & np.isnan(new))
+            if differs.any():
+                fields[field] = (change.indices[differs], old[differs], new[differs])
+        if not fields:
+            return
+        delta = Delta(change.plate, fields)
+        self.redoStack.clear()
+
+        if self.grouping is not None:
+            self.grouping.append(delta)
+        elif self.coalesces(delta):
+            last = self.undoStack[-1][0]
+            self.nbytes -= last.nbytes
+            last.absorb(delta)
+            self.nbytes += last.nbytes
+        else:
+            self.push([delta])
+
+    def coalesces(self, delta):
+        """Check Whether a Delta Continues the Last Single-Well Edit"""
+
+        if not self.undoStack or len(self.undoStack[-1]) != 1:
+            return False
+        last = self.undoStack[-1][0]
+        if last.plate is not delta.plate:
+            return False
+        if delta.time - last.time > self.coalesceWindow:
+            return False
+        wells = delta.wells()
+        return len(wells) == 1 and np.array_equal(last.wells(), wells)
+
+    def push(self, command):
+        """Add a Command, Dropping the Oldest Ones Beyond the Budget"""
+
+        self.undoStack.append(command)
+        self.nbytes += commandBytes(command)
+        while self.nbytes > self.budget and len(self.undoStack) > 1:
+            self.nbytes -= commandBytes(self.undoStack.popleft())
+
+    @contextmanager
+    def group(self):
+        """Record Every Edit Made Inside the Block as One Command"""
+
+        if self.grouping is not None:
+            yield
+            return
+        self.grouping = []
+        try:
+            yield
+        finally:
+            command, self.grouping = self.grouping, None
+            if command:
+                self.push(command)
+
+    def undo(self):
+        """Undo the Last Command; Return the Plates it Touched"""
+
+        if not self.undoStack:
+            return []
+        command = self.undoStack.pop()
+        self.nbytes -= commandBytes(command)
+        self.apply(command, undo=True)
+        self.redoStack.append(command)
+        return [delta.plate for delta in command]
+
+    def redo(self):
+        """Redo the Last Undone Command; Return the Plates it Touched"""
+
+        if not self.redoStack:
+            return []
+        command = self.redoStack.pop()
+        self.apply(command, undo=False)
+        self.undoStack.append(command)
+        self.nbytes += commandBytes(command)
+        return [delta.plate for delta in command]
+
+    def apply(self, command, undo):
+        """Undo or Redo Every Delta of a Command Without Recording It"""
+
+        self.applying = True
+        try:
+            for delta in (reversed(command) if undo else command):
+                delta.undo() if undo else delta.redo()
+        finally:
+            self.applying = False
+
+def commandBytes(command):
+    """Return the Memory Held by a Command"""
+    return sum(delta.nbytes for delta in command)
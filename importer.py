@@ -0,0 +1,328 @@
+"""
+    Filename: Importer.py
+
+    Streaming import of sample manifests (CSV or TSV) into plates.
+
+    A manifest is read in chunks of rows, so memory stays bounded however
+    long it is: only the current chunk and the plate being filled are
+    held at any time, and each plate is handed on as soon as it is full.
+    Every chunk is written into its plate with vectorized column updates.
+
+    Manifest columns are matched to the sample fields by name ("Sample
+    ID", "sample_id", "Volume (uL)", ...). Samples are placed either at
+    the wells named in a Well column (and the plates named in a Plate
+    column), or one after another in row-major, column-major or a custom
+    well order, starting a new plate whenever one is full.
+"""
+
+# Import modules
+import csv
+import io
+import os
+import re
+import numpy as np
+import geometry
+import model
+
+# Rows read per chunk
+CHUNK_ROWS = 50000
+
+# Normalized column names recognized for each field
+ALIASES = {
+    "sampleID": ("sampleid", "sample", "id", "samplename", "name"),
+    "sampleType": ("sampletype", "type"),
+    "volume": ("volume", "vol"),
+    "concentration": ("concentration", "conc"),
+    "description": ("description", "descr", "comment", "comments", "notes"),
+    "well": ("well", "position", "wellposition"),
+    "plate": ("plate", "barcode", "platebarcode", "plateid"),
+}
+
+# Sample type names (lower case) -> type code
+TYPE_CODES = {name.lower(): code for code, name in enumerate(model.SAMPLE_TYPES, 1)}
+
+def normalize(name):
+    """Reduce a Column Name to Lower-Case Letters and Digits, Without Units"""
+    return re.sub(r"[^a-z0-9]", "", re.sub(r"\(.*?\)|\[.*?\]", "", name.lower()))
+
+def mapColumns(header, mapping=None):
+    """Return {Field: Column Position} for a Manifest Header
+
+    `mapping` maps fields to header names, overriding the aliases.
+    """
+
+    positions = {normalize(name): i for i, name in reversed(list(enumerate(header)))}
+    columns = {}
+    for field, aliases in ALIASES.items():
+        for alias in aliases:
+            if normalize(alias) in positions:
+                columns[field] = positions[normalize(alias)]
+                break
+    for field, name in (mapping or {}).items():
+        if field not in ALIASES:
+            raise KeyError("Unknown manifest field: %r" % field)
+        if name not in header:
+            raise KeyError("No column named %r in the manifest" % name)
+        columns[field] = header.index(name)
+    if "sampleID" not in columns:
+        raise ValueError("The manifest has no sample ID column")
+    return columns
+
+def wellOrder(tables, order="row"):
+    """Return the Well Indices to Fill, in Order
+
+    `order` is "row" (A1, A2, ..), "column" (A1, B1, ..), or a sequence
+    of well names or indices.
+    """
+
+    if isinstance(order, str):
+        if order == "row":
+            return np.arange(tables.wells)
+        if order == "column":
+            return tables.walkOrder(byColumn=True)
+        raise ValueError("Unknown well order: %r" % order)
+    order = list(order)
+    if order and isinstance(order[0], str):
+        indices = tables.indicesOf(order)
+    else:
+        indices = np.asarray(order, dtype=np.intp)
+    if len(np.unique(indices)) != len(indices):
+        raise ValueError("The well order lists a well twice")
+    if len(indices) and (indices.min() < 0 or indices.max() >= tables.wells):
+        raise ValueError("The well order has wells off the plate")
+    return indices
+
+def parseNumbers(cells, field, rowNumbers):
+    """Convert a Column of Text to Floats; Blank Cells Become NaN"""
+
+    text = np.strings.strip(np.array(cells, dtype=model.STRING))
+    try:
+        return np.where(text == "", "nan", text).astype(np.float64)
+    except ValueError:
+        pass
+    # Find the offending row for the error message
+    for row, cell in zip(rowNumbers, text.tolist()):
+        try:
+            float(cell or "nan")
+        except ValueError:
+            raise ValueError("Row %d: %s %r is not a number" % (row, field, cell))
+
+def parseTypes(cells, rowNumbers):
+    """Convert a Column of Sample Type Names to Type Codes"""
+
+    names, inverse = np.unique(
+        np.strings.lower(np.strings.strip(np.array(cells, dtype=model.STRING))),
+        return_inverse=True
+    )
+    codes = []
+    for name in names.tolist():
+        if name and name not in TYPE_CODES:
+            row = rowNumbers[int(np.argmax(names[inverse] == name))]
+            raise ValueError("Row %d: unknown sample type %r" % (row, name))
+        codes.append(TYPE_CODES.get(name, model.EMPTY))
+    return np.array(codes, dtype=np.int8)[inverse]
+
+def readManifest(file, mapping=None, chunkRows=CHUNK_ROWS, delimiter=None):
+    """Yield a Manifest's Rows in Chunks, as (First Row Number, {Field: Values})
+
+    `file` is an open text file. The delimiter is guessed from the header
+    line (tab, comma or semicolon) unless given. Numbers and sample types
+    are already converted; row numbers count the header as row 1, and
+    blank rows are skipped but still counted.
+    """
+
+    header = file.readline()
+    if delimiter is None:
+        delimiter = max("\t,;", key=header.count)
+    header = next(csv.reader([header], delimiter=delimiter))
+    columns = mapColumns(header, mapping)
+    rows = enumerate(csv.reader(file, delimiter=delimiter), start=2)
+    while True:
+        read = [entry for _, entry in zip(range(chunkRows), rows)]
+        if not read:
+            return
+        numbered = [(number, row) for number, row in read if row]
+        if not numbered:
+            continue
+        rowNumbers = [number for number, _ in numbered]
+        chunk = [row for _, row in numbered]
+        width = max(columns.values()) + 1
+        # Short rows are padded with blank cells
+        chunk = [row + [""] * (width - len(row)) if len(row) < width else row
+                 for row in chunk]
+        values = {}
+        for field, position in columns.items():
+            cells = [row[position] for row in chunk]
+            if field in ("volume", "concentration"):
+                values[field] = parseNumbers(cells, field, rowNumbers)
+            elif field == "sampleType":
+                values[field] = parseTypes(cells, rowNumbers)
+            else:
+                values[field] = np.strings.strip(np.array(cells, dtype=model.STRING))
+        yield rowNumbers[0], values
+
+# * Manifest Importer Class
+class ManifestImporter:
+    """Fill Plates from Manifest Chunks as They Arrive
+
+    `feed` takes one chunk and returns the plates it completed; `finish`
+    returns the last, partly filled plate. Plates are only held until
+    they are returned.
+    """
+
+    def __init__(self, wells=96, order="row", barcode="IMPORT", mapping=None):
+        """Class Initializer"""
+
+        self.geometry = geometry.getGeometry(wells)
+        self.wells = wells
+        self.order = wellOrder(self.geometry, order)
+        if not len(self.order):
+            raise ValueError("The well order is empty")
+        # Barcode stem of plates without a Plate column
+        self.barcode = barcode
+        self.mapping = mapping
+        # Plate being filled, the wells filled so far, and plates started
+        self.plate = None
+        self.filled = np.zeros(wells, dtype=bool)
+        self.position = 0
+        self.plates = 0
+        self.samples = 0
+        # Bytes of the manifest read so far, for progress reports
+        self.bytesRead = 0
+
+    def newPlate(self, barcode=None):
+        """Start Filling a New Plate; Return the Previous One, if Any"""
+
+        previous = self.plate
+        self.plates += 1
+        if barcode is None:
+            barcode = "%s-%04d" % (self.barcode, self.plates)
+        self.plate = model.PlateModel(self.wells, barcode)
+        self.filled[:] = False
+        self.position = 0
+        return [previous] if previous is not None else []
+
+    def feed(self, values):
+        """Place One Chunk of Samples; Return the Plates it Completed"""
+
+        count = len(values["sampleID"])
+        self.samples += count
+        fields = {f: v for f, v in values.items() if f in model.FIELDS}
+        if "well" in values:
+            return self.placeNamed(values["well"], values.get("plate"), fields, count)
+        return self.placeInOrder(fields, count)
+
+    def placeInOrder(self, fields, count):
+        """Fill Wells in the Importer's Well Order, Plate after Plate"""
+
+        done = []
+        start = 0
+        while start < count:
+            if self.plate is None or self.position == len(self.order):
+                done += self.newPlate()
+            stop = min(count, start + len(self.order) - self.position)
+            indices = self.order[self.position:self.position + stop - start]
+            self.plate.assign(indices, {f: v[start:stop] for f, v in fields.items()})
+            self.position += stop - start
+            start = stop
+        return done
+
+    def placeNamed(self, wells, plates, fields, count):
+        """Fill the Wells (and Plates) Named in the Manifest
+
+        A new plate starts whenever the Plate column changes or, without
+        one, whenever a well already filled comes round again; rows of
+        one plate must therefore be listed together.
+        """
+
+        try:
+            indices = self.geometry.indicesOf(wells.tolist())
+        except KeyError as err:
+            raise ValueError("%s in the manifest" % err.args[0])
+        # Split the chunk where the plate changes
+        if plates is not None:
+            breaks = np.flatnonzero(plates[1:] != plates[:-1]) + 1
+        else:
+            breaks = np.empty(0, dtype=np.intp)
+        done = []
+        for start, stop in zip(np.r_[0, breaks], np.r_[breaks, count]):
+            barcode = str(plates[start]) if plates is not None else None
+            if self.plate is None or (
+                    barcode is not None and barcode != self.plate.barcode):
+                done += self.newPlate(barcode)
+            # Without plate names, a repeated well starts the next plate
+            part = np.arange(start, stop)
+            while len(part):
+                first = self.firstRepeat(indices[part])
+                take = part[:first]
+                if len(take):
+                    self.plate.assign(indices[take], {f: v[take] for f, v in fields.items()})
+                    self.filled[indices[take]] = True
+                part = part[first:]
+                if len(part):
+                    if barcode is not None:
+                        raise ValueError(
+                            "Well %s of plate %s is listed twice"
+                            % (self.geometry.names[indices[part[0]]], barcode)
+                        )
+                    done += self.newPlate()
+        return done
+
+    def firstRepeat(self, indices):
+        """Return How Many Leading Wells Can Go on the Current Plate
+
+        That is, the position of the first well that is already filled or
+        appears earlier in `indices`.
+        """
+
+        seen = self.filled.copy()
+        for k, index in enumerate(indices.tolist()):
+            if seen[index]:
+                return k
+            seen[index] = True
+        return len(indices)
+
+    def finish(self):
+        """Return the Last Plate, if it Holds any Samples"""
+
+        plate, self.plate = self.plate, None
+        return [plate] if plate is not None and plate.count() else []
+
+    def importFile(self, path, chunkRows=CHUNK_ROWS, delimiter=None):
+        """Yield the Plates of a Manifest File as Each is Completed"""
+
+        if delimiter is None and path.lower().endswith((".tsv", ".tab")):
+            delimiter = "\t"
+        with open(path, "rb") as raw:
+            file = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            for firstRow, values in readManifest(file, self.mapping, chunkRows, delimiter):
+                self.bytesRead = raw.tell()
+                try:
+                    plates = self.feed(values)
+                except ValueError as err:
+                    raise ValueError("%s (rows from %d)" % (err, firstRow))
+                yield from plates
+        yield from self.finish()
+
+def importToRepository(path, repo, batch=100, **options):
+    """Import a Manifest Straight into the Plate Database
+
+    Plates are saved `batch` at a time and then dropped, so any manifest
+    size is imported in bounded memory. Returns the number of plates.
+    `options` are passed to `ManifestImporter`.
+    """
+
+    importer = ManifestImporter(**options)
+    plates, count = [], 0
+    for plate in importer.importFile(path):
+        plates.append(plate)
+        if len(plates) == batch:
+            repo.savePlates(plates)
+            count += len(plates)
+            plates = []
+    repo.savePlates(plates)
+    return count + len(plates)
+
+def stem(path):
+    """Return a File's Name Without Directory or Extension (a Barcode Stem)"""
+    return os.path.splitext(os.path.basename(path))[0]
@@ -0,0 +1,367 @@
+"""
+    Filename: Journal.py
+
+    Autosave and crash recovery for the plates open in a session.
+
+    Every edit of a watched plate is appended to an on-disk journal, so
+    the session can be rebuilt at the next start-up - after a crash or an
+    ordinary exit alike. The journal is a directory of two files in the
+    same record format:
+
+        snapshot.wpj  the full contents of every plate at one moment
+        journal.wpj   every change made since that snapshot
+
+    Each file starts with a header (magic "WPJL", format version and a
+    generation number) followed by records: a header (payload length,
+    CRC-32 of the payload, record kind, plate number) and the payload.
+    A change record holds one field of one edit - the wells written and
+    their new values - so edits cost bytes proportional to the wells
+    changed, not to the plate.
+
+    Edits are only queued on the GUI thread. A background writer encodes
+    them and commits whatever has gathered in one write and one fsync
+    (group commit), so a burst of typing costs one disk flush and the
+    editor never waits for the disk. Once the change log grows past a
+    threshold it is compacted: the plates are snapshotted and the log is
+    started afresh under the next generation, so recovery always reads
+    one snapshot and a short log. A log whose generation does not match
+    the snapshot's predates it and is ignored; a record torn by a crash
+    ends the log.
+"""
+
+# Import modules
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+import model
+import plateio
+
+# Default journal directory
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".wellplate", "session")
+SNAPSHOT = "snapshot.wpj"
+LOG = "journal.wpj"
+
+# Journal identification
+MAGIC = b"WPJL"
+VERSION = 1
+
+# File header: magic, version, reserved, generation
+HEADER = struct.Struct("<4sHHQ")
+# Record header: payload length, payload CRC-32, kind, plate number
+RECORD = struct.Struct("<IIB3xI")
+# Change payload header: field code, number of wells
+CHANGE = struct.Struct("<B3xI")
+
+# Record kinds
+OPEN, CHANGED, RENAMED = 1, 2, 3
+
+# Field codes of change records
+FIELD_CODES = {name: code for code, name in enumerate(model.FIELDS)}
+FIELD_NAMES = list(model.FIELDS)
+
+# Seconds the writer waits for more edits before each commit
+COMMIT_DELAY = 0.05
+
+# Size of the change log (bytes) past which it is compacted
+COMPACT_BYTES = 4 * 2**20
+
+def encodeRecord(kind, plate, payload):
+    """Frame a Record Payload with its Header"""
+    return RECORD.pack(len(payload), zlib.crc32(payload), kind, plate) + payload
+
+def encodeOpen(plate):
+    """Encode a Plate's Full Contents (plateio Record, then Packed Flags)"""
+
+    record = plateio.encodePlate(plate)
+    return struct.pack("<I", len(record)) + record + np.packbits(plate.flagged).tobytes()
+
+def decodeOpen(payload):
+    """Decode a Plate from an Open Record"""
+
+    length, = struct.unpack_from("<I", payload)
+    plate = plateio.decodePlate(payload, 4)
+    flags = np.frombuffer(payload, dtype=np.uint8, offset=4 + length)
+    plate.columns["flagged"] = np.unpackbits(flags, count=plate.wells).astype(bool)
+    return plate
+
+def encodeChange(field, indices, values):
+    """Encode the New Values of One Field in Some Wells"""
+
+    parts = [CHANGE.pack(FIELD_CODES[field], len(indices)),
+             indices.astype("<u2").tobytes()]
+    if values.dtype.kind == "T":
+        offsets, blob = plateio.encodeStrings(values)
+        parts += [offsets.tobytes(), blob]
+    else:
+        parts.append(values.astype(model.FIELDS[field][0]).tobytes())
+    return b"".join(parts)
+
+def decodeChange(payload):
+    """Decode a Change Record as (Field, Well Indices, Values)"""
+
+    code, count = CHANGE.unpack_from(payload)
+    field = FIELD_NAMES[code]
+    pos = CHANGE.size
+    indices = np.frombuffer(payload, dtype="<u2", count=count, offset=pos).astype(np.intp)
+    pos += 2 * count
+    dtype = model.FIELDS[field][0]
+    if dtype is model.STRING:
+        offsets = np.frombuffer(payload, dtype="<u4", count=count + 1, offset=pos)
+        pos += offsets.nbytes
+        values = plateio.decodeStrings(offsets, bytes(payload[pos:pos + int(offsets[-1])]))
+    else:
+        values = np.frombuffer(payload, dtype=dtype, count=count, offset=pos).copy()
+    return field, indices, values
+
+def readRecords(path):
+    """Return (Generation, [(Kind, Plate, Payload)]) from a Journal File
+
+    Reading stops at the first short or corrupt record, which is where a
+    crash interrupted a write. A missing file has generation None.
+    """
+
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None, []
+    if len(data) < HEADER.size:
+        return None, []
+    magic, version, _, generation = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("%s is not a WellPlate journal" % path)
+    if version > VERSION:
+        raise ValueError(
+            "%s uses journal version %d; this WellPlate reads up to "
+            "version %d" % (path, version, VERSION)
+        )
+    records = []
+    pos = HEADER.size
+    view = memoryview(data)
+    while pos + RECORD.size <= len(data):
+        length, crc, kind, plate = RECORD.unpack_from(data, pos)
+        payload = view[pos + RECORD.size:pos + RECORD.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        records.append((kind, plate, payload))
+        pos += RECORD.size + length
+    return generation, records
+
+def recover(directory=DEFAULT_DIR):
+    """Rebuild the Plates of the Last Session, in the Order they were Opened"""
+
+    generation, records = readRecords(os.path.join(directory, SNAPSHOT))
+    if generation is None:
+        return []
+    logGeneration, log = readRecords(os.path.join(directory, LOG))
+    if logGeneration == generation:
+        records += log
+    plates = {}
+    for kind, number, payload in records:
+        if kind == OPEN:
+            plates[number] = decodeOpen(payload)
+        elif number not in plates:
+            continue
+        elif kind == CHANGED:
+            field, indices, values = decodeChange(payload)
+            plates[number].columns[field][indices] = values
+        elif kind == RENAMED:
+            plates[number].barcode = bytes(payload).decode("utf-8")
+    return [plates[number] for number in sorted(plates)]
+
+def writeFile(path, generation, records):
+    """Write a Journal File Atomically (Temporary File, fsync, Rename)"""
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, generation))
+        file.write(b"".join(records))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+# * Journal Class
+class Journal:
+    """Append Every Edit of the Watched Plates to the Session Journal"""
+
+    def __init__(self, directory=DEFAULT_DIR, commitDelay=COMMIT_DELAY,
+                 compactBytes=COMPACT_BYTES):
+        """Class Initializer"""
+
+        self.directory = directory
+        self.commitDelay = commitDelay
+        self.compactBytes = compactBytes
+        # Watched plate -> plate number in the journal
+        self.numbers = {}
+        # Work for the writer: records, snapshots and the final stop
+        self.queue = queue.Queue()
+        self.writer = None
+        self.log = None
+        self.generation = 0
+        # Bytes in the change log, updated by the writer
+        self.logBytes = 0
+        # Disk error that stopped the writer, if any
+        self.error = None
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def start(self):
+        """Start the Writer with a Snapshot of the Plates Watched So Far
+
+        Call `recover` first: the new snapshot replaces the last session.
+        """
+
+        if self.writer is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        generation, _ = readRecords(os.path.join(self.directory, SNAPSHOT))
+        self.generation = generation or 0
+        self.writer = threading.Thread(target=self.run, name="journal", daemon=True)
+        self.writer.start()
+        self.compact()
+
+    def watch(self, plate):
+        """Journal a Plate's Contents Now, and Every Later Edit"""
+
+        if plate in self.numbers:
+            return
+        self.numbers[plate] = len(self.numbers)
+        self.queue.put((OPEN, self.numbers[plate], plate.copy()))
+        plate.addListener(self.record)
+
+    def record(self, change):
+        """Queue a Plate Change for the Writer (Plate Listener)"""
+
+        number = self.numbers.get(change.plate)
+        if number is not None:
+            self.queue.put((CHANGED, number, (change.indices.copy(), change.new)))
+
+    def rename(self, plate):
+        """Journal a New Plate Barcode"""
+
+        if plate in self.numbers:
+            self.queue.put((RENAMED, self.numbers[plate], plate.barcode))
+
+    def needsCompaction(self):
+        """Check Whether the Change Log has Grown Past its Threshold"""
+        return self.logBytes > self.compactBytes
+
+    def compact(self):
+        """Queue a Snapshot of Every Watched Plate, Restarting the Change Log"""
+
+        # Copies are taken now, so the snapshot holds exactly the edits
+        # queued before it
+        self.queue.put(("snapshot", None, [
+            (number, plate.copy()) for plate, number in self.numbers.items()
+        ]))
+
+    def flush(self):
+        """Wait Until Everything Queued has been Written"""
+        if self.writer is not None:
+            self.queue.join()
+
+    def close(self):
+        """Snapshot the Plates, then Stop the Writer"""
+
+        if self.writer is None:
+            return
+        self.compact()
+        self.queue.put(("stop", None, None))
+        self.writer.join()
+        self.writer = None
+        for plate in self.numbers:
+            plate.removeListener(self.record)
+
+    def discard(self):
+        """Delete the Journal Files of the Last Session"""
+
+        for name in (SNAPSHOT, LOG):
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # Writer thread
+
+    def run(self):
+        """Commit Queued Work in Groups Until Stopped (Writer Thread)"""
+
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            # Gather the edits arriving meanwhile into the same commit
+            time.sleep(self.commitDelay)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                records = []
+                for kind, number, data in batch:
+                    if kind == "stop":
+                        stopping = True
+                    elif kind == "snapshot":
+                        # Pending records are already part of the snapshot
+                        records = []
+                        self.writeSnapshot(data)
+                    else:
+                        records += self.encode(kind, number, data)
+                if records and self.log is not None:
+                    self.commit(records)
+            except OSError as err:
+                # Keep draining the queue, but write no more changes until
+                # the next snapshot: a log with a gap recovers wrong contents
+                self.error = err
+                if self.log is not None:
+                    self.log.close()
+                    self.log = None
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def encode(self, kind, number, data):
+        """Encode Queued Work as Journal Records"""
+
+        if kind == OPEN:
+            return [encodeRecord(OPEN, number, encodeOpen(data))]
+        if kind == RENAMED:
+            return [encodeRecord(RENAMED, number, data.encode("utf-8"))]
+        indices, values = data
+        return [
+            encodeRecord(CHANGED, number, encodeChange(field, indices, values[field]))
+            for field in values
+        ]
+
+    def commit(self, records):
+        """Append Records to the Change Log with a Single Write and fsync"""
+
+        data = b"".join(records)
+        self.log.write(data)
+        self.log.flush()
+        os.fsync(self.log.fileno())
+        self.logBytes += len(data)
+
+    def writeSnapshot(self, plates):
+        """Write a Snapshot and Start the Change Log of the Next Generation"""
+
+        self.generation += 1
+        writeFile(
+            os.path.join(self.directory, SNAPSHOT), self.generation,
+            [encodeRecord(OPEN, number, encodeOpen(plate)) for number, plate in plates]
+        )
+        # The old log predates the new snapshot; a crash from here on
+        # leaves a log of the wrong generation, which recovery ignores
+        path = os.path.join(self.directory, LOG)
+        if self.log is not None:
+            self.log.close()
+        writeFile(path, self.generation, [])
+        self.log = open(path, "ab")
+        self.logBytes = 0
@@ -0,0 +1,393 @@
+"""
+    Filename: Kinetics.py
+
+    On-disk store for kinetic plate reads: a value for every well of every
+    plate at every timepoint (plate x well x time).
+
+    A store is a single file that is memory-mapped, never read whole:
+
+        Header       magic "WPKN", format version, number of pyramid
+                     levels, plates, wells, timepoints and the pyramid
+                     factor (32 bytes)
+        Times        float64[timepoints], seconds from the first read
+        Data         float32[plates, wells, timepoints], NaN where a well
+                     has no reading (each well's series is contiguous)
+        Pyramid      for each level k = 1, 2, ..: min, max and mean of
+                     bins of factor**k timepoints, float32[plates, wells,
+                     bins]
+
+    The pyramid levels are built in time chunks of a bounded size, so
+    building them never holds more than a chunk of the data in memory.
+    Plots ask for a number of points over a time range and are served
+    from the coarsest level that still has that many bins in the range;
+    full-resolution data is only read once a plot is zoomed in far enough
+    to show individual timepoints.
+
+    Kinetic reads exported with one row per timepoint (a Time column,
+    then one column per well) are imported with `importCSV`.
+"""
+
+# Import modules
+import csv
+import os
+import re
+import struct
+import numpy as np
+import geometry
+import plateio
+
+# Store identification
+MAGIC = b"WPKN"
+VERSION = 1
+EXTENSION = ".wpk"
+
+# Header: magic, version, levels, plates, wells, timepoints, factor
+HEADER = struct.Struct("<4sHHIIII8x")
+
+# Timepoints per bin grow by this factor from one pyramid level to the next
+FACTOR = 4
+
+# Levels are added until the coarsest has at most this many bins
+COARSEST_BINS = 64
+
+# Timepoints processed at a time when building pyramids or importing
+CHUNK_POINTS = 8192
+
+def align(size):
+    """Round a Byte Count Up to the Next Multiple of 8"""
+    return (size + 7) & ~7
+
+def levelCount(timepoints, factor=FACTOR):
+    """Return the Number of Pyramid Levels for a Series Length"""
+
+    levels = 0
+    while -(-timepoints // factor ** levels) > COARSEST_BINS:
+        levels += 1
+    return levels
+
+def binStats(low, high, total, count, factor):
+    """Merge Runs of `factor` Bins (Along the Last Axis) into One"""
+
+    merged = [a[..., ::factor].copy() for a in (low, high, total, count)]
+    for k in range(1, factor):
+        np.fmin(merged[0], low[..., k::factor], out=merged[0])
+        np.fmax(merged[1], high[..., k::factor], out=merged[1])
+        merged[2] += total[..., k::factor]
+        merged[3] += count[..., k::factor]
+    return merged
+
+def parseTime(text):
+    """Convert a Time Cell (Seconds, or h:mm:ss / mm:ss) to Seconds"""
+
+    text = text.strip()
+    if ":" in text:
+        seconds = 0.0
+        for part in text.split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    match = re.fullmatch(r"([\d.]+)\s*(s|sec|min|h)?", text)
+    if match is None:
+        raise ValueError("Cannot read the time %r" % text)
+    scale = {"min": 60.0, "h": 3600.0}.get(match.group(2), 1.0)
+    return float(match.group(1)) * scale
+
+# * Kinetic Store Class
+class KineticStore:
+    """Memory-Mapped Kinetic Reads of Several Plates of One Format"""
+
+    def __init__(self, path, mode="r"):
+        """Class Initializer
+
+        `mode` is "r" to read, or "r+" to write data and pyramids.
+        """
+
+        self.path = path
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("%s is not a kinetic store" % path)
+        magic, version, levels, plates, wells, timepoints, factor = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("%s is not a kinetic store" % path)
+        if version > VERSION:
+            raise ValueError(
+                "%s uses kinetic store version %d; this WellPlate reads up "
+                "to version %d" % (path, version, VERSION)
+            )
+        self.geometry = geometry.getGeometry(wells)
+        self.plates, self.wells, self.timepoints = plates, wells, timepoints
+        self.factor = factor
+        # Map every section; nothing is read until it is indexed
+        offset = HEADER.size
+
+        def section(dtype, shape):
+            nonlocal offset
+            array = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+            offset += align(array.nbytes)
+            return array
+
+        self.times = section("<f8", (timepoints,))
+        self.data = section("<f4", (plates, wells, timepoints))
+        # Pyramid level k (from 1) holds bins of factor**k timepoints
+        self.levels = []
+        for k in range(1, levels + 1):
+            shape = (plates, wells, -(-timepoints // factor ** k))
+            self.levels.append((section("<f4", shape), section("<f4", shape),
+                                section("<f4", shape)))
+
+    @classmethod
+    def create(cls, path, plates, wells, times, factor=FACTOR):
+        """Create an Empty Store (Every Value NaN) for the Given Timepoints"""
+
+        times = np.asarray(times, dtype="<f8")
+        timepoints = len(times)
+        levels = levelCount(timepoints, factor)
+        geometry.getGeometry(wells)
+        size = HEADER.size + align(times.nbytes) + align(4 * plates * wells * timepoints)
+        for k in range(1, levels + 1):
+            size += 3 * align(4 * plates * wells * -(-timepoints // factor ** k))
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, levels, plates, wells, timepoints, factor))
+            file.write(times.tobytes())
+            file.truncate(size)
+        store = cls(path, "r+")
+        # Fill with NaN chunk by chunk, so unread timepoints show as gaps
+        for start in range(0, timepoints, CHUNK_POINTS):
+            store.data[:, :, start:start + CHUNK_POINTS] = np.nan
+        for arrays in store.levels:
+            for array in arrays:
+                array[:] = np.nan
+        return store
+
+    def __len__(self):
+        return self.plates
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, plate, start, values):
+        """Write Values (Wells x Timepoints) from Timepoint `start` Onwards"""
+        self.data[plate, :, start:start + values.shape[-1]] = values
+
+    def buildPyramids(self, plate=None, start=0, stop=None):
+        """Recompute the Pyramid Levels over a Range of Timepoints
+
+        The data is read `CHUNK_POINTS` timepoints at a time, and each
+        level is built from the bins of the level below. Bins left over
+        from a chunk (fewer than the factor) are carried into the next,
+        so every bin is computed from complete data and memory use stays
+        bounded however many levels there are.
+        """
+
+        if not self.levels:
+            return
+        plates = range(self.plates) if plate is None else [plate]
+        stop = self.timepoints if stop is None else stop
+        # Rebuild whole bins of the coarsest level
+        width = self.factor ** len(self.levels)
+        start -= start % width
+        stop = min(-(-stop // width) * width, self.timepoints)
+        for p in plates:
+            # Per level: bins of the level below not merged yet, and the
+            # next bin to write
+            carried = [None] * len(self.levels)
+            nextBins = [start // self.factor ** k for k in range(1, len(self.levels) + 1)]
+            for begin in range(start, stop, CHUNK_POINTS):
+                end = min(begin + CHUNK_POINTS, stop)
+                raw = np.array(self.data[p, :, begin:end])
+                finite = np.isfinite(raw)
+                stats = [raw, raw, np.where(finite, raw, 0.0).astype(np.float64),
+                         finite.astype(np.int32)]
+                for k, (low, high, mean) in enumerate(self.levels):
+                    if carried[k] is not None:
+                        stats = [np.concatenate(pair, axis=-1)
+                                 for pair in zip(carried[k], stats)]
+                    size = stats[0].shape[-1]
+                    if end == self.timepoints:
+                        # Pad the final partial bin with gaps
+                        pad = -size % self.factor
+                        stats = [np.pad(a, ((0, 0), (0, pad)), constant_values=value)
+                                 for a, value in zip(stats, (np.nan, np.nan, 0, 0))]
+                        size += pad
+                    whole = size - size % self.factor
+                    carried[k] = [a[:, whole:] for a in stats] if whole < size else None
+                    stats = binStats(*(a[:, :whole] for a in stats), self.factor)
+                    first = nextBins[k]
+                    last = first + stats[0].shape[-1]
+                    nextBins[k] = last
+                    low[p, :, first:last] = stats[0]
+                    high[p, :, first:last] = stats[1]
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        mean[p, :, first:last] = stats[2] / stats[3]
+
+    def level(self, timepoints, points):
+        """Return the Coarsest Level (0 = Full Resolution) Keeping `points` Bins
+
+        `timepoints` is the length of the range to be shown.
+        """
+
+        for k in range(len(self.levels), 0, -1):
+            if timepoints // self.factor ** k >= points:
+                return k
+        return 0
+
+    def series(self, plate, well, start=0, stop=None, points=512):
+        """Return (Times, Min, Max, Mean) of One Well over Timepoints [start, stop)
+
+        At least `points` values are returned where the range has that
+        many timepoints, from the coarsest level that provides them; at
+        full resolution min, max and mean are the values themselves.
+        """
+
+        stop = self.timepoints if stop is None else min(stop, self.timepoints)
+        k = self.level(stop - start, points)
+        if k == 0:
+            values = np.array(self.data[plate, well, start:stop])
+            return self.times[start:stop].copy(), values, values, values
+        width = self.factor ** k
+        first, last = start // width, -(-stop // width)
+        low, high, mean = (np.array(a[plate, well, first:last]) for a in self.levels[k - 1])
+        return self.times[first * width:last * width:width].copy(), low, high, mean
+
+    def overview(self, plate, points=32):
+        """Return the (Wells, Bins) Means of Every Well, for Sparklines"""
+
+        k = self.level(self.timepoints, points)
+        if k == 0:
+            return np.array(self.data[plate])
+        return np.array(self.levels[k - 1][2][plate])
+
+    def plate(self, plate):
+        """Return the Kinetic Read of One Plate"""
+        return PlateKinetics(self, plate)
+
+    def flush(self):
+        """Write Changes Back to the File"""
+        for array in [self.data] + [a for arrays in self.levels for a in arrays]:
+            if array.mode == "r+":
+                array.flush()
+
+    def close(self):
+        """Release the Memory Maps"""
+
+        if self.data is None:
+            return
+        self.flush()
+        self.times = self.data = None
+        self.levels = []
+
+# * Plate Kinetics Class
+class PlateKinetics:
+    """The Kinetic Read of One Plate in a Store (see PlateModel.kinetics)"""
+
+    def __init__(self, store, plate):
+        """Class Initializer"""
+
+        self.store = store
+        self.plate = plate
+        self.wells = store.wells
+        self.timepoints = store.timepoints
+
+    def times(self):
+        """Return the Time (Seconds) of Every Timepoint"""
+        return self.store.times
+
+    def series(self, well, start=0, stop=None, points=512):
+        """Return (Times, Min, Max, Mean) of One Well (see KineticStore.series)"""
+        return self.store.series(self.plate, well, start, stop, points)
+
+    def sparklines(self, points=32):
+        """Return Every Well's Mean Curve Scaled to 0-1 Across the Plate"""
+
+        lines = self.store.overview(self.plate, points)
+        finite = lines[np.isfinite(lines)]
+        if not len(finite):
+            return lines
+        low, high = float(finite.min()), float(finite.max())
+        return (lines - low) / max(high - low, 1e-12)
+
+def parseBlock(lines, delimiter, columns):
+    """Read Lines of a Kinetic File as (Times, Timepoints x Columns Values)
+
+    All-numeric lines are parsed by NumPy in one call; otherwise blank
+    cells and text (e.g. "OVER" for a saturated well) become NaN.
+    """
+
+    rows = list(csv.reader(lines, delimiter=delimiter))
+    times = [parseTime(row[0]) for row in rows]
+    try:
+        values = np.loadtxt(lines, delimiter=delimiter, usecols=range(1, columns + 1),
+                            ndmin=2)
+    except ValueError:
+        cells = [(row[1:] + [""] * columns)[:columns] for row in rows]
+        values = np.full((len(rows), columns), np.nan)
+        for r, row in enumerate(cells):
+            for c, cell in enumerate(row):
+                try:
+                    values[r, c] = float(cell)
+                except ValueError:
+                    pass
+    return times, values
+
+def importCSV(path, storePath, wells=None, progress=None):
+    """Import a Kinetic Read (a Time Column, then One Column per Well)
+
+    The file is read twice - once to count the timepoints, once to fill
+    the store `CHUNK_POINTS` rows at a time - so it is never held whole.
+    `progress(done, total)` is called after every chunk. Returns the
+    path of the store.
+
+    The store is built under a temporary name and only renamed to
+    `storePath` once complete, so an import cancelled by `progress` or
+    stopped by an error leaves no partial store behind.
+    """
+
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        header = file.readline()
+        delimiter = max("\t,;", key=header.count)
+        timepoints = sum(1 for line in file if line.strip())
+    if not timepoints:
+        raise ValueError("%s has no timepoints" % path)
+    header = next(csv.reader([header], delimiter=delimiter))
+    names = [name.strip() for name in header[1:]]
+    if wells is None:
+        wells = plateio.guessFormat(names)
+    indices = geometry.getGeometry(wells).indicesOf(names)
+    # Timepoint times are only known as the file is read, so they are
+    # filled in last
+    temporary = storePath + ".part"
+    store = None
+    try:
+        store = KineticStore.create(temporary, 1, wells, np.zeros(timepoints))
+        times = []
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            file.readline()
+            lines = (line for line in file if line.strip())
+            while True:
+                chunk = [line for _, line in zip(range(CHUNK_POINTS), lines)]
+                if not chunk:
+                    break
+                chunkTimes, block = parseBlock(chunk, delimiter, len(names))
+                values = np.full((wells, len(chunk)), np.nan, dtype=np.float32)
+                values[indices] = block.T
+                store.write(0, len(times), values)
+                times += chunkTimes
+                if progress is not None:
+                    progress(len(times), timepoints)
+        times = np.asarray(times)
+        store.times[:] = times - times[0]
+        store.times.flush()
+        store.buildPyramids()
+        store.close()
+        os.replace(temporary, storePath)
+    except BaseException:
+        # Cancelled (by `progress`) or failed: remove the partial store
+        if store is not None:
+            store.close()
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return storePath
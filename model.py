@@ -6,4 +6,447 @@
 
     For WellPlate, the model will handle all the logic necessary for
     managing th e-plate layouts via the plate interface (view).
-"""
\ No newline at end of file
+
+    Sample data is stored column-wise ("struct of arrays"): every sample
+    field is a NumPy array indexed by well index, so filling, filtering
+    and aggregating a plate - or a whole stack of plates - are single
+    vectorized operations rather than loops over per-well Python objects.
+"""
+
+# Import modules
+import re
+import numpy as np
+import geometry
+
+# Sample types offered by the sample form; type code 0 marks an empty well
+SAMPLE_TYPES = ("Serum", "DNA", "RNA", "NGS Library", "Other")
+EMPTY = 0
+
+# Variable-width string dtype for text fields
+STRING = np.dtypes.StringDType()
+
+# Sample fields: name -> (dtype, value of an empty well)
+FIELDS = {
+    "sampleID": (STRING, ""),
+    "volume": (np.float64, np.nan),
+    "sampleType": (np.int8, EMPTY),
+    "concentration": (np.float64, np.nan),
+    "description": (STRING, ""),
+    # Wells marked for attention (e.g. to re-check); not a sample value
+    "flagged": (np.bool_, False),
+}
+
+def emptyColumns(shape):
+    """Return a Set of Empty Sample Columns of the Given Shape"""
+    return {
+        name: np.full(shape, empty, dtype=dtype)
+        for name, (dtype, empty) in FIELDS.items()
+    }
+
+def typeCode(sampleType):
+    """Convert Sample Type Names (or Codes) to Type Codes (Vectorized)"""
+
+    if isinstance(sampleType, str):
+        return SAMPLE_TYPES.index(sampleType) + 1 if sampleType else EMPTY
+    values = np.asarray(sampleType)
+    if values.dtype.kind in "iu":
+        return values
+    return np.array([typeCode(str(v)) for v in values.ravel()],
+                    dtype=np.int8).reshape(values.shape)
+
+def typeName(code):
+    """Convert a Type Code to its Sample Type Name ("" When Empty)"""
+    return SAMPLE_TYPES[code - 1] if code else ""
+
+def matchMask(columns, sampleType=None, minVolume=None, maxVolume=None,
+              minConc=None, maxConc=None, idPrefix=None, occupied=True):
+    """Return a Boolean Mask of Wells Matching All Given Criteria"""
+
+    mask = np.ones(columns["sampleType"].shape, dtype=bool)
+    if occupied:
+        mask &= occupiedMask(columns)
+    if sampleType is not None:
+        mask &= columns["sampleType"] == typeCode(sampleType)
+    # NaN compares False, so unset volumes/concentrations never match
+    if minVolume is not None:
+        mask &= columns["volume"] >= minVolume
+    if maxVolume is not None:
+        mask &= columns["volume"] <= maxVolume
+    if minConc is not None:
+        mask &= columns["concentration"] >= minConc
+    if maxConc is not None:
+        mask &= columns["concentration"] <= maxConc
+    if idPrefix is not None:
+        mask &= np.strings.startswith(columns["sampleID"], idPrefix)
+    return mask
+
+def occupiedMask(columns):
+    """Return a Boolean Mask of Wells Holding a Sample"""
+    return (columns["sampleType"] != EMPTY) | (columns["sampleID"] != "")
+
+# * Change Record Class
+class Change:
+    """Record of One Mutation of a Plate"""
+
+    def __init__(self, plate, indices, old, new):
+        """Class Initializer"""
+
+        self.plate = plate
+        # Well indices written, and the names of the fields written
+        self.indices = indices
+        self.fields = tuple(new)
+        # Field -> values before and after, aligned with `indices`
+        self.old = old
+        self.new = new
+
+# * Well Clip Class
+class WellClip:
+    """Copied Wells: Positions Relative to the Top-Left Well, and Values"""
+
+    def __init__(self, rows, cols, columns):
+        """Class Initializer"""
+
+        self.rows = rows
+        self.cols = cols
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.rows)
+
+# * Plate Model Class
+class PlateModel:
+    """Columnar Sample Data for a Single Plate"""
+
+    def __init__(self, wells=96, barcode="", columns=None):
+        """Class Initializer"""
+
+        self.geometry = geometry.getGeometry(wells)
+        self.wells = wells
+        self.barcode = barcode
+        # Sample columns, each indexed by well index; fields missing
+        # from `columns` start out empty
+        self.columns = emptyColumns(wells)
+        if columns is not None:
+            self.columns.update(columns)
+        # Callables notified with a `Change` after every mutation
+        self.listeners = []
+        # Kinetic read of the plate (a kinetics.PlateKinetics), if any;
+        # its time series stay on disk
+        self.kinetics = None
+
+    def __repr__(self):
+        return "PlateModel(%d, barcode=%r, samples=%d)" % (
+            self.wells, self.barcode, self.count()
+        )
+
+    # Column accessors
+    @property
+    def sampleID(self):
+        return self.columns["sampleID"]
+
+    @property
+    def volume(self):
+        return self.columns["volume"]
+
+    @property
+    def sampleType(self):
+        return self.columns["sampleType"]
+
+    @property
+    def concentration(self):
+        return self.columns["concentration"]
+
+    @property
+    def description(self):
+        return self.columns["description"]
+
+    @property
+    def flagged(self):
+        return self.columns["flagged"]
+
+    def wellIndices(self, wells=None):
+        """Normalize a Well Spec (Name, Index, Names, Indices, Mask) to Indices"""
+
+        if wells is None:
+            return np.arange(self.wells)
+        if isinstance(wells, str):
+            return np.array([self.geometry.indexOf(wells)])
+        if isinstance(wells, (int, np.integer)):
+            return np.array([wells])
+        wells = np.asarray(wells)
+        if wells.dtype == bool:
+            return np.flatnonzero(wells)
+        if wells.dtype.kind in "iu":
+            return wells.ravel().astype(np.intp)
+        return self.geometry.indicesOf([str(w) for w in wells.ravel()])
+
+    def assign(self, indices, values):
+        """Write Field Values into the Given Wells
+
+        `values` maps field names to a scalar (broadcast to every well) or
+        to an array with one value per index. This is the single path
+        through which every mutation of the plate passes.
+        """
+
+        for field in values:
+            if field not in FIELDS:
+                raise KeyError("Unknown sample field: %r" % field)
+        indices = np.asarray(indices, dtype=np.intp)
+        # Old and new values are only gathered when someone is listening
+        listening = bool(self.listeners)
+        old, new = {}, {}
+        for field, value in values.items():
+            if field == "sampleType":
+                value = typeCode(value)
+            column = self.columns[field]
+            if listening:
+                old[field] = column[indices]
+            column[indices] = value
+            if listening:
+                new[field] = column[indices]
+        if listening:
+            self.notify(Change(self, indices, old, new))
+        return indices
+
+    def addListener(self, listener):
+        """Call `listener(change)` After Every Mutation of the Plate"""
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        """Stop Notifying a Listener"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, change):
+        """Pass a Change to Every Listener"""
+        for listener in list(self.listeners):
+            listener(change)
+
+    def setSample(self, well, **values):
+        """Set the Fields of a Single Well"""
+        return self.assign(self.wellIndices(well), values)
+
+    def getSample(self, well):
+        """Return the Fields of a Single Well as a Dictionary"""
+
+        index = int(self.wellIndices(well)[0])
+        sample = {"well": str(self.geometry.names[index])}
+        for field, column in self.columns.items():
+            sample[field] = column[[index]].tolist()[0]
+        sample["sampleType"] = typeName(sample["sampleType"])
+        return sample
+
+    def commonValues(self, wells):
+        """Return Each Field's Value if All Given Wells Share It, Else None"""
+
+        indices = self.wellIndices(wells)
+        values = {}
+        for field, column in self.columns.items():
+            selected = column[indices]
+            first = selected[:1]
+            same = selected == first
+            if selected.dtype.kind == "f":
+                same |= np.isnan(selected) & np.isnan(first)
+            values[field] = first.tolist()[0] if len(first) and same.all() else None
+        if values["sampleType"] is not None:
+            values["sampleType"] = typeName(values["sampleType"])
+        return values
+
+    def fill(self, wells=None, **values):
+        """Set Fields for Many Wells at Once (Vectorized)"""
+        return self.assign(self.wellIndices(wells), values)
+
+    def clear(self, wells=None):
+        """Empty the Given Wells (Every Well by Default)"""
+        return self.assign(self.wellIndices(wells), {
+            name: empty for name, (dtype, empty) in FIELDS.items()
+        })
+
+    def incrementIDs(self, wells, prefix="", start=1, step=1, width=0,
+                     byColumn=False):
+        """Number the Sample IDs of Many Wells (e.g. S-001, S-002, ...)
+
+        Wells are numbered row by row, or column by column with `byColumn`.
+        """
+
+        indices = self.geometry.walkOrder(self.wellIndices(wells), byColumn)
+        numbers = (np.arange(len(indices)) * step + start).astype(STRING)
+        ids = np.strings.add(prefix, np.strings.zfill(numbers, width))
+        return self.assign(indices, {"sampleID": ids})
+
+    def serialDilution(self, wells, start, factor=2.0, byColumn=False):
+        """Fill Concentrations with Serial Dilutions
+
+        Each row of the given wells is a dilution series running left to
+        right from `start`, divided by `factor` at every step; with
+        `byColumn` each column is a series running top to bottom.
+        """
+
+        indices = self.wellIndices(wells)
+        if byColumn:
+            steps = self.geometry.row[indices]
+        else:
+            steps = self.geometry.col[indices]
+        steps = steps - steps.min() if len(steps) else steps
+        return self.assign(indices, {
+            "concentration": start / float(factor) ** steps
+        })
+
+    def copyWells(self, wells):
+        """Copy Wells, Keeping their Layout Relative to the Top-Left Well"""
+
+        indices = self.wellIndices(wells)
+        rows = self.geometry.row[indices].astype(np.intp)
+        cols = self.geometry.col[indices].astype(np.intp)
+        return WellClip(
+            rows - rows.min(), cols - cols.min(),
+            {name: column[indices].copy() for name, column in self.columns.items()}
+        )
+
+    def pasteWells(self, clip, anchor):
+        """Paste Copied Wells with their Top-Left Well at `anchor`
+
+        Wells that would fall off the plate are dropped. Returns the
+        indices written.
+        """
+
+        index = int(self.wellIndices(anchor)[0])
+        rows = clip.rows + self.geometry.row[index]
+        cols = clip.cols + self.geometry.col[index]
+        inside = (rows < self.geometry.rows) & (cols < self.geometry.cols)
+        indices = self.geometry.index(rows[inside], cols[inside])
+        return self.assign(indices, {
+            name: column[inside] for name, column in clip.columns.items()
+        })
+
+    def replaceText(self, field, old, new, wells=None, matchCase=True):
+        """Replace Text in a String Field Across Many Wells at Once
+
+        Returns the indices of the wells that changed; all of them are
+        written by a single `assign`.
+        """
+
+        if FIELDS[field][0] != STRING:
+            raise TypeError("%s is not a text field" % field)
+        indices = self.wellIndices(wells)
+        current = self.columns[field][indices]
+        if matchCase:
+            replaced = np.strings.replace(current, old, new)
+        else:
+            pattern = re.compile(re.escape(old), re.IGNORECASE)
+            replaced = np.array(
+                [pattern.sub(lambda match: new, s) for s in current.tolist()],
+                dtype=STRING
+            )
+        changed = replaced != current
+        if changed.any():
+            self.assign(indices[changed], {field: replaced[changed]})
+        return indices[changed]
+
+    def flag(self, wells, flagged=True):
+        """Flag (or Unflag) Wells"""
+        return self.assign(self.wellIndices(wells), {"flagged": flagged})
+
+    def occupied(self):
+        """Return a Boolean Mask of Wells Holding a Sample"""
+        return occupiedMask(self.columns)
+
+    def select(self, **criteria):
+        """Return the Indices of Wells Matching All Criteria
+
+        See `matchMask` for the available criteria.
+        """
+        return np.flatnonzero(matchMask(self.columns, **criteria))
+
+    def count(self):
+        """Return the Number of Occupied Wells"""
+        return int(np.count_nonzero(self.occupied()))
+
+    def totalVolume(self):
+        """Return the Summed Volume of All Samples (uL)"""
+        return float(np.nansum(self.volume))
+
+    def countByType(self):
+        """Return the Number of Samples of Each Type"""
+
+        counts = np.bincount(self.sampleType, minlength=len(SAMPLE_TYPES) + 1)
+        return dict(zip(SAMPLE_TYPES, counts[1:].tolist()))
+
+    def copy(self):
+        """Return an Independent Copy of the Plate"""
+        return PlateModel(self.wells, self.barcode, {
+            name: column.copy() for name, column in self.columns.items()
+        })
+
+# * Plate Stack Class
+class PlateStack:
+    """Columnar Sample Data for Many Plates of the Same Format
+
+    Every column has shape (plates, wells). Indexing the stack returns a
+    `PlateModel` whose columns are views into the stack, so edits made
+    through the plate are edits to the stack.
+    """
+
+    def __init__(self, plates, wells=96, barcodes=None, columns=None):
+        """Class Initializer"""
+
+        self.geometry = geometry.getGeometry(wells)
+        self.wells = wells
+        self.barcodes = list(barcodes) if barcodes else [""] * plates
+        self.columns = (
+            emptyColumns((plates, wells)) if columns is None else columns
+        )
+
+    @classmethod
+    def fromPlates(cls, plates):
+        """Stack Several Plates of One Format into a Single Stack"""
+
+        plates = list(plates)
+        wells = {plate.wells for plate in plates}
+        if len(wells) != 1:
+            raise ValueError("Cannot stack plates of different formats")
+        return cls(len(plates), wells.pop(), [p.barcode for p in plates], {
+            name: np.stack([p.columns[name] for p in plates])
+            for name in FIELDS
+        })
+
+    def __len__(self):
+        return len(self.barcodes)
+
+    def __getitem__(self, plate):
+        """Return a Plate View onto One Row of the Stack"""
+        return PlateModel(self.wells, self.barcodes[plate], {
+            name: column[plate] for name, column in self.columns.items()
+        })
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def fill(self, plates=None, wells=None, **values):
+        """Set Fields for the Same Wells on Several Plates (Vectorized)"""
+
+        plates = np.arange(len(self)) if plates is None else np.asarray(plates)
+        wells = self[0].wellIndices(wells)
+        rows, cols = np.ix_(plates.ravel(), wells)
+        for field, value in values.items():
+            if field not in FIELDS:
+                raise KeyError("Unknown sample field: %r" % field)
+            if field == "sampleType":
+                value = typeCode(value)
+            self.columns[field][rows, cols] = value
+
+    def occupied(self):
+        """Return a (Plates, Wells) Mask of Occupied Wells"""
+        return occupiedMask(self.columns)
+
+    def select(self, **criteria):
+        """Return (Plate, Well) Index Arrays of Wells Matching All Criteria"""
+        return np.nonzero(matchMask(self.columns, **criteria))
+
+    def count(self):
+        """Return the Number of Occupied Wells on Each Plate"""
+        return np.count_nonzero(self.occupied(), axis=1)
+
+    def totalVolume(self):
+        """Return the Summed Sample Volume of Each Plate (uL)"""
+        return np.nansum(self.columns["volume"], axis=1)
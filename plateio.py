@@ -0,0 +1,393 @@
+"""
+    Filename: PlateIO.py
+
+    Reading and writing plate layouts.
+
+    The native format (.wpl) is a compact, versioned binary "plate library"
+    that can hold any number of plates:
+
+        File header   magic "WPLT", format version, plate count and the
+                      offset of the plate index (32 bytes)
+        Plate records one per plate, each made of columnar sections:
+                      record header (wells, barcode length), barcode,
+                      volume (float64[wells]), concentration
+                      (float64[wells]), sample type (int8[wells]), then
+                      sample ID and description as uint32 offset tables
+                      followed by their UTF-8 text
+        Plate index   (offset, length) of every plate record (uint64)
+
+    Libraries are opened with `mmap`, and the index gives the position of
+    every record, so reading one plate out of thousands costs a seek and
+    a few array copies rather than a parse of the whole file.
+
+    CSV and JSON import/export is provided for interoperability; a CSV
+    file may hold several plates, told apart by its Plate column.
+"""
+
+# Import modules
+import csv
+import json
+import mmap
+import os
+import struct
+import numpy as np
+import geometry
+import model
+
+# Native format identification
+MAGIC = b"WPLT"
+VERSION = 1
+EXTENSION = ".wpl"
+
+# File header: magic, version, reserved, plate count, index offset
+HEADER = struct.Struct("<4sHHIQ12x")
+# Plate record header: wells, barcode length (bytes)
+RECORD = struct.Struct("<IH2x")
+
+# Column headings used for CSV files
+CSV_COLUMNS = {
+    "sampleID": "Sample ID",
+    "volume": "Volume (uL)",
+    "sampleType": "Sample Type",
+    "concentration": "Concentration (ng/uL)",
+    "description": "Description",
+}
+
+def align(size):
+    """Round a Byte Count Up to the Next Multiple of 8"""
+    return (size + 7) & ~7
+
+def encodeStrings(column):
+    """Encode a String Column as (uint32 Offsets, UTF-8 Blob)"""
+
+    encoded = [s.encode("utf-8") for s in column.tolist()]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(s) for s in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+def decodeStrings(offsets, blob):
+    """Decode a String Column from (Offsets, UTF-8 Blob)"""
+
+    if offsets[-1] == 0:
+        return np.full(len(offsets) - 1, "", dtype=model.STRING)
+    bounds = offsets.tolist()
+    return np.array([
+        blob[start:end].decode("utf-8")
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ], dtype=model.STRING)
+
+def encodePlate(plate):
+    """Serialize One Plate to a Binary Plate Record"""
+
+    wells = plate.wells
+    barcode = plate.barcode.encode("utf-8")
+    idOffsets, idBlob = encodeStrings(plate.sampleID)
+    descrOffsets, descrBlob = encodeStrings(plate.description)
+
+    # Sections are padded to 8 bytes so every array is aligned in the file
+    parts = [RECORD.pack(wells, len(barcode)), barcode]
+    parts.append(b"\0" * (align(RECORD.size + len(barcode))
+                          - RECORD.size - len(barcode)))
+    parts.append(plate.volume.astype("<f8").tobytes())
+    parts.append(plate.concentration.astype("<f8").tobytes())
+    parts.append(plate.sampleType.astype("i1").tobytes())
+    parts.append(b"\0" * (align(wells) - wells))
+    parts.append(idOffsets.tobytes())
+    parts.append(descrOffsets.tobytes())
+    parts.append(idBlob)
+    parts.append(descrBlob)
+    return b"".join(parts)
+
+def decodePlate(buffer, offset=0):
+    """Deserialize a Binary Plate Record Starting at `offset`"""
+
+    wells, barcodeLen = RECORD.unpack_from(buffer, offset)
+    pos = offset + RECORD.size
+    barcode = bytes(buffer[pos:pos + barcodeLen]).decode("utf-8")
+    pos = offset + align(RECORD.size + barcodeLen)
+
+    # Read the fixed-width numeric sections straight from the buffer
+    def section(dtype, count):
+        nonlocal pos
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=pos)
+        pos += array.nbytes
+        return array
+
+    volume = section("<f8", wells).astype(np.float64)
+    concentration = section("<f8", wells).astype(np.float64)
+    sampleType = section("i1", wells).astype(np.int8)
+    pos = pos - wells + align(wells)
+    idOffsets = section("<u4", wells + 1)
+    descrOffsets = section("<u4", wells + 1)
+    idBlob = bytes(buffer[pos:pos + int(idOffsets[-1])])
+    pos += int(idOffsets[-1])
+    descrBlob = bytes(buffer[pos:pos + int(descrOffsets[-1])])
+
+    return model.PlateModel(wells, barcode, {
+        "sampleID": decodeStrings(idOffsets, idBlob),
+        "volume": volume,
+        "sampleType": sampleType,
+        "concentration": concentration,
+        "description": decodeStrings(descrOffsets, descrBlob),
+    })
+
+def writePlates(path, plates):
+    """Write Plates to a Binary Plate Library"""
+
+    index = []
+    with open(path, "wb") as file:
+        file.write(b"\0" * HEADER.size)
+        for plate in plates:
+            record = encodePlate(plate)
+            index.append((file.tell(), len(record)))
+            file.write(record)
+            file.write(b"\0" * (align(len(record)) - len(record)))
+        indexOffset = file.tell()
+        file.write(np.array(index, dtype="<u8").reshape(-1, 2).tobytes())
+        # Write the header last, once the index position is known
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(index), indexOffset))
+    return len(index)
+
+# * Plate Library Class
+class PlateLibrary:
+    """Random-Access Reader for Binary Plate Libraries"""
+
+    def __init__(self, path):
+        """Class Initializer"""
+
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError("%s is not a plate library (empty file)" % path)
+
+        magic, version, _, plates, indexOffset = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("%s is not a plate library" % path)
+        if version > VERSION:
+            self.close()
+            raise ValueError(
+                "%s uses plate format version %d; this WellPlate reads up "
+                "to version %d" % (path, version, VERSION)
+            )
+        self.version = version
+        self.index = np.frombuffer(
+            self.buffer, dtype="<u8", count=2 * plates, offset=indexOffset
+        ).reshape(plates, 2)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, plate):
+        """Read a Single Plate"""
+
+        if not -len(self) <= plate < len(self):
+            raise IndexError("plate library has %d plates" % len(self))
+        return decodePlate(self.buffer, int(self.index[plate, 0]))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def barcodes(self):
+        """Return the Barcode of Every Plate (Reads Record Headers Only)"""
+
+        barcodes = []
+        for offset in self.index[:, 0].tolist():
+            wells, barcodeLen = RECORD.unpack_from(self.buffer, offset)
+            start = offset + RECORD.size
+            barcodes.append(self.buffer[start:start + barcodeLen].decode("utf-8"))
+        return barcodes
+
+    def close(self):
+        """Release the Memory Map and File"""
+
+        # Drop array views into the map before closing it
+        self.index = np.empty((0, 2), dtype="<u8")
+        if getattr(self, "buffer", None) is not None:
+            self.buffer.close()
+            self.buffer = None
+        self.file.close()
+
+def exportCSV(plate, path):
+    """Write a Plate to CSV, One Row per Well"""
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Plate", "Well"] + list(CSV_COLUMNS.values()))
+        columns = [plate.columns[field].tolist() for field in CSV_COLUMNS]
+        columns[2] = [model.typeName(code) for code in columns[2]]
+        # Unset numbers are written as empty cells
+        for k in (1, 3):
+            columns[k] = ["" if v != v else repr(v) for v in columns[k]]
+        for name, *values in zip(plate.geometry.names.tolist(), *columns):
+            writer.writerow([plate.barcode, name] + values)
+
+def readCSV(path, wells=None):
+    """Read Every Plate from CSV
+
+    Rows are grouped into plates by their Plate column (in the order the
+    plates first appear), so a file listing several plates, as the
+    command-line export writes, reads back as several plates. Every
+    plate has the format the well names of the file imply (see
+    `guessFormat`), unless `wells` is given; a well listed twice for one
+    plate is an error.
+    """
+
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.DictReader(file)
+        if "Well" not in (reader.fieldnames or []):
+            raise ValueError("%s has no Well column" % path)
+        rows = list(reader)
+    groups = {}
+    # Rows are numbered as in the file, after the header
+    for number, row in enumerate(rows, start=2):
+        groups.setdefault(row.get("Plate") or "", []).append((number, row))
+    if not rows:
+        return [model.PlateModel(wells or 96)]
+    if wells is None:
+        wells = guessFormat([row["Well"] or "" for row in rows],
+                            [len(group) for group in groups.values()])
+    return [readCSVPlate(path, barcode, group, wells) for barcode, group in groups.items()]
+
+def readCSVPlate(path, barcode, rows, wells):
+    """Build One Plate from its (Row Number, Row) Pairs of a CSV File"""
+
+    names = [row["Well"] or "" for _, row in rows]
+    plate = model.PlateModel(wells, barcode)
+    try:
+        indices = plate.geometry.indicesOf(names)
+    except KeyError as err:
+        raise ValueError("%s: %s" % (path, err.args[0]))
+    # Each well may be listed once per plate; a repeat would overwrite it
+    seen = {}
+    for (number, _), index in zip(rows, indices.tolist()):
+        if index in seen:
+            raise ValueError("%s: row %d lists well %s%s again (first on row %d)" % (
+                path, number, plate.geometry.names[index],
+                " of plate %s" % barcode if barcode else "", seen[index]
+            ))
+        seen[index] = number
+
+    # Build whole columns, then write them with a single vectorized fill
+    def number(text):
+        return float(text) if text.strip() else np.nan
+
+    values = {}
+    for field, heading in CSV_COLUMNS.items():
+        cells = [row.get(heading) or "" for _, row in rows]
+        if field in ("volume", "concentration"):
+            values[field] = np.array([number(c) for c in cells])
+        else:
+            values[field] = cells
+    plate.assign(indices, values)
+    return plate
+
+def importCSV(path, wells=None):
+    """Read a Plate from CSV (see `readCSV`; the File Must Hold One Plate)"""
+
+    plates = readCSV(path, wells)
+    if len(plates) > 1:
+        raise ValueError("%s holds %d plates; open it as a plate library" % (
+            path, len(plates)
+        ))
+    return plates[0]
+
+def exportJSON(plate, path):
+    """Write the Occupied Wells of a Plate to JSON"""
+
+    samples = []
+    for index in np.flatnonzero(plate.occupied()).tolist():
+        sample = plate.getSample(index)
+        for field in ("volume", "concentration"):
+            if sample[field] != sample[field]:
+                sample[field] = None
+        samples.append(sample)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({
+            "format": "wellplate", "version": VERSION,
+            "barcode": plate.barcode, "wells": plate.wells,
+            "samples": samples,
+        }, file, indent=1)
+
+def importJSON(path):
+    """Read a Plate from JSON Written by `exportJSON`"""
+
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    plate = model.PlateModel(data["wells"], data.get("barcode", ""))
+    samples = data.get("samples", [])
+    if samples:
+        indices = plate.geometry.indicesOf([s["well"] for s in samples])
+        values = {}
+        for field, (dtype, empty) in model.FIELDS.items():
+            column = [s.get(field) for s in samples]
+            values[field] = [empty if v is None else v for v in column]
+        plate.assign(indices, values)
+    return plate
+
+def wellPosition(name):
+    """Return the 0-Based (Row, Column) of a Well Name (e.g. "B07" -> (1, 6))"""
+
+    label = name.strip().upper()
+    split = len(label.rstrip("0123456789"))
+    letters, digits = label[:split], label[split:]
+    if not letters.isalpha() or not letters.isascii() or not digits.strip("0"):
+        raise ValueError("%r is not a well name" % name)
+    row = 0
+    for letter in letters:
+        row = row * 26 + ord(letter) - ord("A") + 1
+    return row - 1, int(digits) - 1
+
+def guessFormat(names, counts=None):
+    """Return the Plate Format Implied by a List of Well Names
+
+    The names must fit the format: its rows and columns reach the highest
+    row and column named. Of the formats that fit, the one with as many
+    wells as there are names (a file listing every well) is preferred,
+    then the smallest. For names of several plates, `counts` gives the
+    number of names of each.
+    """
+
+    positions = [wellPosition(name) for name in names]
+    lastRow = max((row for row, _ in positions), default=0)
+    lastCol = max((col for _, col in positions), default=0)
+    fitting = [
+        wells for wells, (rows, cols) in sorted(geometry.FORMATS.items())
+        if lastRow < rows and lastCol < cols
+    ]
+    if not fitting:
+        raise ValueError("Well names do not fit any plate format")
+    listed = [wells for wells in (counts or [len(names)]) if wells in fitting]
+    return max(listed) if listed else fitting[0]
+
+def loadPlates(path):
+    """Read Every Plate from a Plate, CSV or JSON File"""
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return readCSV(path)
+    if extension == ".json":
+        return [importJSON(path)]
+    with PlateLibrary(path) as library:
+        return list(library)
+
+def savePlate(path, plate):
+    """Write a Plate to a Plate, CSV or JSON File (by Extension)"""
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        exportCSV(plate, path)
+    elif extension == ".json":
+        exportJSON(plate, path)
+    else:
+        writePlates(path, [plate])
@@ -0,0 +1,255 @@
+"""
+    Filename: Profiling.py
+
+    Opt-in instrumentation of the GUI (`wellplate.py --profile`), to find
+    which handler makes the interface stutter.
+
+    Three kinds of event are recorded:
+
+        - slot: the run time of a controller slot (opening, loading and
+          saving plates, well clicks, edits, ...), wrapped by `instrument`;
+        - paint: the time a plate view takes to paint itself;
+        - lag: how late a heartbeat timer fires, i.e. how long the event
+          loop was kept from handling input.
+
+    Events go into a fixed-size ring buffer of NumPy arrays, so recording
+    one costs a few scalar stores and never allocates, and the oldest are
+    overwritten once it is full. Each event name also keeps a histogram
+    of its durations since profiling started, which the ring buffer would
+    lose. Both can be dumped to JSON or viewed in the profiler panel.
+"""
+
+# Import modules
+from bisect import bisect_right
+from functools import wraps
+import inspect
+import json
+import time
+import numpy as np
+from PyQt6.QtCore import QEvent, QObject, QTimer, Qt
+
+# Event kinds
+SLOT, PAINT, LAG = 0, 1, 2
+KIND_NAMES = ("slot", "paint", "lag")
+
+# Events held by the ring buffer
+RING_SIZE = 2**16
+
+# Upper edges of the duration histogram buckets (ms); the last bucket
+# holds everything slower
+BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Milliseconds between heartbeats of the event-loop lag timer
+HEARTBEAT_INTERVAL = 50
+
+# * Ring Buffer Class
+class RingBuffer:
+    """Fixed-Size Store of the Latest Events, Oldest Overwritten First"""
+
+    def __init__(self, size=RING_SIZE):
+        """Class Initializer"""
+
+        self.size = size
+        self.kinds = np.zeros(size, dtype=np.uint8)
+        self.names = np.zeros(size, dtype=np.uint16)
+        # Start (seconds since profiling started) and duration (ms)
+        self.starts = np.zeros(size, dtype=np.float64)
+        self.durations = np.zeros(size, dtype=np.float32)
+        # Events recorded in all; the next one goes to `count % size`
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def append(self, kind, name, start, duration):
+        """Store One Event"""
+
+        k = self.count % self.size
+        self.kinds[k] = kind
+        self.names[k] = name
+        self.starts[k] = start
+        self.durations[k] = duration
+        self.count += 1
+
+    def order(self):
+        """Return the Slots of the Events Held, Oldest First"""
+
+        if self.count <= self.size:
+            return np.arange(self.count)
+        return np.roll(np.arange(self.size), -(self.count % self.size))
+
+    def clear(self):
+        """Forget Every Event"""
+        self.count = 0
+
+# * Paint Timer Class
+class PaintTimer(QObject):
+    """Time the Paint Events of Widgets (Event Filter)
+
+    The filter paints the widget itself, between two clock readings, and
+    consumes the event.
+    """
+
+    def __init__(self, profiler, name):
+        """Class Initializer"""
+
+        super().__init__()
+        self.profiler = profiler
+        self.name = profiler.nameID(PAINT, name)
+
+    def eventFilter(self, obj, event):
+        if event.type() != QEvent.Type.Paint:
+            return False
+        started = time.perf_counter()
+        obj.paintEvent(event)
+        self.profiler.record(PAINT, self.name, started, time.perf_counter() - started)
+        return True
+
+# * Profiler Class
+class Profiler:
+    """Record Slot Run Times, Paint Times and Event-Loop Lag"""
+
+    def __init__(self, size=RING_SIZE):
+        """Class Initializer"""
+
+        self.events = RingBuffer(size)
+        self.started = time.perf_counter()
+        # (Kind, name) of every event name, by ID, and the IDs by (kind, name)
+        self.keys = []
+        self.ids = {}
+        # Duration histogram of each event name since profiling started
+        self.histograms = []
+        self.heartbeat = None
+        self.paintTimers = []
+
+    def nameID(self, kind, name):
+        """Return the ID Events of a Kind and Name are Recorded Under"""
+
+        key = (kind, name)
+        if key not in self.ids:
+            self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.histograms.append([0] * (len(BUCKETS) + 1))
+        return self.ids[key]
+
+    def record(self, kind, name, started, seconds):
+        """Record an Event (`name` as Returned by `nameID`)"""
+
+        ms = seconds * 1000
+        self.events.append(kind, name, started - self.started, ms)
+        self.histograms[name][bisect_right(BUCKETS, ms)] += 1
+
+    def wrap(self, name, fn):
+        """Return `fn` Wrapped to Record its Run Time as a Slot
+
+        Like Qt does for `fn` itself, the wrapper drops signal arguments
+        `fn` does not take (e.g. the `checked` of a button click).
+        """
+
+        key = self.nameID(SLOT, name)
+        record = self.record
+        parameters = inspect.signature(fn).parameters.values()
+        if any(p.kind == p.VAR_POSITIONAL for p in parameters):
+            taken = None
+        else:
+            taken = sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+                        for p in parameters)
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args[:taken], **kwargs)
+            finally:
+                record(SLOT, key, started, time.perf_counter() - started)
+        return timed
+
+    def instrument(self, obj, names):
+        """Time Methods of an Object, by Name
+
+        The wrappers replace the methods on the object itself, so signals
+        must be connected after this for their slots to be timed.
+        """
+
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+
+    def watchPaints(self, widget, name):
+        """Time Every Paint of a Widget"""
+
+        timer = PaintTimer(self, name)
+        widget.installEventFilter(timer)
+        # Event filters are not owned by the widgets they watch
+        self.paintTimers.append(timer)
+        widget.destroyed.connect(lambda: self.paintTimers.remove(timer))
+
+    def startHeartbeat(self, parent, interval=HEARTBEAT_INTERVAL):
+        """Measure Event-Loop Lag: how Late a Repeating Timer Fires"""
+
+        key = self.nameID(LAG, "event loop")
+        self.heartbeat = QTimer(parent)
+        self.heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        self.heartbeat.setInterval(interval)
+        due = [time.perf_counter() + interval / 1000]
+
+        def beat():
+            now = time.perf_counter()
+            self.record(LAG, key, due[0], max(now - due[0], 0.0))
+            due[0] = now + interval / 1000
+
+        self.heartbeat.timeout.connect(beat)
+        self.heartbeat.start()
+
+    def clear(self):
+        """Forget Every Event and Histogram"""
+
+        self.events.clear()
+        self.histograms = [[0] * (len(BUCKETS) + 1) for _ in self.keys]
+
+    def summary(self):
+        """Return Statistics of Every Event Name Recorded, Slowest First
+
+        Each row holds the kind and name, the calls since profiling
+        started, the histogram of their durations, and the mean, median,
+        95th percentile and maximum duration (ms) of the events still in
+        the ring buffer.
+        """
+
+        held = self.events.order()
+        names = self.events.names[held]
+        durations = self.events.durations[held]
+        rows = []
+        for key, (kind, name) in enumerate(self.keys):
+            histogram = self.histograms[key]
+            calls = sum(histogram)
+            if not calls:
+                continue
+            recent = durations[names == key].astype(np.float64)
+            row = {"kind": KIND_NAMES[kind], "name": name, "calls": calls,
+                   "histogram": list(histogram)}
+            if len(recent):
+                row.update(mean=float(recent.mean()), median=float(np.median(recent)),
+                           p95=float(np.percentile(recent, 95)), max=float(recent.max()))
+            rows.append(row)
+        rows.sort(key=lambda row: -row.get("p95", 0))
+        return rows
+
+    def dump(self, path):
+        """Write the Summary and Every Event Held to a JSON File"""
+
+        held = self.events.order()
+        events = [
+            {"kind": KIND_NAMES[kind], "name": self.keys[name][1],
+             "start": round(start, 6), "ms": round(ms, 4)}
+            for kind, name, start, ms in zip(
+                self.events.kinds[held].tolist(), self.events.names[held].tolist(),
+                self.events.starts[held].tolist(), self.events.durations[held].tolist()
+            )
+        ]
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({
+                "buckets": list(BUCKETS),
+                "summary": self.summary(),
+                "dropped": self.events.count - len(self.events),
+                "events": events,
+            }, file, indent=1)
@@ -0,0 +1,278 @@
+"""
+    Filename: Readout.py
+
+    Plate-reader data: import, normalization and colour scaling.
+
+    A read is one value per well (absorbance, fluorescence, ...) held as a
+    float array in well-index order, with NaN where a well was not read.
+    Reads of one format are kept together as a (reads, wells) array, so
+    normalizing a hundred plates is the same handful of NumPy calls as
+    normalizing one. Two file layouts are imported:
+
+        - matrix: the plate drawn as a grid, rows labelled A, B, .. and
+          columns 1, 2, ..; a file may hold several grids, each titled by
+          the line above it;
+        - long: one row per well, with a Well column, an optional Plate
+          column and one column of values per measurement.
+
+    Normalizations: percent of control (the mean of the control wells is
+    100%), Z-score (against the mean and standard deviation of the plate)
+    and B-score (residuals of a two-way median polish of the rows and
+    columns, scaled by their median absolute deviation), which removes
+    row and column effects such as edge evaporation.
+"""
+
+# Import modules
+import csv
+from contextlib import contextmanager
+import io
+import warnings
+import numpy as np
+import geometry
+import importer
+import model
+import plateio
+
+# Normalization methods, by name
+METHODS = ("Raw", "Percent of control", "Z-score", "B-score")
+
+# Header names of the columns of a long-format file that are not values
+WELL_COLUMNS = ("well", "position", "wellposition")
+PLATE_COLUMNS = ("plate", "barcode", "platebarcode", "plateid", "read")
+
+# Median polish iterations for B-scores
+POLISH_ITERATIONS = 10
+
+# Scale from median absolute deviation to standard deviation
+MAD_SCALE = 1.4826
+
+# * Reads Class
+class Reads:
+    """Plate-Reader Values of Several Plates of One Format"""
+
+    def __init__(self, wells, names, values, measures=None):
+        """Class Initializer
+
+        `values` has one row of `wells` values per read, and `measures`
+        names what each read measured (reads of one measure share a
+        colour scale).
+        """
+
+        self.geometry = geometry.getGeometry(wells)
+        self.wells = wells
+        self.names = list(names)
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(self.names), wells)
+        self.measures = list(measures) if measures else [""] * len(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def normalized(self, method="Raw", controls=None):
+        """Return Every Read Normalized by One Method (see METHODS)"""
+
+        if method == "Raw":
+            return self.values
+        if method == "Percent of control":
+            return percentOfControl(self.values, controls)
+        if method == "Z-score":
+            return zScore(self.values)
+        if method == "B-score":
+            return bScore(self.values, self.geometry)
+        raise ValueError("Unknown normalization: %r" % method)
+
+    def colourLevels(self, values, method="Raw"):
+        """Scale Normalized Reads onto Colour Levels, One Scale per Measure
+
+        Returns the levels and the (low, high) scale of every read.
+        """
+
+        levels = np.zeros(values.shape, dtype=np.uint8)
+        ranges = [None] * len(self)
+        measures = np.array(self.measures, dtype=object)
+        for measure in dict.fromkeys(self.measures):
+            reads = np.flatnonzero(measures == measure)
+            low, high = colourRange(values[reads], method)
+            levels[reads] = scaleValues(values[reads], low, high)
+            for read in reads.tolist():
+                ranges[read] = (low, high)
+        return levels, ranges
+
+@contextmanager
+def quiet():
+    """Silence NumPy's Warnings About Empty Plates and All-NaN Rows"""
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        yield
+
+def percentOfControl(values, controls):
+    """Express Values as a Percentage of the Mean of the Control Wells"""
+
+    controls = np.asarray(controls)
+    if controls.size == 0 or (controls.dtype == bool and not controls.any()):
+        raise ValueError("Percent of control needs control wells")
+    with quiet():
+        mean = np.nanmean(values[..., controls], axis=-1, keepdims=True)
+        return 100.0 * values / mean
+
+def zScore(values):
+    """Express Values as Standard Deviations from the Mean of Each Plate"""
+
+    with quiet():
+        mean = np.nanmean(values, axis=-1, keepdims=True)
+        return (values - mean) / np.nanstd(values, axis=-1, keepdims=True)
+
+def bScore(values, tables, iterations=POLISH_ITERATIONS):
+    """Return B-Scores: Median-Polish Residuals over their Scaled MAD"""
+
+    residuals = values.reshape(values.shape[:-1] + (tables.rows, tables.cols)).copy()
+    with quiet():
+        # Sweep out row and then column medians until they settle
+        for _ in range(iterations):
+            residuals -= np.nanmedian(residuals, axis=-1, keepdims=True)
+            residuals -= np.nanmedian(residuals, axis=-2, keepdims=True)
+        residuals = residuals.reshape(values.shape)
+        mad = np.nanmedian(
+            np.abs(residuals - np.nanmedian(residuals, axis=-1, keepdims=True)),
+            axis=-1, keepdims=True
+        )
+        return residuals / (MAD_SCALE * mad)
+
+def colourRange(values, method="Raw"):
+    """Return the (Low, High) Values Spanned by the Colour Scale
+
+    Scores are centred on zero; other values span their 1st to 99th
+    percentile, so a few outliers do not wash out the rest.
+    """
+
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return 0.0, 1.0
+    if method in ("Z-score", "B-score"):
+        bound = max(float(np.percentile(np.abs(finite), 99)), 1e-9)
+        return -bound, bound
+    low, high = np.percentile(finite, [1, 99]).tolist()
+    return low, max(high, low + 1e-9)
+
+def scaleValues(values, low, high):
+    """Map Values onto Colour Indices 1-255 (0 Where a Well has No Value)"""
+
+    with quiet():
+        scaled = np.clip((values - low) / (high - low), 0, 1) * 254 + 1
+    return np.where(np.isfinite(values), scaled, 0).astype(np.uint8)
+
+def sniff(text):
+    """Return the Delimiter (Tab, Comma or Semicolon) Used Most in a Text"""
+    return max("\t,;", key=text.count)
+
+def parseMatrix(rows):
+    """Find the Plate Grids in a File's Rows; Return (Wells, Names, Values)
+
+    A grid starts at a row labelled "A" followed by rows "B", "C", ..; its
+    title is the nearest line of text above it, back to the last grid.
+    """
+
+    names, grids, wells = [], [], None
+    # Grid size by number of rows (each format has its own row count)
+    shapes = {rows: (rows, cols) for rows, cols in geometry.FORMATS.values()}
+    k = end = 0
+    while k < len(rows):
+        if not rows[k] or rows[k][0].strip().upper() != "A":
+            k += 1
+            continue
+        # Collect the rows of the grid
+        start, block = k, []
+        while k < len(rows) and rows[k] and \
+                rows[k][0].strip().upper() == geometry.rowLabel(len(block)):
+            block.append(rows[k][1:])
+            k += 1
+        if len(block) not in shapes:
+            raise ValueError("A grid of %d rows is not a plate format" % len(block))
+        shape = shapes[len(block)]
+        if wells is not None and shape[0] * shape[1] != wells:
+            raise ValueError("The file holds grids of different plate formats")
+        wells = shape[0] * shape[1]
+        grid = np.full(shape, np.nan)
+        for r, cells in enumerate(block):
+            for c, cell in enumerate(cells[:shape[1]]):
+                try:
+                    grid[r, c] = float(cell)
+                except ValueError:
+                    pass        # Blank, or e.g. "OVER" for a saturated well
+        grids.append(grid.ravel())
+        names.append(gridTitle(rows[end:start]) or "Read %d" % len(grids))
+        end = k
+    if not grids:
+        raise ValueError("No plate grid (rows labelled A, B, ..) found")
+    return wells, names, np.stack(grids)
+
+def gridTitle(rows):
+    """Return the Last Line of Text in the Rows Above a Grid"""
+
+    for row in reversed(rows):
+        cells = [c.strip() for c in row if c.strip()]
+        # Skip blank lines and the column header (1, 2, 3, ..)
+        if cells and not all(c.isdigit() for c in cells):
+            return " ".join(cells)
+    return ""
+
+def parseLong(rows, wells=None):
+    """Read a One-Row-per-Well Table; Return (Wells, Names, Measures, Values)
+
+    Each value column of each plate becomes one read, named "plate:
+    column" (or just the column, without a Plate column).
+    """
+
+    header = [importer.normalize(name) for name in rows[0]]
+    body = [row + [""] * (len(header) - len(row)) for row in rows[1:] if any(row)]
+    wellColumn = next((i for i, name in enumerate(header) if name in WELL_COLUMNS), None)
+    if wellColumn is None:
+        raise ValueError("The file has no Well column")
+    plateColumn = next(
+        (i for i, name in enumerate(header) if name in PLATE_COLUMNS), None
+    )
+    names = [row[wellColumn].strip() for row in body]
+    if wells is None:
+        wells = plateio.guessFormat(sorted(set(names)))
+    try:
+        indices = geometry.getGeometry(wells).indicesOf(names)
+    except KeyError as err:
+        raise ValueError(err.args[0])
+    # Number the plates in the order they first appear
+    plates = [row[plateColumn].strip() if plateColumn is not None else ""
+              for row in body]
+    plateNames = list(dict.fromkeys(plates))
+    numbers = {plate: p for p, plate in enumerate(plateNames)}
+    plateIndex = np.array([numbers[plate] for plate in plates], dtype=np.intp)
+    readNames, measures, reads = [], [], []
+    for column, heading in enumerate(rows[0]):
+        if column in (wellColumn, plateColumn):
+            continue
+        cells = np.strings.strip(np.array([row[column] for row in body], dtype=model.STRING))
+        try:
+            values = np.where(cells == "", "nan", cells).astype(np.float64)
+        except ValueError:
+            continue        # Not a column of numbers (e.g. sample names)
+        grid = np.full((len(plateNames), wells), np.nan)
+        grid[plateIndex, indices] = values
+        for plate, values in zip(plateNames, grid):
+            readNames.append("%s: %s" % (plate, heading) if plate else heading)
+            measures.append(heading)
+            reads.append(values)
+    if not reads:
+        raise ValueError("The file has no column of values")
+    return wells, readNames, measures, np.stack(reads)
+
+def readReads(path, wells=None):
+    """Import a Plate-Reader File (Matrix or Long Format) as Reads"""
+
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        text = file.read()
+    rows = list(csv.reader(io.StringIO(text), delimiter=sniff(text)))
+    first = next((row for row in rows if any(c.strip() for c in row)), [])
+    header = [importer.normalize(name) for name in first]
+    if any(name in WELL_COLUMNS for name in header):
+        wells, names, measures, values = parseLong(rows[rows.index(first):], wells)
+        return Reads(wells, names, values, measures)
+    wells, names, values = parseMatrix(rows)
+    return Reads(wells, names, values)
@@ -0,0 +1,212 @@
+"""
+    Filename: Reformat.py
+
+    Reformatting of plates: moving samples from plates of one format onto
+    plates of the same or another format.
+
+    Every reformat is described by a `WellMap` - four index arrays of equal
+    length giving, for each transfer, the source plate and well and the
+    destination plate and well. Maps are built without touching any plate:
+
+        - quadrantMap: four plates stamped into the quadrants of one plate
+          of four times the wells (4 x 96 -> 384, 4 x 384 -> 1536), well A1
+          of quadrant q going to row q // 2, column q % 2 of the new plate;
+        - splitMap: the reverse, one plate split into its four quadrants;
+        - cherryPickMap: an explicit list of well-to-well transfers;
+        - compressMap: the occupied wells of sparse plates packed one after
+          another onto as few plates as possible.
+
+    `applyMap` then moves every field of every sample with one gather and
+    one scatter per column of a `model.PlateStack`, however many plates
+    are reformatted.
+"""
+
+# Import modules
+import numpy as np
+import geometry
+import importer
+import model
+
+# * Well Map Class
+class WellMap:
+    """Source -> Destination Well Map of a Reformat"""
+
+    def __init__(self, sourceWells, destWells, srcPlate, srcWell, dstPlate,
+                 dstWell, destPlates=None):
+        """Class Initializer
+
+        `destPlates` is the number of destination plates; by default, just
+        enough for the highest destination plate index.
+        """
+
+        self.source = geometry.getGeometry(sourceWells)
+        self.dest = geometry.getGeometry(destWells)
+        self.srcPlate, self.srcWell, self.dstPlate, self.dstWell = (
+            np.asarray(array, dtype=np.intp).ravel()
+            for array in (srcPlate, srcWell, dstPlate, dstWell)
+        )
+        if not (len(self.srcPlate) == len(self.srcWell) == len(self.dstPlate)
+                == len(self.dstWell)):
+            raise ValueError("Well map arrays differ in length")
+        for plates, wells, tables in ((self.srcPlate, self.srcWell, self.source),
+                                      (self.dstPlate, self.dstWell, self.dest)):
+            if len(wells) and (wells.min() < 0 or wells.max() >= tables.wells):
+                raise ValueError("The well map has wells off the plate")
+            if len(plates) and plates.min() < 0:
+                raise ValueError("The well map has negative plate indices")
+        if destPlates is None:
+            destPlates = int(self.dstPlate.max()) + 1 if len(self) else 0
+        self.destPlates = destPlates
+        # Two transfers into one well would leave only one of the samples
+        slots = self.dstPlate * destWells + self.dstWell
+        if len(np.unique(slots)) != len(slots):
+            raise ValueError("The well map fills a destination well twice")
+
+    def __len__(self):
+        return len(self.srcWell)
+
+    def __repr__(self):
+        return "WellMap(%d -> %d wells, %d transfers)" % (
+            self.source.wells, self.dest.wells, len(self)
+        )
+
+    def sourcePlates(self):
+        """Return the Number of Source Plates the Map Reads From"""
+        return int(self.srcPlate.max()) + 1 if len(self) else 0
+
+    def inverse(self):
+        """Return the Map Moving Every Sample Back"""
+
+        return WellMap(
+            self.dest.wells, self.source.wells, self.dstPlate, self.dstWell,
+            self.srcPlate, self.srcWell, self.sourcePlates()
+        )
+
+    def transfers(self):
+        """Return the Transfers as (Source Plate, Well Name, Dest Plate, Well Name)"""
+
+        return list(zip(
+            self.srcPlate.tolist(), self.source.names[self.srcWell].tolist(),
+            self.dstPlate.tolist(), self.dest.names[self.dstWell].tolist()
+        ))
+
+def quadrantTable(sourceWells):
+    """Return the (4, Wells) Destination Indices of Each Quadrant's Wells
+
+    Row q lists, in the source plate's well order, where each well of the
+    plate stamped into quadrant q lands on a plate of 4x the wells.
+    """
+
+    source = geometry.getGeometry(sourceWells)
+    dest = geometry.getGeometry(sourceWells * 4)
+    if dest.rows != 2 * source.rows or dest.cols != 2 * source.cols:
+        raise ValueError(
+            "%d-well plates do not stamp into %d-well plates"
+            % (sourceWells, dest.wells)
+        )
+    return np.stack([dest.quadrantIndices(q) for q in range(4)])
+
+def quadrantMap(sourceWells=96, plates=4, quadrants=None):
+    """Map Plates into the Quadrants of Plates with Four Times the Wells
+
+    Source plates fill quadrants 0-3 of the first destination plate, then
+    of the next, and so on; `quadrants` overrides the quadrant of each
+    source plate (e.g. [1, 3] stamps two plates into the right quadrants).
+    """
+
+    table = quadrantTable(sourceWells)
+    srcPlate = np.repeat(np.arange(plates), sourceWells)
+    srcWell = np.tile(np.arange(sourceWells), plates)
+    if quadrants is None:
+        quadrant = srcPlate % 4
+        dstPlate = srcPlate // 4
+    else:
+        quadrants = np.asarray(quadrants, dtype=np.intp)
+        if len(quadrants) != plates or quadrants.min() < 0 or quadrants.max() > 3:
+            raise ValueError("Give one quadrant (0-3) per source plate")
+        quadrant = quadrants[srcPlate]
+        dstPlate = np.zeros_like(srcPlate)
+    return WellMap(sourceWells, sourceWells * 4, srcPlate, srcWell,
+                   dstPlate, table[quadrant, srcWell])
+
+def splitMap(sourceWells=384, plates=1):
+    """Map Plates onto Four Plates Each, One per Quadrant"""
+    return quadrantMap(sourceWells // 4, 4 * plates).inverse()
+
+def cherryPickMap(sourceWells, destWells, picks, destPlates=None):
+    """Map an Explicit List of (Source Plate, Well, Dest Plate, Well) Transfers
+
+    Wells are given as indices or names ("B7").
+    """
+
+    source = geometry.getGeometry(sourceWells)
+    dest = geometry.getGeometry(destWells)
+    picks = list(picks)
+    if not picks:
+        return WellMap(sourceWells, destWells, [], [], [], [], destPlates)
+    srcPlate, srcWell, dstPlate, dstWell = zip(*picks)
+
+    def indices(tables, wells):
+        return [tables.indexOf(w) if isinstance(w, str) else w for w in wells]
+
+    return WellMap(
+        sourceWells, destWells, srcPlate, indices(source, srcWell),
+        dstPlate, indices(dest, dstWell), destPlates
+    )
+
+def compressMap(occupied, destWells=None, order="row"):
+    """Map the Occupied Wells of Sparse Plates onto as Few Plates as Possible
+
+    `occupied` is a (plates, wells) mask, e.g. `PlateStack.occupied()`.
+    Samples are placed in the well order `order` ("row", "column" or a
+    sequence of wells, as for manifests), taken plate by plate in the same
+    order - or row by row, for a custom order.
+    """
+
+    occupied = np.atleast_2d(occupied)
+    sourceWells = occupied.shape[1]
+    destWells = sourceWells if destWells is None else destWells
+    source = geometry.getGeometry(sourceWells)
+    destOrder = importer.wellOrder(geometry.getGeometry(destWells), order)
+    if isinstance(order, str):
+        srcOrder = importer.wellOrder(source, order)
+    else:
+        srcOrder = np.arange(sourceWells)
+    # Occupied wells in order, plate after plate
+    srcPlate, position = np.nonzero(occupied[:, srcOrder])
+    slot = np.arange(len(srcPlate))
+    return WellMap(
+        sourceWells, destWells, srcPlate, srcOrder[position],
+        slot // len(destOrder), destOrder[slot % len(destOrder)]
+    )
+
+def applyMap(wellMap, source, dest=None, barcodes=None):
+    """Carry Out a Reformat; Return the Destination Plates as a PlateStack
+
+    `source` is a PlateStack or a sequence of plates of the map's source
+    format. Samples are written into `dest` if given (a PlateStack, whose
+    other wells are left alone), otherwise onto new empty plates.
+    """
+
+    if not isinstance(source, model.PlateStack):
+        source = model.PlateStack.fromPlates(source)
+    if source.wells != wellMap.source.wells:
+        raise ValueError(
+            "The map reads %d-well plates, not %d-well plates"
+            % (wellMap.source.wells, source.wells)
+        )
+    if wellMap.sourcePlates() > len(source):
+        raise ValueError(
+            "The map reads %d plates, but only %d were given"
+            % (wellMap.sourcePlates(), len(source))
+        )
+    if dest is None:
+        dest = model.PlateStack(wellMap.destPlates, wellMap.dest.wells, barcodes)
+    elif dest.wells != wellMap.dest.wells or len(dest) < wellMap.destPlates:
+        raise ValueError("The destination plates do not fit the map")
+    # One gather and one scatter per field, for every plate at once
+    for name, column in source.columns.items():
+        dest.columns[name][wellMap.dstPlate, wellMap.dstWell] = (
+            column[wellMap.srcPlate, wellMap.srcWell]
+        )
+    return dest
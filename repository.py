@@ -0,0 +1,242 @@
+"""
+    Filename: Repository.py
+
+    SQLite-backed storage for plates and samples.
+
+    The repository sits under the model: plates are saved to and loaded
+    from a single database file, which is indexed so that cross-plate
+    questions - "which plates hold sample X", "which plates hold RNA" -
+    are answered with index lookups rather than by opening every plate.
+
+    Only occupied wells are stored. The database runs in WAL mode so
+    readers never block the writer, and plates are written with one
+    prepared statement per table inside a single transaction. A trigram
+    full-text index serves substring searches over sample IDs and
+    descriptions.
+"""
+
+# Import modules
+import os
+import sqlite3
+import time
+import numpy as np
+import geometry
+import model
+
+# Default database location
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".wellplate", "plates.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plates (
+    id INTEGER PRIMARY KEY,
+    barcode TEXT NOT NULL UNIQUE,   -- UNIQUE also indexes the barcode
+    wells INTEGER NOT NULL,
+    modified REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    plate_id INTEGER NOT NULL REFERENCES plates(id) ON DELETE CASCADE,
+    well INTEGER NOT NULL,
+    sample_id TEXT NOT NULL,
+    sample_type INTEGER NOT NULL,
+    volume REAL,
+    concentration REAL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (plate_id, well)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_sample_id ON samples(sample_id);
+CREATE INDEX IF NOT EXISTS samples_sample_type ON samples(sample_type, plate_id);
+"""
+
+# Trigram full-text index over sample IDs and descriptions. Rows are
+# numbered plate_id * DOC_STRIDE + well and are written alongside the
+# samples table (bulk statements are much faster than triggers here).
+DOC_STRIDE = 2048
+TEXT_SCHEMA = """
+CREATE VIRTUAL TABLE samples_text USING fts5(
+    sample_id, description, content='', tokenize='trigram'
+);
+INSERT INTO samples_text (rowid, sample_id, description)
+    SELECT plate_id * 2048 + well, sample_id, description FROM samples;
+"""
+UNINDEX_TEXT = (
+    "INSERT INTO samples_text (samples_text, rowid, sample_id, description) "
+    "SELECT 'delete', plate_id * 2048 + well, sample_id, description "
+    "FROM samples WHERE plate_id = ?"
+)
+
+# * Plate Repository Class
+class PlateRepository:
+    """Persistent Plate Storage in SQLite"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        """Class Initializer"""
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+        # Databases created before the text index existed are indexed now
+        if not self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'samples_text'"
+        ).fetchone():
+            with self.db:
+                self.db.executescript(TEXT_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the Database Connection"""
+        self.db.close()
+
+    def savePlate(self, plate):
+        """Save (or Replace) a Single Plate"""
+        self.savePlates([plate])
+
+    def savePlates(self, plates):
+        """Save (or Replace) Many Plates in a Single Transaction"""
+
+        with self.db:
+            for plate in plates:
+                if not plate.barcode:
+                    raise ValueError("Plates need a barcode to be stored")
+                plateID, = self.db.execute(
+                    "INSERT INTO plates (barcode, wells, modified) "
+                    "VALUES (?, ?, ?) ON CONFLICT(barcode) DO UPDATE SET "
+                    "wells = excluded.wells, modified = excluded.modified "
+                    "RETURNING id",
+                    (plate.barcode, plate.wells, time.time())
+                ).fetchone()
+                self.db.execute(UNINDEX_TEXT, (plateID,))
+                self.db.execute("DELETE FROM samples WHERE plate_id = ?", (plateID,))
+                rows = list(sampleRows(plateID, plate))
+                self.db.executemany(
+                    "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self.db.executemany(
+                    "INSERT INTO samples_text (rowid, sample_id, description) "
+                    "VALUES (?, ?, ?)",
+                    [(plateID * DOC_STRIDE + row[1], row[2], row[6]) for row in rows]
+                )
+
+    def loadPlate(self, barcode):
+        """Load a Plate by Barcode"""
+
+        row = self.db.execute(
+            "SELECT id, wells FROM plates WHERE barcode = ?", (barcode,)
+        ).fetchone()
+        if row is None:
+            raise KeyError("No plate with barcode %r" % barcode)
+        plateID, wells = row
+        rows = self.db.execute(
+            "SELECT well, sample_id, sample_type, volume, concentration, "
+            "description FROM samples WHERE plate_id = ?", (plateID,)
+        ).fetchall()
+
+        plate = model.PlateModel(wells, barcode)
+        if rows:
+            well, sampleID, sampleType, volume, conc, descr = zip(*rows)
+            # NULL (None) becomes NaN when building the float columns
+            plate.assign(np.array(well), {
+                "sampleID": sampleID,
+                "sampleType": np.array(sampleType, dtype=np.int8),
+                "volume": np.array(volume, dtype=float),
+                "concentration": np.array(conc, dtype=float),
+                "description": descr,
+            })
+        return plate
+
+    def deletePlate(self, barcode):
+        """Delete a Plate and its Samples"""
+
+        with self.db:
+            self.db.execute(
+                UNINDEX_TEXT.replace("plate_id = ?", "plate_id = "
+                                     "(SELECT id FROM plates WHERE barcode = ?)"),
+                (barcode,)
+            )
+            self.db.execute("DELETE FROM plates WHERE barcode = ?", (barcode,))
+
+    def barcodes(self):
+        """Return the Barcodes of All Stored Plates"""
+        return [b for b, in self.db.execute("SELECT barcode FROM plates ORDER BY barcode")]
+
+    def count(self):
+        """Return the Number of Stored Plates"""
+        return self.db.execute("SELECT COUNT(*) FROM plates").fetchone()[0]
+
+    def findSample(self, sampleID):
+        """Return (Barcode, Well Name) for Every Well Holding a Sample ID"""
+        return self.wellNames(self.db.execute(
+            "SELECT p.barcode, p.wells, s.well FROM samples s "
+            "JOIN plates p ON p.id = s.plate_id WHERE s.sample_id = ?",
+            (sampleID,)
+        ))
+
+    def findPrefix(self, prefix, limit=1000):
+        """Return (Barcode, Well Name, Sample ID) for Sample IDs Starting with `prefix`"""
+
+        # A range scan uses the sample ID index, unlike LIKE 'prefix%'
+        rows = self.db.execute(
+            "SELECT p.barcode, p.wells, s.well, s.sample_id FROM samples s "
+            "JOIN plates p ON p.id = s.plate_id "
+            "WHERE s.sample_id >= ? AND s.sample_id < ? LIMIT ?",
+            (prefix, prefix + "\U0010ffff", limit)
+        ).fetchall()
+        names = self.wellNames(row[:3] for row in rows)
+        return [name + (row[3],) for name, row in zip(names, rows)]
+
+    def searchText(self, query, limit=1000):
+        """Return (Barcode, Well Name, Sample ID) for Text Matches
+
+        Queries of three or more characters match anywhere in the sample
+        ID or description (case-insensitive) through the trigram index;
+        shorter queries match the start of sample IDs.
+        """
+
+        if len(query) < 3:
+            return self.findPrefix(query, limit)
+        rows = self.db.execute(
+            "SELECT p.barcode, p.wells, s.well, s.sample_id FROM "
+            "(SELECT rowid FROM samples_text WHERE samples_text MATCH ? LIMIT ?) t "
+            "JOIN samples s ON s.plate_id = t.rowid / ? AND s.well = t.rowid % ? "
+            "JOIN plates p ON p.id = s.plate_id",
+            ('"%s"' % query.replace('"', '""'), limit, DOC_STRIDE, DOC_STRIDE)
+        ).fetchall()
+        names = self.wellNames(row[:3] for row in rows)
+        return [name + (row[3],) for name, row in zip(names, rows)]
+
+    def platesWithType(self, sampleType):
+        """Return the Barcodes of Plates Holding a Sample Type"""
+        return [b for b, in self.db.execute(
+            "SELECT barcode FROM plates WHERE id IN "
+            "(SELECT plate_id FROM samples WHERE sample_type = ?) ORDER BY barcode",
+            (int(model.typeCode(sampleType)),)
+        )]
+
+    @staticmethod
+    def wellNames(rows):
+        """Convert (Barcode, Wells, Well Index) Rows to (Barcode, Well Name)"""
+        return [
+            (barcode, str(geometry.getGeometry(wells).names[well]))
+            for barcode, wells, well in rows
+        ]
+
+def sampleRows(plateID, plate):
+    """Return Insert Rows for the Occupied Wells of a Plate"""
+
+    indices = np.flatnonzero(plate.occupied())
+    # NaN is stored as NULL by SQLite
+    return zip(
+        [plateID] * len(indices), indices.tolist(),
+        plate.sampleID[indices].tolist(), plate.sampleType[indices].tolist(),
+        plate.volume[indices].tolist(), plate.concentration[indices].tolist(),
+        plate.description[indices].tolist(),
+    )
@@ -0,0 +1,172 @@
+# Resource object code, generated from resources.qrc by buildresources.py
+# Do not edit: changes are lost when the module is rebuilt
+
+from PyQt6 import QtCore
+
+qt_resource_struct = (
+    b"\x00\x00\x00\x00\x00\x02\x00\x00\x00\x08\x00\x00\x00\x01\x00\x00\x00\x00\x00"
+    b"\x01\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x20\x00\x01\x00\x00\x00\x01"
+    b"\x00\x00\x01\x10\x00\x00\x00\x40\x00\x01\x00\x00\x00\x01\x00\x00\x02\x0e\x00"
+    b"\x00\x00\x60\x00\x01\x00\x00\x00\x01\x00\x00\x03\x40\x00\x00\x00\x7e\x00\x01"
+    b"\x00\x00\x00\x01\x00\x00\x04\x53\x00\x00\x00\x9c\x00\x01\x00\x00\x00\x01\x00"
+    b"\x00\x05\x5d\x00\x00\x00\xbe\x00\x01\x00\x00\x00\x01\x00\x00\x06\xa9\x00\x00"
+    b"\x00\xde\x00\x01\x00\x00\x00\x01\x00\x00\x08\x22"
+)
+
+qt_resource_name = (
+    b"\x00\x0d\x01\x1c\xbc\x27\x00\x65\x00\x64\x00\x69\x00\x74\x00\x2d\x00\x63\x00"
+    b"\x6f\x00\x70\x00\x79\x00\x2e\x00\x73\x00\x76\x00\x67\x00\x0d\x02\xc5\x52\x47"
+    b"\x00\x66\x00\x69\x00\x6c\x00\x65\x00\x2d\x00\x73\x00\x61\x00\x76\x00\x65\x00"
+    b"\x2e\x00\x73\x00\x76\x00\x67\x00\x0d\x05\x02\x5c\xe7\x00\x66\x00\x69\x00\x6c"
+    b"\x00\x65\x00\x2d\x00\x65\x00\x78\x00\x69\x00\x74\x00\x2e\x00\x73\x00\x76\x00"
+    b"\x67\x00\x0c\x07\xb1\x54\xa7\x00\x65\x00\x64\x00\x69\x00\x74\x00\x2d\x00\x63"
+    b"\x00\x75\x00\x74\x00\x2e\x00\x73\x00\x76\x00\x67\x00\x0c\x09\x6a\x0a\x47\x00"
+    b"\x66\x00\x69\x00\x6c\x00\x65\x00\x2d\x00\x6e\x00\x65\x00\x77\x00\x2e\x00\x73"
+    b"\x00\x76\x00\x67\x00\x0e\x0c\xaa\xcd\x27\x00\x65\x00\x64\x00\x69\x00\x74\x00"
+    b"\x2d\x00\x70\x00\x61\x00\x73\x00\x74\x00\x65\x00\x2e\x00\x73\x00\x76\x00\x67"
+    b"\x00\x0d\x0c\xc4\x53\xa7\x00\x66\x00\x69\x00\x6c\x00\x65\x00\x2d\x00\x6f\x00"
+    b"\x70\x00\x65\x00\x6e\x00\x2e\x00\x73\x00\x76\x00\x67\x00\x10\x0e\x38\x21\x47"
+    b"\x00\x68\x00\x65\x00\x6c\x00\x70\x00\x2d\x00\x63\x00\x6f\x00\x6e\x00\x74\x00"
+    b"\x65\x00\x6e\x00\x74\x00\x2e\x00\x73\x00\x76\x00\x67"
+)
+
+qt_resource_data = (
+    b"\x00\x00\x01\x0c\x00\x00\x01\xf0\x78\xda\x5d\x91\x4d\x6f\x83\x30\x0c\x86\xef"
+    b"\xfb\x15\x56\xee\x0e\x71\x02\x48\x9b\xa0\xd2\xb6\xcb\x2e\xbb\xf6\xce\xd7\x48"
+    b"\x24\x5a\x10\x64\x50\xf5\xd7\xcf\xa1\xd3\x06\x48\x96\xfc\xfa\x89\xfd\xc6\x51"
+    b"\xb2\x69\x6e\xe1\x76\xe9\xae\x53\x2e\xac\xf7\xc3\x4b\x14\x2d\xcb\x22\x17\x23"
+    b"\xfb\xb1\x8d\xb4\x52\x2a\xe2\x0e\x01\x8b\xab\xbd\xcd\x05\xa5\x02\x6c\xe3\x5a"
+    b"\xeb\x1f\xfa\xcb\x75\x5d\x2e\xaa\xef\x71\x6c\xae\xfe\xbd\xef\xfa\x51\x40\xd5"
+    b"\x15\x13\xbb\x95\x0e\x4a\x87\x55\xe7\x86\xb2\x2f\xc6\x5a\xc0\xec\x9a\xe5\xad"
+    b"\xbf\xe5\x42\x81\x02\x4a\x39\xc4\xe9\x09\x20\x1b\x0a\x6f\xa1\xce\xc5\x67\x0c"
+    b"\x24\x93\x0f\x53\x68\xd0\x10\x7a\x14\xb2\x3a\x53\xfc\x0f\x38\x6b\x4b\x6a\x0b"
+    b"\x50\x9f\x8d\x4c\xb6\x33\xa8\x2d\xd2\x4c\x96\x0a\x02\x5a\x61\xc8\x14\x8c\xfe"
+    b"\x00\xb2\xe2\x9b\x36\x35\xd2\xea\xb3\x19\x41\xb6\x98\x91\xee\x22\xda\xaf\xf9"
+    b"\x2c\x13\xa0\x42\x26\x9c\x1e\x9d\x41\xce\x5b\x82\x41\x5a\x34\x7b\xc4\xc1\x76"
+    b"\xfb\x41\x66\xd6\xdc\x2f\x68\x90\x5e\x29\xf8\xfe\x9e\x29\x58\xf5\x7c\xa4\x29"
+    b"\xab\xd8\x9a\x03\x25\x02\xbd\x9a\x1f\x78\xd8\x54\xf1\x1e\xeb\x13\xb2\xf0\x91"
+    b"\xa7\x1f\x47\x68\x73\xc7\x00\x00\x00\xfa\x00\x00\x01\x77\x78\xda\x55\x50\x5b"
+    b"\x6f\x83\x20\x14\x7e\xef\xaf\x38\xe1\x9d\x23\x37\x51\x17\x35\xd9\xf6\xb2\x87"
+    b"\xee\xb5\xef\xb6\xb5\x42\xc2\x6a\xa3\x4c\x9a\xfd\xfa\x81\x6e\xd9\x1a\x38\x17"
+    b"\xbe\x0b\x27\x50\xcf\xcb\x00\xf7\x0f\x77\x9d\x1b\x62\xbc\xbf\x3d\x65\x59\x08"
+    b"\x01\x83\xc4\x71\x1a\x32\xc1\x18\xcb\xa2\x82\x40\xb0\x67\x6f\x1a\xc2\x35\x01"
+    b"\xd3\xdb\xc1\xf8\xad\xbf\x58\xe7\x1a\x72\xfa\x9c\xa6\xfe\xea\x5f\x47\x37\x4e"
+    b"\x04\x4e\xae\x9b\xe3\x6d\x47\x0b\x47\x4b\xe7\x6e\xe9\x69\x52\x11\x58\x6c\x1f"
+    b"\x5e\xc6\x7b\x43\x18\x30\xe0\x3a\x6e\xd2\xee\x00\xea\x5b\xe7\x0d\x9c\x1b\xf2"
+    b"\x5e\x62\x0e\x1c\xf3\x67\xbe\x55\x58\x75\xc0\x63\x31\xaa\x13\x20\x7e\x80\xd8"
+    b"\x2d\x5c\xfc\x01\x34\x76\x6f\x0f\x67\x2a\x0e\xe2\xbf\x81\x0a\xa3\x4f\x14\x25"
+    b"\x57\xa8\x78\x49\x31\xc7\x4a\x16\x74\x9b\xb2\x14\x58\x54\x72\xaf\xb0\xcc\x15"
+    b"\x68\xd4\x4a\x77\x91\xcf\x57\x23\xa3\x58\xb0\x32\x85\x93\x11\x8a\xf1\xcb\xa5"
+    b"\x95\x70\x60\x89\xa1\x8f\xcc\xea\x5a\xd3\x3e\x3d\xa9\x42\x51\xc9\x43\x1c\xf5"
+    b"\x45\xb2\x76\x57\xa7\xff\x6c\xbf\x01\xbe\xf6\x5a\xde\x00\x00\x01\x2e\x00\x00"
+    b"\x02\x3a\x78\xda\x65\x92\xc1\x6e\x83\x30\x10\x44\xef\xf9\x8a\x95\xef\x5e\x6c"
+    b"\x30\x86\x54\x80\xd4\xf6\xd2\x03\xbd\xf6\x4e\x48\x02\x48\x0e\x44\xc4\x0d\x51"
+    b"\xbe\xbe\xf6\x26\x0d\x69\x11\x30\x46\xcc\x9b\xf5\x58\x22\x3b\x9d\x1b\xb8\x1c"
+    b"\x4c\x7f\xca\x59\x6b\xed\xf1\x25\x08\xa6\x69\xc2\x29\xc2\x61\x6c\x82\x50\x08"
+    b"\x11\x38\x82\xc1\xd4\x6d\x6d\x9b\x33\xa9\x19\xb4\xbb\xae\x69\xed\xed\x7d\xdf"
+    b"\x19\x93\xb3\xfa\x7b\x1c\x77\xbd\x7d\x1f\xcc\x30\x32\xa8\x4d\x75\x72\xd3\x36"
+    b"\x1d\x6c\x3a\x7e\xe1\x43\x6d\xab\x66\xe8\xb9\x47\x19\x9c\xbb\xdd\xf4\x36\x5c"
+    b"\x72\x26\x40\x80\xd4\xee\x66\xc5\x0a\x20\x3b\x56\xb6\x85\x6d\xce\x3e\xa5\x44"
+    b"\xa5\x51\x2a\xfd\x8a\x31\xc6\x20\xe8\x72\x1f\xa5\x48\x40\x7c\x28\x4c\xd7\x51"
+    b"\x35\x3b\x1c\xa3\x38\xf2\x74\xe9\x05\x14\xc6\xea\x39\x27\x80\x02\x67\x8d\xa1"
+    b"\x54\x4f\x31\xf0\xb4\x8f\x1a\x85\xd1\x5a\x01\xe9\x1f\xff\x3e\xb6\x5d\x26\x9d"
+    b"\xc3\xbd\x75\x8b\xf2\x65\xd4\x79\x54\xeb\x6b\x59\xf6\xd7\x2a\x1f\xa7\xbc\x1e"
+    b"\xb8\x5b\x05\x55\x2f\x53\x48\x30\x5c\x47\x26\x44\xed\x40\xaf\xc9\x1c\x97\x80"
+    b"\x89\x48\xfd\x53\x7a\x4d\x20\x25\x2e\x01\xa2\x9f\x38\x3e\x73\x40\xa4\xa1\x51"
+    b"\x1a\xfe\x0f\x24\x90\xa4\xa4\x7d\x21\x75\x2d\x3c\x18\xbb\x8e\x8f\x33\xc9\xfb"
+    b"\xce\x04\x5e\x59\x50\xac\x32\xff\x4b\x14\x3f\xd9\x64\x82\x9f\x00\x00\x01\x0f"
+    b"\x00\x00\x01\xa9\x78\xda\x8d\x91\xc1\x6e\xc3\x20\x0c\x86\xef\x7d\x0a\x8b\x3b"
+    b"\x0e\x86\x04\xc8\xd4\xf4\xb0\x5d\xb7\x87\x48\xd3\xac\x41\x22\x4d\x15\xb2\xa6"
+    b"\xea\xd3\xcf\x64\xd5\x4e\x3b\x4c\x80\x8d\x7e\x7f\xfe\xb1\xc4\x3e\xdd\xce\x70"
+    b"\x1f\xe3\x25\x35\x62\x58\x96\xeb\x4b\x51\xac\xeb\x8a\xab\xc1\x69\x3e\x17\x5a"
+    b"\x29\x55\x30\x21\x60\x0d\xa7\x65\x68\x04\x59\x01\x43\x1f\xce\xc3\xf2\x73\xff"
+    b"\x0c\x31\x36\xa2\xfb\x9a\xe7\xfe\xb2\xbc\x4d\x71\x9a\x05\x74\xb1\x4d\xec\x76"
+    b"\x0c\x70\x0c\x32\x75\x21\xa5\x69\x4e\x02\x6e\xa1\x5f\x5f\xa7\x7b\x23\x14\x28"
+    b"\x20\xcb\x5b\x1c\x76\x00\xfb\x6b\xbb\x0c\x70\x6a\xc4\x87\xc1\x0a\xf8\x74\x12"
+    b"\x2d\x95\x12\xbd\xe7\xa0\x5c\x29\x09\x6b\xab\xd1\x57\x5e\x6a\xac\xde\x3d\x38"
+    b"\xd4\x9a\xdb\x09\x6d\xa9\x81\x3a\xac\x0d\xeb\xc6\x03\x61\xe9\x58\xe0\x6e\x9b"
+    b"\x69\xd8\x68\xf4\x04\x9e\xa5\x48\x58\x55\x96\x35\x6b\xa9\xe5\x4a\xae\xe6\x39"
+    b"\x80\x24\xba\xba\x44\x6b\x1c\x5b\xd7\xe8\x4c\xe4\x07\x2b\x36\xd2\x48\xce\xfd"
+    b"\x81\xca\x8d\x75\x48\xf5\x66\x0c\xcf\xb1\x1f\x63\xc6\x48\xb5\x94\xd3\xb3\x43"
+    b"\x49\x93\xf3\xaf\x92\x17\x2b\x8f\xd1\xc1\xff\x40\x51\x1c\x76\xfb\xfc\x03\x87"
+    b"\x6f\xd1\xae\x64\x1e\x00\x00\x01\x06\x00\x00\x01\x8d\x78\xda\x55\x90\x41\x6f"
+    b"\x83\x30\x0c\x85\xef\xfd\x15\x56\xee\x09\x71\x80\xd2\x4e\x80\xb4\xed\xc2\x61"
+    b"\xbd\x72\x4f\x5b\x4a\xd0\xd2\x82\x42\x4a\x2a\x7e\xfd\xcc\xd6\x69\x4c\x49\x64"
+    b"\xfb\x7b\x4f\xcf\x52\xf2\x71\x6a\xe1\x71\xb5\xb7\xb1\x60\xc6\xfb\xe1\x25\x8a"
+    b"\x42\x08\x22\xc4\xa2\x77\x6d\xa4\xa4\x94\x11\x39\x18\x84\xee\xec\x4d\xc1\x70"
+    b"\xcb\xc0\x34\x5d\x6b\xfc\x4f\x7f\xe9\xac\x2d\xd8\xe9\xee\x5c\x73\xf3\xef\xbd"
+    b"\xed\x1d\x83\x93\xd5\x23\xa5\x1d\x3b\x38\x76\x9c\x0c\x0d\x6f\xb4\xbb\x6a\xf7"
+    b"\xc9\x07\x7b\x1f\x17\x62\x19\x4c\x5d\x13\xde\xfa\x47\xc1\x24\x48\xc0\x2d\x5d"
+    b"\x56\x6e\x00\xf2\x41\x7b\x03\xe7\x82\x1d\xf6\x42\xed\x63\x90\x55\xa2\x15\x28"
+    b"\x58\x5c\x92\x53\x37\xa1\xfa\x03\x54\x95\xd9\xad\x67\xae\xea\x44\x64\x32\x7b"
+    b"\x45\xc0\x27\xc3\x78\x01\x90\x7c\xa0\x84\x25\x73\x25\x3d\x77\xcc\xb4\x2c\x85"
+    b"\x58\xa4\x13\x57\x36\x86\xd8\x70\xa5\x7f\x4d\xc8\xe9\xcc\x87\x1d\x19\xb2\x09"
+    b"\x45\x5a\xa1\xd4\x22\xa5\xe9\x5b\x5c\x5e\x45\x5a\x8d\xb8\xa2\x9c\x78\x4d\x91"
+    b"\xd5\xf6\x9f\x95\xa3\xa1\x80\x3a\x5b\x43\xc2\x33\x8b\xca\x4d\xbe\xfc\x72\xf9"
+    b"\x05\x8c\xe7\x62\x0f\x00\x00\x01\x48\x00\x00\x02\x83\x78\xda\x65\x92\x41\x6f"
+    b"\x83\x30\x0c\x85\xef\xfb\x15\x56\xee\x86\x18\x0a\x5d\xa7\x52\xa9\xdb\x85\xcb"
+    b"\xae\xdc\x69\x61\x4d\xa4\xb4\x20\xa0\xa1\xea\xaf\x9f\x93\x4d\x6b\xca\x44\x10"
+    b"\x8f\x2f\xf6\xf3\x0b\x62\x3b\xda\x13\xdc\xce\xe6\x32\x16\x42\x4d\x53\xff\x16"
+    b"\xc7\xf3\x3c\x47\x73\x1a\x75\xc3\x29\x4e\xa4\x94\x31\x57\x08\x98\x75\x33\xa9"
+    b"\x42\x50\x2e\x40\xb5\xfa\xa4\xa6\x1f\xfd\xa5\x8d\x29\xc4\xf1\x3a\x0c\xed\x65"
+    b"\xfa\xe8\x4c\x37\x08\x38\x9a\x7a\x64\xb7\x83\x86\x83\xc6\xa3\xd1\xfd\xa1\xab"
+    b"\x87\x06\x7b\x73\x1d\x05\x58\xdd\xce\xef\xdd\xad\x10\x12\x24\x50\xce\x4b\xec"
+    b"\x5e\x00\xb6\x7d\x3d\x29\xef\x86\xc3\xd5\xb4\x85\x68\x6d\x7b\xe9\x9a\x46\x40"
+    b"\x53\x88\xcf\x57\x58\xd7\x51\x16\x65\xe0\x9b\xc0\xc9\x6a\x53\x92\x0c\x21\xdf"
+    b"\xe5\x6b\x94\x59\x8a\xb2\x00\x23\x6f\x54\x24\xcb\xfc\xa9\x14\x49\x71\x59\xb5"
+    b"\x8e\xb2\x7d\x80\x79\xca\x5d\xc4\x8f\x34\x6e\xf2\x0a\xb8\xb0\x4c\xeb\x04\x12"
+    b"\x5f\x25\x91\x55\x45\xab\x07\xe0\x67\xa2\x38\x4a\x00\x30\xa9\x52\x4e\x11\xf4"
+    b"\x60\xa2\x90\x2c\x4f\xad\xc9\x47\x75\xe3\xf8\x72\x46\x7f\x80\xa3\x12\x4f\x0a"
+    b"\xde\x91\xbc\x4f\xd0\xe2\x82\x5b\xa4\x7f\x31\x37\x7c\x08\x5a\x7e\x22\x1b\x12"
+    b"\x74\x52\x61\xfa\x8c\x78\xb1\xdd\x73\x23\x33\x95\xde\xcf\x98\x22\xed\xc9\xf9"
+    b"\xfe\xee\x49\xf0\xda\x2e\x69\xce\x6a\xa5\xd2\x05\x25\x82\xc4\x9b\x2f\xb8\x4b"
+    b"\x2a\x39\x87\x3f\xc2\xd6\xfd\x5b\xbb\x6f\xbb\xc3\x95\xf5\x00\x00\x01\x75\x00"
+    b"\x00\x02\x77\x78\xda\x65\x92\x41\x6f\xab\x30\x0c\xc7\xef\xfb\x14\x56\xee\x31"
+    b"\x38\x71\x42\x32\x95\x4a\x7b\xbd\xf4\xb2\xeb\xee\xac\xa5\x0d\x52\x56\x2a\xca"
+    b"\x2b\x53\x3f\xfd\x33\xec\x49\x5d\x37\x29\x84\x98\xbf\xfd\xb3\xff\x28\xab\xcb"
+    b"\xf5\x08\x9f\x1f\xf9\x74\xa9\x55\x1a\xc7\xf3\x73\x51\x4c\xd3\x84\x93\xc5\x7e"
+    b"\x38\x16\xa6\x2c\xcb\x42\x32\x14\x4c\xdd\x7e\x4c\xb5\x22\xaf\x20\xb5\xdd\x31"
+    b"\x8d\x5f\xe7\x43\x97\x73\xad\x76\x7f\x87\xa1\x3d\x8d\x9b\x3e\xf7\x83\x82\x5d"
+    b"\x6e\x2e\x42\x7b\xef\xe0\xbd\xd3\x87\x3e\xef\xdb\xc1\xe8\xfe\xdc\x9e\x14\x5c"
+    b"\xbb\x76\xfa\xd3\x7f\xd6\xaa\x84\x12\xc8\xcb\x52\xeb\x27\x80\xd5\xb9\x19\x13"
+    b"\xec\x6b\xf5\x4a\x60\xd1\xbd\x10\x3a\x98\x9f\x25\x0b\x8c\x9c\x4c\x32\x58\x79"
+    b"\xde\x61\x74\x61\xfe\x28\x01\x3a\x2f\x92\x25\x92\x88\x02\x6f\x2a\x8c\xc1\x49"
+    b"\xb9\xe7\x00\x01\x65\x63\x88\xc0\x89\x7f\xf1\xc8\x81\x43\x77\xc5\x19\xe7\x2a"
+    b"\x34\xde\x61\x64\x0c\x42\x0c\x82\x94\x3c\xf6\x59\x8b\x2a\x59\x64\xf8\x65\x69"
+    b"\x7f\x2f\x96\x39\xac\x15\xc6\xd6\x4a\xa5\x6f\x1e\x54\x6d\xa4\xef\xbc\x53\x5c"
+    b"\x08\xfa\x8b\xf0\xa3\x3d\x78\x24\x7e\x13\x9f\xb7\x57\x03\x3e\x91\xb9\x6a\x74"
+    b"\x0d\xba\xff\x19\xa5\x44\xb2\xb6\x71\xa7\x31\xca\x14\xa5\x16\xb7\x24\x38\x13"
+    b"\x67\x72\xc5\x12\x93\xe3\x8d\x47\x5b\xb1\xf8\xb5\x76\x9e\x34\x18\xb0\xf2\x32"
+    b"\x52\x60\xb7\xe6\x27\x0f\xdd\x9b\xbf\x7d\x68\xb4\xbe\x02\x7a\x90\x38\xce\x3f"
+    b"\xd2\xe4\xbb\xdf\xef\xd3\x96\xb0\xb8\x04\xe2\x14\x91\x7d\x68\x1e\x45\x12\xbb"
+    b"\x51\xc6\xb1\xc4\xf9\x6e\xf7\x8e\x97\xba\xa5\x65\xb5\x25\xf4\xd6\xde\x54\xb1"
+    b"\x7e\x5a\xcd\xf7\x69\xfd\x0f\xd8\x15\x8d\xa4\x00\x00\x01\x26\x00\x00\x01\xad"
+    b"\x78\xda\x2d\x51\xdb\x6e\x83\x30\x0c\x7d\xef\x57\x58\x79\x8f\x71\x2e\x04\x67"
+    b"\x2a\x95\xb6\x3d\xef\x23\x28\xa5\x25\x52\x5a\x2a\xca\x4a\xd5\xaf\x9f\x81\x29"
+    b"\x89\xaf\xe7\x1c\xcb\xca\xfe\xf1\xbc\xc0\xeb\x9a\x6f\x8f\x5a\xf5\xd3\x74\xff"
+    b"\x28\x8a\x79\x9e\x71\x76\x38\x8c\x97\xc2\x12\x51\x21\x08\x05\x73\x3a\x4d\x7d"
+    b"\xad\x4c\x50\xd0\x77\xe9\xd2\x4f\x5b\x7c\x4e\x39\xd7\xaa\xfd\x1d\xc7\xee\x36"
+    b"\x7d\x0f\x79\x18\x15\xb4\xb9\x79\x88\xda\x31\xc1\x31\xe9\x74\x3b\x0f\xba\x4d"
+    b"\x63\x9b\x3b\xbd\x80\x15\x3c\x53\x37\x7f\x0d\xaf\x5a\x11\x10\x98\x20\x57\x1d"
+    b"\x76\x00\xfb\x7b\x33\xf5\x70\xaa\xd5\x0f\x4b\xe9\x93\x81\x97\xb6\x3c\xf1\xcd"
+    b"\x96\x6d\xc7\x84\xf7\x15\xa3\xd3\x11\xbd\xb1\xda\x80\xc7\x8a\xca\x56\x23\x55"
+    b"\xe8\x3c\x92\x8d\x58\x3a\x87\x8e\xfc\xea\x4d\xf4\xc2\x41\xcf\xd5\x8a\x08\x1c"
+    b"\x34\x5a\x1f\xb2\x64\xcc\xa2\x10\x84\x69\x79\xa1\x4a\x23\x5a\x2c\x23\x6b\x83"
+    b"\x3e\x94\x6b\x24\xd2\x0e\x48\x0a\x44\x56\xa3\xb7\x62\x98\x16\x80\x33\x31\x63"
+    b"\xe5\x58\x3b\xc1\x72\x8b\x14\xbc\xe8\x44\x27\x40\xd1\x71\x31\xae\xaa\x42\xa9"
+    b"\x64\x92\x2f\xcd\x32\x4e\x54\x58\x04\x1c\x1b\xb0\x82\x5d\x11\x6f\xd9\x56\x46"
+    b"\x35\x66\x5d\x75\xb5\xda\x6e\xfe\x7f\x7d\xfb\x56\xc5\x61\xb7\x5f\x7e\xe1\xf0"
+    b"\x07\xb1\x41\x66\xb0"
+)
+
+def qInitResources():
+    QtCore.qRegisterResourceData(
+        0x01, qt_resource_struct, qt_resource_name, qt_resource_data
+    )
+
+def qCleanupResources():
+    QtCore.qUnregisterResourceData(
+        0x01, qt_resource_struct, qt_resource_name, qt_resource_data
+    )
+
+qInitResources()
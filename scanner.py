@@ -0,0 +1,141 @@
+"""
+    Filename: Scanner.py
+
+    Rapid entry of sample IDs with a barcode scanner.
+
+    A keyboard-wedge scanner types each barcode followed by Enter, a few
+    milliseconds per character. Rapid entry takes every scan as the
+    sample ID of the next free well, walking the plate in a chosen order
+    (row by row, column by column, or serpentine) and skipping occupied
+    wells, unless told to overwrite them, and excluded wells (flagged
+    wells and control positions).
+
+    Scans are only queued as they arrive; `flush` hands every scan
+    waiting to the plate in one assignment, so a burst of scans costs one
+    model update, one undo step and one repaint, not one per scan. Scans
+    leave the queue strictly in the order they arrived, and only once
+    they have a well: when the plate is full they wait for the next one.
+"""
+
+# Import modules
+from collections import deque
+import numpy as np
+import model
+
+# Orders in which rapid entry walks the plate
+WALK_ORDERS = ("Row by row", "Column by column", "Serpentine rows", "Serpentine columns")
+
+def walkOrder(tables, order=WALK_ORDERS[0], wells=None):
+    """Return Well Indices in Walk Order (see WALK_ORDERS)
+
+    Serpentine orders reverse every other row (or column), as a pipette
+    moving back and forth would. With `wells` only those are walked.
+    """
+
+    if order not in WALK_ORDERS:
+        raise ValueError("Unknown walk order: %r" % order)
+    indices = np.arange(tables.wells) if wells is None else np.asarray(wells, dtype=np.intp)
+    byColumn = order in ("Column by column", "Serpentine columns")
+    # Lines are walked in turn; each is walked along its other axis
+    line, step = tables.row[indices], tables.col[indices]
+    if byColumn:
+        line, step = step, line
+    line, step = line.astype(np.intp), step.astype(np.intp)
+    if order.startswith("Serpentine"):
+        step = np.where(line % 2, -step, step)
+    return indices[np.lexsort((step, line))]
+
+# * Rapid Entry Class
+class RapidEntry:
+    """Assign Scanned Sample IDs to the Free Wells of a Plate, in Walk Order"""
+
+    def __init__(self, plate, order=WALK_ORDERS[0], wells=None, skipOccupied=True,
+                 exclude=None):
+        """Class Initializer
+
+        `wells` limits entry to some wells (e.g. a selection), and
+        `exclude` is a mask of wells never written.
+        """
+
+        self.order = order
+        self.wells = wells
+        self.skipOccupied = skipOccupied
+        self.exclude = exclude
+        # Scans waiting for a well, oldest first
+        self.queue = deque()
+        # Scans assigned since entry started
+        self.assigned = 0
+        self.plate = None
+        self.setPlate(plate)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def setPlate(self, plate, exclude=None):
+        """Continue on Another Plate, from the Start of its Walk
+
+        Wells entry was limited to are kept on a plate of the same format.
+        """
+
+        if self.plate is not None and plate.wells != self.plate.wells:
+            self.wells = None
+        self.plate = plate
+        if exclude is not None:
+            self.exclude = exclude
+        self.walk = walkOrder(plate.geometry, self.order, self.wells)
+        # Position of each well in the walk (-1 for wells not walked)
+        self.steps = np.full(plate.wells, -1, dtype=np.intp)
+        self.steps[self.walk] = np.arange(len(self.walk))
+        self.position = 0
+
+    def scan(self, code):
+        """Queue a Scanned Sample ID; Return Whether it was Taken"""
+
+        code = code.strip()
+        if not code:
+            return False
+        self.queue.append(code)
+        return True
+
+    def freeWells(self):
+        """Return the Wells Still to Fill, in Walk Order, from the Current One"""
+
+        walk = self.walk[self.position:]
+        free = np.ones(len(walk), dtype=bool)
+        if self.skipOccupied:
+            free &= ~self.plate.occupied()[walk]
+        if self.exclude is not None:
+            free &= ~self.exclude[walk]
+        return walk[free]
+
+    def nextWell(self):
+        """Return the Well the Next Scan Goes to, or None if the Plate is Full"""
+
+        free = self.freeWells()
+        return int(free[0]) if len(free) else None
+
+    def moveTo(self, well):
+        """Continue the Walk from a Well"""
+
+        index = int(self.plate.wellIndices(well)[0])
+        if self.steps[index] < 0:
+            raise ValueError(
+                "Well %s is not part of the walk" % self.plate.geometry.names[index]
+            )
+        self.position = int(self.steps[index])
+
+    def flush(self):
+        """Assign Every Queued Scan that has a Well, in One Plate Update
+
+        Returns the wells written and their sample IDs; scans left over
+        once the plate is full stay queued.
+        """
+
+        wells = self.freeWells()[:len(self.queue)]
+        if not len(wells):
+            return wells, []
+        codes = [self.queue.popleft() for _ in range(len(wells))]
+        self.plate.fill(wells, sampleID=np.array(codes, dtype=model.STRING))
+        self.position = int(self.steps[wells[-1]]) + 1
+        self.assigned += len(codes)
+        return wells, codes
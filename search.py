@@ -0,0 +1,286 @@
+"""
+    Filename: Search.py
+
+    Incremental text search over the sample IDs and descriptions of every
+    loaded plate.
+
+    Each well of each indexed plate is a document, numbered
+    `slot * STRIDE + well`. Two indexes are kept:
+
+        - a trigram index (trigram -> sorted array of documents)
+          answering substring queries of three or more characters: the
+          rarest trigram's posting is walked in chunks, each chunk is
+          intersected with the other postings and checked against the
+          text, and the walk stops once the limit is reached;
+        - a sorted prefix index over the sample IDs of each plate,
+          answering the one- and two-character queries typed at the
+          start of a search.
+
+    Both are updated from the plate's change notifications, so editing a
+    well only re-indexes that well. Wells indexed together (a plate
+    added or filled) update each posting once and sort the plate's prefix
+    index once, so indexing a plate costs the same however many plates
+    are loaded.
+"""
+
+# Import modules
+from bisect import bisect_left, insort
+import numpy as np
+
+# Document numbers reserved per plate (the largest plate format)
+STRIDE = 1536
+
+# Candidates of the rarest trigram intersected and checked at a time
+CHUNK_DOCS = 1024
+
+# Prefix index entries changed one by one, above which it is re-sorted
+FEW_PREFIXES = 16
+
+# Fields searched
+FIELDS = ("sampleID", "description")
+
+def trigrams(text):
+    """Return the Set of Trigrams in a (Lower-Case) Text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# * Search Index Class
+class SearchIndex:
+    """Trigram and Prefix Index over Loaded Plates"""
+
+    def __init__(self):
+        """Class Initializer"""
+
+        # Plate slots: slot -> plate, plate -> slot
+        self.plates = []
+        self.slots = {}
+        # Document -> indexed texts, one per searched field
+        self.texts = {}
+        # Trigram -> sorted array of documents
+        self.postings = {}
+        # Slot -> sorted (lower-case sample ID, document) pairs
+        self.prefixes = {}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def addPlate(self, plate):
+        """Index Every Well of a Plate and Follow its Changes"""
+
+        if plate in self.slots:
+            return
+        # Reuse the slot of a removed plate when there is one
+        if None in self.plates:
+            slot = self.plates.index(None)
+            self.plates[slot] = plate
+        else:
+            slot = len(self.plates)
+            self.plates.append(plate)
+        self.slots[plate] = slot
+        # Wells with only a description are searched too
+        self.indexWells(plate, np.arange(plate.wells))
+        plate.addListener(self.plateChanged)
+
+    def removePlate(self, plate):
+        """Drop a Plate from the Index"""
+
+        slot = self.slots.pop(plate, None)
+        if slot is None:
+            return
+        plate.removeListener(self.plateChanged)
+        base = slot * STRIDE
+        self.update([
+            (doc, self.texts.pop(doc)) for doc in range(base, base + plate.wells)
+            if doc in self.texts
+        ], [])
+        self.prefixes.pop(slot, None)
+        self.plates[slot] = None
+
+    def plateChanged(self, change):
+        """Re-Index the Wells Touched by a Change"""
+
+        if any(field in FIELDS for field in change.fields):
+            self.indexWells(change.plate, change.indices)
+
+    def indexWells(self, plate, indices):
+        """(Re-)Index Some Wells of a Plate"""
+
+        base = self.slots[plate] * STRIDE
+        columns = [plate.columns[field][indices].tolist() for field in FIELDS]
+        removed, added = [], []
+        for well, *texts in zip(np.asarray(indices).tolist(), *columns):
+            doc = base + well
+            texts = tuple(texts)
+            old = self.texts.get(doc)
+            if old == texts:
+                continue
+            if old is not None:
+                removed.append((doc, self.texts.pop(doc)))
+            if any(texts):
+                self.texts[doc] = texts
+                added.append((doc, texts))
+        self.update(removed, added)
+
+    def update(self, removed, added):
+        """Drop and Add (Document, Texts) in Both Indexes, Each Posting Once"""
+
+        # Trigram -> documents dropped, and documents added
+        dropped, new = {}, {}
+        for changes, documents in ((dropped, removed), (new, added)):
+            for doc, texts in documents:
+                lower = [text.lower() for text in texts]
+                for gram in set().union(*map(trigrams, lower)):
+                    changes.setdefault(gram, []).append(doc)
+        for gram, docs in dropped.items():
+            posting = self.postings[gram]
+            posting = np.delete(posting, np.searchsorted(posting, docs))
+            if len(posting):
+                self.postings[gram] = posting
+            else:
+                del self.postings[gram]
+        for gram, docs in new.items():
+            docs = np.sort(np.array(docs, dtype=np.int64))
+            posting = self.postings.get(gram)
+            if posting is None:
+                self.postings[gram] = docs
+            elif posting[-1] < docs[0]:
+                # Wells of the newest plate go last
+                self.postings[gram] = np.concatenate((posting, docs))
+            else:
+                self.postings[gram] = np.insert(
+                    posting, np.searchsorted(posting, docs), docs
+                )
+
+        # Prefix index entries dropped and added, by plate slot
+        changes = {}
+        for k, documents in enumerate((removed, added)):
+            for doc, texts in documents:
+                if texts[0]:
+                    changes.setdefault(doc // STRIDE, ([], []))[k].append(
+                        (texts[0].lower(), doc)
+                    )
+        for slot, (gone, entries) in changes.items():
+            prefixes = self.prefixes.setdefault(slot, [])
+            if len(gone) + len(entries) <= FEW_PREFIXES:
+                for entry in gone:
+                    del prefixes[bisect_left(prefixes, entry)]
+                for entry in entries:
+                    insort(prefixes, entry)
+                continue
+            if gone:
+                gone = set(gone)
+                prefixes[:] = [entry for entry in prefixes if entry not in gone]
+            prefixes += entries
+            prefixes.sort()
+
+    def search(self, query, matchCase=False, limit=None):
+        """Return {Plate: Array of Matching Well Indices}
+
+        Queries of three or more characters match anywhere in the sample
+        ID or description; shorter queries match the start of sample IDs.
+        At most `limit` wells are returned; candidates are only checked
+        until that many match.
+        """
+
+        needle = query.lower()
+        if not needle:
+            return {}
+        if len(needle) < 3:
+            candidates = self.prefixMatches(needle)
+        else:
+            candidates = self.trigramCandidates(needle)
+        # A three-character query is a single trigram: nothing to verify
+        verify = len(needle) > 3 or matchCase
+        docs = []
+        for doc in candidates:
+            if limit is not None and len(docs) >= limit:
+                break
+            if not verify or self.matches(doc, query, matchCase):
+                docs.append(doc)
+
+        # Group documents by plate
+        results = {}
+        docs = np.array(docs, dtype=np.int64)
+        slots, wells = np.divmod(docs, STRIDE)
+        for slot in np.unique(slots).tolist():
+            results[self.plates[slot]] = np.sort(wells[slots == slot])
+        return results
+
+    def prefixMatches(self, needle):
+        """Yield Documents Whose Sample ID Starts with `needle`, Plate by Plate"""
+
+        for slot in sorted(self.prefixes):
+            prefixes = self.prefixes[slot]
+            start = bisect_left(prefixes, (needle,))
+            end = bisect_left(prefixes, (needle + "\U0010ffff",))
+            for i in range(start, end):
+                yield prefixes[i][1]
+
+    def trigramCandidates(self, needle):
+        """Yield Documents Holding Every Trigram of `needle`, in Order
+
+        The rarest trigram's posting is walked a chunk at a time, so a
+        caller stopping early never intersects the rest of it.
+        """
+
+        postings = []
+        for gram in trigrams(needle):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return
+            postings.append(posting)
+        postings.sort(key=len)
+        rarest, others = postings[0], postings[1:]
+        for start in range(0, len(rarest), CHUNK_DOCS):
+            chunk = rarest[start:start + CHUNK_DOCS]
+            for posting in others:
+                found = np.searchsorted(posting, chunk)
+                found[found == len(posting)] = 0
+                chunk = chunk[posting[found] == chunk]
+                if not len(chunk):
+                    break
+            yield from chunk.tolist()
+
+    def containing(self, query, matchCase=False):
+        """Return {Plate: Wells} Holding the Query Anywhere in a Searched Field
+
+        The rule Replace All needs, whatever the query's length: the
+        index answers long queries, short ones scan each plate.
+        """
+
+        if len(query) >= 3:
+            return self.search(query, matchCase)
+        results = {}
+        for plate in self.slots:
+            wells = matchWells(plate, query, matchCase, anywhere=True)
+            if len(wells):
+                results[plate] = wells
+        return results
+
+    def matches(self, doc, query, matchCase):
+        """Check One Candidate Document Against the Query"""
+
+        texts = self.texts[doc]
+        if not matchCase:
+            texts, query = [text.lower() for text in texts], query.lower()
+        if len(query) < 3:
+            return texts[0].startswith(query)
+        return any(query in text for text in texts)
+
+def matchWells(plate, query, matchCase=False, anywhere=False):
+    """Return the Wells of One Plate Matching a Query (Vectorized)
+
+    Uses the same rules as `SearchIndex.search`, scanning the plate's
+    columns directly; used to highlight matches on the plate on screen.
+    With `anywhere` short queries match anywhere too.
+    """
+
+    if not query:
+        return np.empty(0, dtype=np.intp)
+    ids, descr = plate.sampleID, plate.description
+    if not matchCase:
+        ids, descr, query = np.strings.lower(ids), np.strings.lower(descr), query.lower()
+    if len(query) < 3 and not anywhere:
+        mask = np.strings.startswith(ids, query)
+    else:
+        mask = (np.strings.find(ids, query) >= 0) | (np.strings.find(descr, query) >= 0)
+    return np.flatnonzero(mask)
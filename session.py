@@ -0,0 +1,109 @@
+"""
+    Filename: Session.py
+
+    The plates open in this session, and the views that show them.
+
+    Every plate opened stays in the session. Its plate view is kept in a
+    stacked widget after it is first shown, so switching back to a plate
+    only raises its view - selection included - instead of rebuilding
+    it. Views are kept in least-recently-shown order, and the oldest are
+    dropped once their estimated memory passes the cache budget; a
+    dropped view is simply rebuilt the next time its plate is shown.
+"""
+
+# Import modules
+from collections import OrderedDict
+
+# Memory budget for cached plate views, in bytes: a handful of views,
+# since plates off screen are shown as thumbnails (view.PlateOverview)
+VIEW_BUDGET = 2**20
+
+def viewBytes(plateView):
+    """Estimate the Memory Held by a Plate View
+
+    The widget itself, plus a well rectangle, name and a few mask bytes
+    for every well.
+    """
+    return 16 * 2**10 + plateView.wells * 200
+
+# * Plate Session Class
+class PlateSession:
+    """Open Plates and a Least-Recently-Shown Cache of their Views"""
+
+    def __init__(self, stack, createView, budget=VIEW_BUDGET):
+        """Class Initializer
+
+        `stack` is the QStackedWidget holding the views, and
+        `createView(plate)` builds the view of a plate.
+        """
+
+        self.stack = stack
+        self.createView = createView
+        self.budget = budget
+        # Open plates, in the order they were opened
+        self.plates = []
+        # Plate -> cached view, least recently shown first
+        self.views = OrderedDict()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self.plates)
+
+    def __contains__(self, plate):
+        return plate in self.plates
+
+    def current(self):
+        """Return the Plate Shown, or None"""
+        return next(reversed(self.views), None)
+
+    def find(self, barcode):
+        """Return the Open Plate with a Barcode, or None"""
+
+        for plate in self.plates:
+            if barcode and plate.barcode == barcode:
+                return plate
+        return None
+
+    def open(self, plate):
+        """Add a Plate to the Session Without Building its View"""
+        if plate not in self.plates:
+            self.plates.append(plate)
+
+    def show(self, plate):
+        """Show a Plate, Opening it if Needed; Return its View"""
+
+        self.open(plate)
+        plateView = self.views.pop(plate, None)
+        if plateView is None:
+            plateView = self.createView(plate)
+            self.stack.addWidget(plateView)
+            self.nbytes += viewBytes(plateView)
+        self.views[plate] = plateView
+        self.stack.setCurrentWidget(plateView)
+        self.evict()
+        return plateView
+
+    def evict(self):
+        """Drop the Least Recently Shown Views Beyond the Budget"""
+
+        # The view on screen is never dropped
+        while self.nbytes > self.budget and len(self.views) > 1:
+            plate, plateView = self.views.popitem(last=False)
+            self.dropView(plateView)
+
+    def close(self, plate):
+        """Close a Plate and Drop its View"""
+
+        if plate in self.plates:
+            self.plates.remove(plate)
+        plateView = self.views.pop(plate, None)
+        if plateView is not None:
+            self.dropView(plateView)
+
+    def dropView(self, plateView):
+        """Detach a View from its Plate and Delete it"""
+
+        plateView.setPlate(None)
+        self.stack.removeWidget(plateView)
+        plateView.deleteLater()
+        self.nbytes -= viewBytes(plateView)
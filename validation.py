@@ -0,0 +1,518 @@
+"""
+    Filename: Validation.py
+
+    Rule checks over the contents of the plates open in a session.
+
+    A rule flags the wells that break it:
+
+        - RangeRule: a numeric field outside [low, high];
+        - TypeVolumeRule: a volume outside the limits of its sample type;
+        - DuplicateRule: a sample ID used by more than one well of a plate,
+          or by wells of different plates;
+        - ControlRule: control positions not holding the expected control;
+        - EdgeRule: samples in the edge wells (prone to evaporation),
+          other than the sample types allowed there.
+
+    The validator keeps a (rules, wells) violation mask per plate. A plate
+    is checked whole when it is watched - a few array operations per rule,
+    or one index lookup per well for duplicates; after that each change
+    notification only re-checks the rules that read the fields written,
+    in the wells they affect - the wells written, plus for duplicates the
+    other wells sharing the old or new sample ID. Rules are built from a
+    list of specs, e.g. read from ~/.wellplate/rules.json:
+
+        [{"rule": "range", "field": "volume", "low": 0, "high": 200},
+         {"rule": "typeVolume", "limits": {"DNA": [5, 50]}},
+         {"rule": "duplicate", "acrossPlates": true},
+         {"rule": "control", "wells": ["A1", "H12"], "idPrefix": "CTRL"},
+         {"rule": "edge", "allowedTypes": ["Other"]}]
+"""
+
+# Import modules
+import inspect
+import json
+import os
+import numpy as np
+import model
+
+# Severities a rule may be given
+SEVERITIES = ("warning", "error")
+
+# Rule specs read at start-up, if the file exists
+RULES_PATH = os.path.join(os.path.expanduser("~"), ".wellplate", "rules.json")
+
+def ruleTypeCode(sampleType):
+    """Return the Type Code of a Sample Type Named in a Rule"""
+
+    if sampleType not in model.SAMPLE_TYPES:
+        raise ValueError("unknown sample type %r (expected one of %s)" % (
+            sampleType, ", ".join(model.SAMPLE_TYPES)
+        ))
+    return model.typeCode(sampleType)
+
+# * Rule Class
+class Rule:
+    """Base Rule: Flags Wells Independently of Each Other"""
+
+    # Fields the rule reads; edits of other fields skip it
+    fields = ()
+    # "error" or "warning"
+    severity = "error"
+
+    def watch(self, plate):
+        """Start Following a Plate; Return Other (Plate, Wells) to Re-Check"""
+        return []
+
+    def unwatch(self, plate):
+        """Stop Following a Plate; Return the (Plate, Wells) to Re-Check"""
+        return []
+
+    def affected(self, change):
+        """Return the (Plate, Wells) Whose Result a Change May Alter"""
+        return [(change.plate, change.indices)]
+
+    def check(self, plate, indices):
+        """Return a Mask of the Given Wells that Break the Rule"""
+        raise NotImplementedError
+
+    def message(self, plate, index):
+        """Describe How a Well Breaks the Rule"""
+        raise NotImplementedError
+
+# * Range Rule Class
+class RangeRule(Rule):
+    """A Numeric Field Must Lie Within [Low, High] (Unset Values Pass)"""
+
+    def __init__(self, field, low=-np.inf, high=np.inf):
+        """Class Initializer"""
+
+        if field not in model.FIELDS or model.FIELDS[field][0] is not np.float64:
+            raise ValueError("%r is not a numeric sample field" % field)
+        self.fields = (field,)
+        self.field = field
+        self.low, self.high = float(low), float(high)
+
+    def check(self, plate, indices):
+        values = plate.columns[self.field][indices]
+        return (values < self.low) | (values > self.high)
+
+    def message(self, plate, index):
+        value = float(plate.columns[self.field][index])
+        if value < self.low:
+            return "%s %g is below %g" % (self.field.capitalize(), value, self.low)
+        return "%s %g is above %g" % (self.field.capitalize(), value, self.high)
+
+# * Type Volume Rule Class
+class TypeVolumeRule(Rule):
+    """Volumes Must Lie Within the Limits of their Sample Type"""
+
+    fields = ("volume", "sampleType")
+
+    def __init__(self, limits):
+        """Class Initializer
+
+        `limits` maps sample type names to (low, high) volumes (uL).
+        """
+
+        # Limits by type code, so a lookup covers every well at once
+        self.low = np.full(len(model.SAMPLE_TYPES) + 1, -np.inf)
+        self.high = np.full(len(model.SAMPLE_TYPES) + 1, np.inf)
+        for sampleType, (low, high) in limits.items():
+            code = ruleTypeCode(sampleType)
+            self.low[code], self.high[code] = low, high
+
+    def check(self, plate, indices):
+        codes = plate.sampleType[indices]
+        volumes = plate.volume[indices]
+        return (volumes < self.low[codes]) | (volumes > self.high[codes])
+
+    def message(self, plate, index):
+        code = int(plate.sampleType[index])
+        return "%s volume %g is outside %g-%g uL" % (
+            model.typeName(code), float(plate.volume[index]),
+            self.low[code], self.high[code]
+        )
+
+# * Duplicate Rule Class
+class DuplicateRule(Rule):
+    """Sample IDs Must be Unique Within a Plate, or Across Every Plate
+
+    The wells holding each sample ID are kept in an index updated from
+    the change notifications, like the search index, grouped by plate
+    and counted. A well's result only changes when its ID starts or stops
+    being shared, so an edit re-checks the wells it wrote and, when a
+    count crosses from one to two holders (or back), the wells holding
+    the ID already, never every well sharing it.
+    """
+
+    fields = ("sampleID",)
+
+    def __init__(self, acrossPlates=False):
+        """Class Initializer"""
+
+        self.acrossPlates = acrossPlates
+        # Sample IDs of each watched plate, as indexed
+        self.ids = {}
+        # Key (the ID, or (plate, ID) within plates) -> {plate: {well}}
+        self.owners = {}
+        # Key -> wells holding it, on every plate
+        self.counts = {}
+
+    def key(self, plate, sampleID):
+        return sampleID if self.acrossPlates else (plate, sampleID)
+
+    def watch(self, plate):
+        ids = plate.sampleID.tolist()
+        self.ids[plate] = ids
+        touched = {}
+        for well, sampleID in enumerate(ids):
+            if sampleID:
+                self.add(plate, well, sampleID, touched)
+        # Wells of other plates that now share an ID with this one
+        touched.pop(plate, None)
+        return [(p, np.fromiter(wells, np.intp)) for p, wells in touched.items()]
+
+    def unwatch(self, plate):
+        ids = self.ids.pop(plate, None)
+        touched = {}
+        for well, sampleID in enumerate(ids or []):
+            if sampleID:
+                self.release(plate, well, sampleID, touched)
+        touched.pop(plate, None)
+        return [(p, np.fromiter(wells, np.intp)) for p, wells in touched.items()]
+
+    def add(self, plate, well, sampleID, touched):
+        """Add a Well to the Owners of an ID, Noting Wells Now Sharing it"""
+
+        key = self.key(plate, sampleID)
+        holders = self.owners.setdefault(key, {})
+        wells = holders.get(plate)
+        if wells is None:
+            # The ID was on one other plate only: its wells are now shared
+            if self.acrossPlates and len(holders) == 1:
+                for p, others in holders.items():
+                    touched.setdefault(p, set()).update(others)
+            wells = holders[plate] = set()
+        elif len(wells) == 1 and not self.acrossPlates:
+            touched.setdefault(plate, set()).update(wells)
+        wells.add(well)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def release(self, plate, well, sampleID, touched):
+        """Drop a Well from the Owners of an ID, Noting Wells No Longer Sharing it"""
+
+        key = self.key(plate, sampleID)
+        holders = self.owners[key]
+        wells = holders[plate]
+        wells.discard(well)
+        self.counts[key] -= 1
+        if not wells:
+            del holders[plate]
+            # The ID is left on one plate only: its wells are no longer shared
+            if self.acrossPlates and len(holders) == 1:
+                for p, others in holders.items():
+                    touched.setdefault(p, set()).update(others)
+        elif len(wells) == 1 and not self.acrossPlates:
+            touched.setdefault(plate, set()).update(wells)
+        if not holders:
+            del self.owners[key]
+            del self.counts[key]
+
+    def affected(self, change):
+        plate = change.plate
+        ids = self.ids[plate]
+        touched = {plate: set()}
+        for well, new in zip(change.indices.tolist(), change.new["sampleID"].tolist()):
+            old = ids[well]
+            if old == new:
+                continue
+            if old:
+                self.release(plate, well, old, touched)
+            if new:
+                self.add(plate, well, new, touched)
+            ids[well] = new
+            touched[plate].add(well)
+        return [(p, np.fromiter(wells, np.intp)) for p, wells in touched.items()]
+
+    def others(self, plate, well):
+        """Return the Number of Other Wells Sharing a Well's ID
+
+        Across plates only wells of other plates count, leaving repeats
+        within a plate to the within-plate rule.
+        """
+
+        key = self.key(plate, self.ids[plate][well])
+        holders = self.owners.get(key)
+        if not holders:
+            return 0
+        if self.acrossPlates:
+            return self.counts[key] - len(holders.get(plate, ()))
+        return len(holders[plate]) - 1
+
+    def check(self, plate, indices):
+        return np.array([
+            self.others(plate, well) > 0 for well in np.asarray(indices).tolist()
+        ], dtype=bool)
+
+    def message(self, plate, index):
+        others = self.others(plate, index)
+        where = "on other plates" if self.acrossPlates else "on this plate"
+        return "Sample ID %s is used by %d other well%s %s" % (
+            self.ids[plate][index], others, "s" if others > 1 else "", where
+        )
+
+# * Control Rule Class
+class ControlRule(Rule):
+    """Control Positions Must Hold a Control (of a Sample Type or ID Prefix)"""
+
+    fields = ("sampleID", "sampleType")
+
+    def __init__(self, wells, sampleType=None, idPrefix=None):
+        """Class Initializer
+
+        `wells` names the control positions; names not on a plate's
+        format are skipped for that plate.
+        """
+
+        self.wells = list(wells)
+        self.sampleType = sampleType
+        self.idPrefix = idPrefix
+        # Control positions of each plate format, as a mask
+        self.masks = {}
+
+    def positions(self, plate):
+        """Return the Mask of the Control Positions on a Plate's Format"""
+
+        if plate.wells not in self.masks:
+            mask = np.zeros(plate.wells, dtype=bool)
+            for name in self.wells:
+                try:
+                    mask[plate.geometry.indexOf(name)] = True
+                except (KeyError, ValueError):
+                    pass
+            self.masks[plate.wells] = mask
+        return self.masks[plate.wells]
+
+    def check(self, plate, indices):
+        columns = {field: plate.columns[field][indices] for field in self.fields}
+        return self.positions(plate)[indices] & ~model.matchMask(
+            columns, sampleType=self.sampleType, idPrefix=self.idPrefix
+        )
+
+    def message(self, plate, index):
+        control = " ".join(filter(None, [
+            self.sampleType, self.idPrefix and "%s..." % self.idPrefix
+        ])) or "sample"
+        return "Control position: needs a %s control" % control
+
+# * Edge Rule Class
+class EdgeRule(Rule):
+    """Edge Wells Must be Empty, or Hold One of the Allowed Sample Types"""
+
+    fields = ("sampleID", "sampleType")
+    severity = "warning"
+
+    def __init__(self, depth=1, allowedTypes=()):
+        """Class Initializer
+
+        `depth` is the number of rows and columns counted as the edge.
+        """
+
+        self.depth = depth
+        self.allowed = np.zeros(len(model.SAMPLE_TYPES) + 1, dtype=bool)
+        for sampleType in allowedTypes:
+            self.allowed[ruleTypeCode(sampleType)] = True
+        self.masks = {}
+
+    def edge(self, plate):
+        """Return the Mask of the Edge Wells of a Plate's Format"""
+
+        if plate.wells not in self.masks:
+            tables, depth = plate.geometry, self.depth
+            self.masks[plate.wells] = (
+                (tables.row < depth) | (tables.row >= tables.rows - depth)
+                | (tables.col < depth) | (tables.col >= tables.cols - depth)
+            )
+        return self.masks[plate.wells]
+
+    def check(self, plate, indices):
+        columns = {field: plate.columns[field][indices] for field in self.fields}
+        return (self.edge(plate)[indices] & model.occupiedMask(columns)
+                & ~self.allowed[columns["sampleType"]])
+
+    def message(self, plate, index):
+        return "Edge well: samples here may evaporate"
+
+# Rule classes by spec name
+RULES = {
+    "range": RangeRule,
+    "typeVolume": TypeVolumeRule,
+    "duplicate": DuplicateRule,
+    "control": ControlRule,
+    "edge": EdgeRule,
+}
+
+def defaultRules():
+    """Return the Rules Checked Unless Configured Otherwise"""
+
+    return [
+        RangeRule("volume", low=0),
+        RangeRule("concentration", low=0),
+        DuplicateRule(),
+        DuplicateRule(acrossPlates=True),
+    ]
+
+def rulesFromSpecs(specs):
+    """Build Rules from Specs: Dictionaries Naming a Rule and its Arguments
+
+    Any mistake in a spec raises a ValueError naming the rule at fault.
+    """
+
+    if not isinstance(specs, list):
+        raise ValueError("Rule specs must be a list of rules")
+    rules = []
+    for number, spec in enumerate(specs, start=1):
+        if not isinstance(spec, dict):
+            raise ValueError("Rule %d is not an object: %r" % (number, spec))
+        spec = dict(spec)
+        name = spec.pop("rule", None)
+        if name not in RULES:
+            raise ValueError("Rule %d: unknown rule %r (expected one of %s)" % (
+                number, name, ", ".join(RULES)
+            ))
+        where = "Rule %d (%s)" % (number, name)
+        severity = spec.pop("severity", None)
+        if severity is not None and severity not in SEVERITIES:
+            raise ValueError("%s: unknown severity %r" % (where, severity))
+        parameters = inspect.signature(RULES[name]).parameters
+        for key in spec:
+            if key not in parameters:
+                raise ValueError("%s: unknown key %r" % (where, key))
+        for key, parameter in parameters.items():
+            if parameter.default is parameter.empty and key not in spec:
+                raise ValueError("%s: missing key %r" % (where, key))
+        try:
+            rule = RULES[name](**spec)
+        except (TypeError, ValueError, KeyError, AttributeError) as err:
+            raise ValueError("%s: %s" % (where, err))
+        if severity is not None:
+            rule.severity = severity
+        rules.append(rule)
+    return rules
+
+def loadRules(path):
+    """Read Rule Specs from a JSON File"""
+
+    with open(path, encoding="utf-8") as file:
+        return rulesFromSpecs(json.load(file))
+
+# * Validator Class
+class Validator:
+    """Check Watched Plates Against a Set of Rules as they are Edited"""
+
+    def __init__(self, rules=None):
+        """Class Initializer"""
+
+        self.rules = defaultRules() if rules is None else list(rules)
+        # Plate -> (rules, wells) mask of violations
+        self.violations = {}
+        # Callables notified with (plate, wells) whose results changed
+        self.listeners = []
+
+    def __len__(self):
+        return len(self.violations)
+
+    def watch(self, plate):
+        """Check Every Well of a Plate, Then Re-Check it as it Changes"""
+
+        if plate in self.violations:
+            return
+        violations = np.zeros((len(self.rules), plate.wells), dtype=bool)
+        self.violations[plate] = violations
+        everything = np.arange(plate.wells)
+        changed = {}
+        for r, rule in enumerate(self.rules):
+            # A new plate can break rules on the plates already watched,
+            # e.g. by sharing their sample IDs
+            for other, wells in rule.watch(plate):
+                self.recheck(r, other, wells, changed)
+            violations[r] = rule.check(plate, everything)
+        plate.addListener(self.plateChanged)
+        self.notify(changed)
+
+    def unwatch(self, plate):
+        """Stop Checking a Plate"""
+
+        if self.violations.pop(plate, None) is None:
+            return
+        plate.removeListener(self.plateChanged)
+        changed = {}
+        for r, rule in enumerate(self.rules):
+            for other, wells in rule.unwatch(plate):
+                self.recheck(r, other, wells, changed)
+        self.notify(changed)
+
+    def plateChanged(self, change):
+        """Re-Check the Wells a Change Affects, Rule by Rule (Plate Listener)"""
+
+        changed = {}
+        for r, rule in enumerate(self.rules):
+            if any(field in rule.fields for field in change.fields):
+                for plate, wells in rule.affected(change):
+                    self.recheck(r, plate, wells, changed)
+        self.notify(changed)
+
+    def recheck(self, r, plate, wells, changed):
+        """Re-Check One Rule in Some Wells, Noting the Wells that Flipped"""
+
+        if not len(wells) or plate not in self.violations:
+            return
+        row = self.violations[plate][r]
+        result = self.rules[r].check(plate, wells)
+        flipped = wells[row[wells] != result]
+        row[wells] = result
+        if len(flipped):
+            changed.setdefault(plate, []).append(flipped)
+
+    def addListener(self, listener):
+        """Call `listener(plate, wells)` Whenever Wells Start or Stop Failing"""
+        self.listeners.append(listener)
+
+    def notify(self, changed):
+        """Pass the Wells Whose Results Changed to Every Listener"""
+        for plate, wells in changed.items():
+            wells = np.unique(np.concatenate(wells))
+            for listener in list(self.listeners):
+                listener(plate, wells)
+
+    def invalid(self, plate, severity=None):
+        """Return a Mask of the Wells of a Plate Breaking Any Rule"""
+
+        violations = self.violations.get(plate)
+        if violations is None:
+            return np.zeros(plate.wells, dtype=bool)
+        if severity is not None:
+            violations = violations[[rule.severity == severity for rule in self.rules]]
+        return violations.any(axis=0)
+
+    def severities(self, plate):
+        """Return Each Well's Worst Problem: 0 None, 1 a Warning, 2 an Error"""
+
+        levels = self.invalid(plate, "warning").astype(np.uint8)
+        levels[self.invalid(plate, "error")] = 2
+        return levels
+
+    def issues(self, plate, wells=None):
+        """Return (Well Name, Severity, Message) for Every Rule Broken"""
+
+        violations = self.violations.get(plate)
+        if violations is None:
+            return []
+        indices = plate.wellIndices(wells)
+        issues = []
+        for index in indices[violations[:, indices].any(axis=0)].tolist():
+            for r in np.flatnonzero(violations[:, index]).tolist():
+                rule = self.rules[r]
+                issues.append((str(plate.geometry.names[index]), rule.severity,
+                               rule.message(plate, index)))
+        return issues
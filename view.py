@@ -8,12 +8,106 @@
 """
 
 # Import necessary modules
-from PyQt6.QtCore import Qt, QDir
-from PyQt6.QtGui import QIcon, QAction
+from PyQt6.QtCore import Qt, QDir, QPointF, QRectF, QSize, QTimer, pyqtSignal
+from PyQt6.QtGui import (
+    QIcon, QAction, QBrush, QColor, QFont, QImage, QKeySequence, QPainter,
+    QPen, QPixmap, QPolygonF
+)
 import PyQt6.QtWidgets as Widgets
+import numpy as np
+import geometry
+import resources_rc
 
-# Set path to icons
-QDir.addSearchPath('icons', 'resources/')
+# Well colours: empty wells, then one per sample type (model.SAMPLE_TYPES)
+TYPE_COLOURS = ("grey", "goldenrod", "steelblue", "mediumpurple", "seagreen", "darkcyan")
+# Colour of wells holding a sample without a sample type
+FILLED_COLOUR = "cadetblue"
+# Sample fields that change how a well is drawn
+STYLE_FIELDS = ("sampleID", "sampleType", "flagged")
+# Size of the plate thumbnails in the plate overview
+THUMBNAIL_SIZE = (96, 64)
+# Heatmap colour scale, low to high, and the colour of wells without a value
+HEATMAP_STOPS = ("#2166ac", "#f7f7f7", "#b2182b")
+HEATMAP_MISSING = "lightgrey"
+# Colours of kinetic curves: the mean line and the min-max band around it
+KINETIC_LINE = "black"
+KINETIC_BAND = "#9ecae1"
+# Outline colours of wells breaking a validation rule: warnings, errors
+PROBLEM_COLOURS = ("darkorange", "red")
+# Fewest timepoints a kinetic plot can be zoomed in to
+KINETIC_MIN_SPAN = 8
+# Bars of the duration histograms in the profiler panel, lowest to highest
+HISTOGRAM_BARS = " \u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
+
+def wellStates(plate, indices):
+    """Return the Colour Index of Each Well
+
+    0 for empty wells, the sample type code for typed samples, and
+    len(TYPE_COLOURS) for samples without a type.
+    """
+
+    states = plate.sampleType[indices].astype(np.intp)
+    untyped = (states == 0) & (plate.sampleID[indices] != "")
+    states[untyped] = len(TYPE_COLOURS)
+    return states
+
+def renderThumbnail(plate, size=THUMBNAIL_SIZE):
+    """Draw a Plate's Wells into a Small Image, Straight from its Columns"""
+
+    tables = plate.geometry
+    # Every well is a square block of pixels, with a gap when there is room
+    cell = max(min(size[0] // tables.cols, size[1] // tables.rows), 1)
+    colours = np.array(
+        [QColor(c).rgb() for c in TYPE_COLOURS + (FILLED_COLOUR,)], dtype=np.uint32
+    )
+    grid = colours[wellStates(plate, slice(None))].reshape(tables.rows, tables.cols)
+    pixels = np.repeat(np.repeat(grid, cell, axis=0), cell, axis=1)
+    if cell >= 4:
+        pixels[cell - 1::cell, :] = pixels[:, cell - 1::cell] = QColor("white").rgb()
+    pixels = np.ascontiguousarray(pixels)
+    height, width = pixels.shape
+    return QImage(
+        pixels.data, width, height, width * 4, QImage.Format.Format_RGB32
+    ).copy()
+
+def heatmapColours():
+    """Return the Heatmap Colour Table: Missing, then 255 Steps Low to High"""
+
+    stops = np.array([QColor(c).getRgb()[:3] for c in HEATMAP_STOPS], dtype=float)
+    steps = np.linspace(0, len(stops) - 1, 255)
+    rgb = np.stack([
+        np.interp(steps, np.arange(len(stops)), stops[:, k]) for k in range(3)
+    ], axis=1).round().astype(np.uint32)
+    colours = 0xFF000000 | rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2]
+    return np.r_[np.uint32(QColor(HEATMAP_MISSING).rgb()), colours].astype(np.uint32)
+
+def renderHeatmap(levels, tables):
+    """Convert Per-Well Colour Levels (0-255) into a One-Pixel-per-Well Image
+
+    Level 0 marks a well without a value. The image is drawn scaled over
+    the wells, so a whole plate is coloured with one lookup and one draw.
+    """
+
+    pixels = np.ascontiguousarray(
+        heatmapColours()[levels].reshape(tables.rows, tables.cols)
+    )
+    return QImage(
+        pixels.data, tables.cols, tables.rows, tables.cols * 4,
+        QImage.Format.Format_RGB32
+    ).copy()
+
+def histogramBars(counts):
+    """Draw Histogram Counts as a Line of Bar Characters"""
+
+    top = max(counts) or 1
+    last = len(HISTOGRAM_BARS) - 1
+    return "".join(
+        HISTOGRAM_BARS[-(-count * last // top)] for count in counts
+    )
+
+# Icons are compiled into `resources_rc` (see buildresources.py), so
+# they load the same whatever the working directory
+QDir.addSearchPath('icons', ':/')
 
 # * Main Window Class
 class MainWindow(Widgets.QMainWindow):
@@ -25,7 +119,7 @@ class MainWindow(Widgets.QMainWindow):
         super().__init__()
         # Set window properties
         self.setWindowTitle("Welcome to WellPlate")
-        self.setFixedSize(300, 250)
+        self.setFixedSize(300, 310)
         # Create base layout for window, and assign central widget
         self.baseLayout = Widgets.QVBoxLayout()
         self.centralWidget = Widgets.QWidget()
@@ -55,6 +149,14 @@ class MainWindow(Widgets.QMainWindow):
         )
         self.baseLayout.addWidget(self.StartUpBtns["new384"])
 
+        # Create `new 1536` button and set style
+        self.StartUpBtns["new1536"] = Widgets.QPushButton("New 1536-Well Plate")
+        self.StartUpBtns["new1536"].setFixedHeight(50)
+        self.StartUpBtns["new1536"].setStyleSheet(
+            "font-size: 16px; font-weight: bold; background-color: grey"
+        )
+        self.baseLayout.addWidget(self.StartUpBtns["new1536"])
+
         # Create `load` button and set style
         self.StartUpBtns["load"] = Widgets.QPushButton("Load Plate Layout")
         self.StartUpBtns["load"].setFixedHeight(50)
@@ -63,6 +165,13 @@ class MainWindow(Widgets.QMainWindow):
         )
         self.baseLayout.addWidget(self.StartUpBtns["load"])
 
+    def createPlateStack(self):
+        """Replace the Start-Up Buttons with a Stack of Plate Views"""
+
+        self.plateStack = Widgets.QStackedWidget()
+        self.setCentralWidget(self.plateStack)
+        return self.plateStack
+
     def createActions(self):
         """Create Actions for the Menus and Toolbars"""
 
@@ -70,8 +179,46 @@ class MainWindow(Widgets.QMainWindow):
         self.action_new = QAction(QIcon("icons:file-new.svg"), "&New", self)
         self.action_open = QAction(QIcon("icons:file-open.svg"), "&Open", self)
         self.action_save = QAction(QIcon("icons:file-save.svg"), "&Save", self)
+        self.action_openDB = QAction("Open from &Database...", self)
+        self.action_saveDB = QAction("Save to D&atabase", self)
+        self.action_importManifest = QAction("&Import Manifest...", self)
+        self.action_importReadout = QAction("Import &Readout...", self)
+        self.action_importKinetics = QAction("Import &Kinetic Read...", self)
+        # Enabled once plates have been reformatted
+        self.action_exportWorklist = QAction("Export &Worklist...", self)
+        self.action_exportWorklist.setEnabled(False)
         self.action_exit = QAction("Exit", self)
 
+        # Edit actions
+        self.action_undo = QAction("&Undo", self)
+        self.action_undo.setShortcut(QKeySequence.StandardKey.Undo)
+        self.action_redo = QAction("&Redo", self)
+        self.action_redo.setShortcut(QKeySequence.StandardKey.Redo)
+        self.action_copy = QAction(QIcon("icons:edit-copy.svg"), "&Copy", self)
+        self.action_copy.setShortcut(QKeySequence.StandardKey.Copy)
+        self.action_paste = QAction(QIcon("icons:edit-paste.svg"), "&Paste", self)
+        self.action_paste.setShortcut(QKeySequence.StandardKey.Paste)
+        self.action_clearWells = QAction(QIcon("icons:edit-cut.svg"), "Clear Wells", self)
+        self.action_clearWells.setShortcut(QKeySequence.StandardKey.Delete)
+        self.action_selectAll = QAction("Select &All", self)
+        self.action_selectAll.setShortcut(QKeySequence.StandardKey.SelectAll)
+        self.action_selectQuadrant = [
+            QAction("Quadrant %d" % (q + 1), self) for q in range(4)
+        ]
+        self.action_incrementIDs = QAction("Number Sample IDs...", self)
+        self.action_serialDilution = QAction("Serial Dilution...", self)
+        self.action_flagWells = QAction("&Flag Wells", self)
+        self.action_flagWells.setShortcut("Ctrl+G")
+        # Toggles barcode-scanner entry
+        self.action_rapidEntry = QAction("Rapid &Entry (Scanner)", self)
+        self.action_rapidEntry.setShortcut("Ctrl+E")
+        self.action_rapidEntry.setCheckable(True)
+
+        # Plates actions
+        self.action_stampQuadrants = QAction("Stamp into &Quadrants...", self)
+        self.action_splitQuadrants = QAction("&Split into Quadrants...", self)
+        self.action_compressPlates = QAction("&Compress Plates...", self)
+
         # Find actions
         self.action_find = QAction("Find", self)
         self.action_replace = QAction("Replace", self)
@@ -79,6 +226,10 @@ class MainWindow(Widgets.QMainWindow):
         # Help actions
         self.action_helpContent = QAction(QIcon("icons:help-content.svg"), "&Help Action", self)
         self.action_about = QAction("About", self)
+        # Shown when running with --profile
+        self.action_profiler = QAction("&Profiler", self)
+        self.action_profiler.setShortcut("Ctrl+Shift+P")
+        self.action_profiler.setVisible(False)
 
     def createMenus(self):
         """Create Menus"""
@@ -91,17 +242,49 @@ class MainWindow(Widgets.QMainWindow):
         menu_file.addAction(self.action_open)
         menu_file.addAction(self.action_save)
         menu_file.addSeparator()
+        menu_file.addAction(self.action_openDB)
+        menu_file.addAction(self.action_saveDB)
+        menu_file.addSeparator()
+        menu_file.addAction(self.action_importManifest)
+        menu_file.addAction(self.action_importReadout)
+        menu_file.addAction(self.action_importKinetics)
+        menu_file.addAction(self.action_exportWorklist)
+        menu_file.addSeparator()
         menu_file.addAction(self.action_exit)
 
+        # Edit menu
+        menu_edit = menu.addMenu("Edit")
+        menu_edit.addAction(self.action_undo)
+        menu_edit.addAction(self.action_redo)
+        menu_edit.addSeparator()
+        menu_edit.addAction(self.action_copy)
+        menu_edit.addAction(self.action_paste)
+        menu_edit.addAction(self.action_clearWells)
+        menu_edit.addSeparator()
+        menu_edit.addAction(self.action_selectAll)
+        menu_quadrant = menu_edit.addMenu("Select Quadrant")
+        for action in self.action_selectQuadrant:
+            menu_quadrant.addAction(action)
+        menu_edit.addSeparator()
+        menu_edit.addAction(self.action_incrementIDs)
+        menu_edit.addAction(self.action_serialDilution)
+        menu_edit.addAction(self.action_flagWells)
+        menu_edit.addSeparator()
+        menu_edit.addAction(self.action_rapidEntry)
+
         # Find menu
         menu_find = menu.addMenu("Find")
         menu_find.addAction(self.action_find)
         menu_find.addAction(self.action_replace)
 
+        # Plates menu, listing the plates open in this session
+        self.menu_plates = menu.addMenu("Plates")
+
         # Help menu
         menu_help = menu.addMenu("Help")
         menu_help.addAction(self.action_helpContent)
         menu_help.addAction(self.action_about)
+        menu_help.addAction(self.action_profiler)
 
     def createToolBars(self):
         """Create ToolBars"""
@@ -114,20 +297,33 @@ class MainWindow(Widgets.QMainWindow):
         toolBar_file.addSeparator()
         toolBar_file.setMovable(False)
 
-    def sampleForm(self, txt = None):
-        """Pop-Up Form for Sample Information"""
+        # Edit toolbar
+        toolBar_edit = self.addToolBar("Edit")
+        toolBar_edit.addAction(self.action_copy)
+        toolBar_edit.addAction(self.action_paste)
+        toolBar_edit.addAction(self.action_clearWells)
+        toolBar_edit.setMovable(False)
 
-        # Create widget instance
-        self.sample = Widgets.QWidget()
+# * Sample Editor Class
+class SampleEditor(Widgets.QDockWidget):
+    """Dockable Form for Sample Information
 
-        # Set window properties
-        self.sample.setWindowTitle("Please Enter Sample Information")
-        self.sample.setFixedSize(400, 400)
+    The form is built once and re-bound to whichever wells are being
+    edited, so opening a well never creates widgets.
+    """
+
+    def __init__(self, sampleTypes, parent=None):
+        """Class Initializer"""
+        super().__init__("Sample Information", parent)
+        self.createForm(sampleTypes)
+
+    def createForm(self, sampleTypes):
+        """Create the Sample Form"""
 
         # Create form layout
         formLayout = Widgets.QFormLayout()
 
-        self.sampleWell = Widgets.QLabel("Well " + txt)
+        self.sampleWell = Widgets.QLabel()
         self.sampleWell.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.sampleWell.setStyleSheet("font-size: 18px; font-weight: bold")
         formLayout.addRow(self.sampleWell)
@@ -138,8 +334,10 @@ class MainWindow(Widgets.QMainWindow):
         self.SampleVol = Widgets.QLineEdit()
         formLayout.addRow("Volume (uL):", self.SampleVol)
 
+        # Track whether the user picked a type since the form was bound
         self.SampleType = Widgets.QComboBox()
-        self.SampleType.addItems(["Serum", "DNA", "RNA", "NGS Library", "Other"])
+        self.SampleType.addItems(sampleTypes)
+        self.SampleType.activated.connect(self.typeEdited)
         formLayout.addRow("Sample Type:", self.SampleType)
 
         self.SampleConc = Widgets.QLineEdit()
@@ -153,117 +351,888 @@ class MainWindow(Widgets.QMainWindow):
         self.SampleSaveBtn.setStyleSheet("""background-color: green; font-size: 15px""")
         formLayout.addRow(self.SampleSaveBtn)
 
-        # Add form layout to widget
-        self.sample.setLayout(formLayout)
+        self.status = Widgets.QLabel()
+        formLayout.addRow(self.status)
 
-        # Show pop-up
-        self.sample.show()
+        # Text inputs keyed by the model field they edit
+        self.lineEdits = {
+            "sampleID": self.SampleID,
+            "volume": self.SampleVol,
+            "concentration": self.SampleConc,
+        }
+        self.typeChanged = False
 
-# * 96-Well Plate Interface Clas
-class Plate96(Widgets.QWidget):
-    """Interface for 96-Well Plates"""
+        widget = Widgets.QWidget()
+        widget.setLayout(formLayout)
+        self.setWidget(widget)
+
+    def typeEdited(self):
+        """Remember that the Sample Type was Picked by the User"""
+        self.typeChanged = True
+
+    def bind(self, title, values):
+        """Show the Values of the Wells Being Edited
+
+        `values` maps field names to a value, or to None where the wells
+        being edited hold different values.
+        """
+
+        self.sampleWell.setText(title)
+        for field, lineEdit in self.lineEdits.items():
+            value = values[field]
+            if isinstance(value, float):
+                value = "" if value != value else "%g" % value
+            lineEdit.setText("" if value is None else value)
+            lineEdit.setPlaceholderText("(multiple)" if value is None else "")
+        self.SampleType.setCurrentIndex(
+            self.SampleType.findText(values["sampleType"] or "")
+        )
+        self.SampleDescr.setPlainText(values["description"] or "")
+        self.SampleDescr.setPlaceholderText(
+            "(multiple)" if values["description"] is None else ""
+        )
+        # Nothing has been edited yet
+        self.SampleDescr.document().setModified(False)
+        self.typeChanged = False
+        self.status.clear()
+
+    def edits(self):
+        """Return the Text of Each Field Edited Since `bind`"""
+
+        edits = {
+            field: lineEdit.text()
+            for field, lineEdit in self.lineEdits.items()
+            if lineEdit.isModified()
+        }
+        if self.typeChanged:
+            edits["sampleType"] = self.SampleType.currentText()
+        if self.SampleDescr.document().isModified():
+            edits["description"] = self.SampleDescr.toPlainText()
+        return edits
+
+    def showStatus(self, message, error=False):
+        """Show a Message Below the Form"""
+
+        self.status.setStyleSheet("color: red" if error else "")
+        self.status.setText(message)
+
+
+# * Search Panel Class
+class SearchPanel(Widgets.QDockWidget):
+    """Dockable Find/Replace Panel"""
+
+    def __init__(self, parent=None):
+        """Class Initializer"""
+        super().__init__("Find / Replace", parent)
+        self.createPanel()
+
+    def createPanel(self):
+        """Create Search Inputs and Result List"""
+
+        formLayout = Widgets.QFormLayout()
+
+        self.findText = Widgets.QLineEdit()
+        self.findText.setPlaceholderText("Sample ID or description")
+        self.findText.setClearButtonEnabled(True)
+        formLayout.addRow("Find:", self.findText)
+
+        self.replaceText = Widgets.QLineEdit()
+        formLayout.addRow("Replace:", self.replaceText)
+
+        self.matchCase = Widgets.QCheckBox("Match case")
+        formLayout.addRow(self.matchCase)
+
+        self.replaceBtn = Widgets.QPushButton("Replace All")
+        formLayout.addRow(self.replaceBtn)
+
+        self.status = Widgets.QLabel()
+        formLayout.addRow(self.status)
+
+        # Double-clicking a result opens its plate
+        self.results = Widgets.QListWidget()
+        formLayout.addRow(self.results)
+
+        widget = Widgets.QWidget()
+        widget.setLayout(formLayout)
+        self.setWidget(widget)
+
+    def showResults(self, results, status):
+        """List Search Results as (Text, Data) Pairs"""
+
+        self.results.clear()
+        for text, data in results:
+            item = Widgets.QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, data)
+            self.results.addItem(item)
+        self.status.setText(status)
+
+# * Readout Panel Class
+class ReadoutPanel(Widgets.QDockWidget):
+    """Dockable List of Plate-Reader Reads, Shown as a Heatmap on the Plate"""
+
+    def __init__(self, methods, parent=None):
+        """Class Initializer"""
+        super().__init__("Readout", parent)
+        self.createPanel(methods)
+
+    def createPanel(self, methods):
+        """Create Normalization Choice, Colour Scale and Read List"""
+
+        formLayout = Widgets.QFormLayout()
+
+        self.method = Widgets.QComboBox()
+        self.method.addItems(methods)
+        formLayout.addRow("Normalize:", self.method)
+
+        self.scale = Widgets.QLabel()
+        formLayout.addRow("Scale:", self.scale)
+
+        self.status = Widgets.QLabel()
+        formLayout.addRow(self.status)
+
+        # Arrow keys step through the reads
+        self.reads = Widgets.QListWidget()
+        formLayout.addRow(self.reads)
+
+        widget = Widgets.QWidget()
+        widget.setLayout(formLayout)
+        self.setWidget(widget)
+
+    def showReads(self, names, status):
+        """List the Reads of an Imported File"""
+
+        self.reads.clear()
+        self.reads.addItems(names)
+        self.status.setText(status)
+
+    def showScale(self, low, high):
+        """Show the Values at the Two Ends of the Colour Scale"""
+        self.scale.setText("%.3g (blue) to %.3g (red)" % (low, high))
+
+# * Kinetic Panel Class
+class KineticPanel(Widgets.QDockWidget):
+    """Dockable Plot of the Kinetic Read of One Well"""
+
+    def __init__(self, parent=None):
+        """Class Initializer"""
+        super().__init__("Kinetics", parent)
+        self.createPanel()
+
+    def createPanel(self):
+        """Create the Plot and its Status Line"""
+
+        layout = Widgets.QVBoxLayout()
+        self.plot = KineticPlot()
+        layout.addWidget(self.plot)
+        # Shows the range plotted and whether it is binned
+        self.status = Widgets.QLabel()
+        layout.addWidget(self.status)
+        self.plot.rangeChanged.connect(self.status.setText)
+
+        widget = Widgets.QWidget()
+        widget.setLayout(layout)
+        self.setWidget(widget)
+
+# * Scan Panel Class
+class ScanPanel(Widgets.QDockWidget):
+    """Dockable Rapid-Entry Panel: Scanner Input and the Wells it Filled"""
+
+    def __init__(self, orders, parent=None):
+        """Class Initializer"""
+        super().__init__("Rapid Entry", parent)
+        self.createPanel(orders)
+
+    def createPanel(self, orders):
+        """Create Walk Settings, Scan Input and the List of Scans"""
+
+        formLayout = Widgets.QFormLayout()
+
+        self.order = Widgets.QComboBox()
+        self.order.addItems(orders)
+        formLayout.addRow("Walk:", self.order)
+
+        self.skipOccupied = Widgets.QCheckBox("Skip occupied wells")
+        self.skipOccupied.setChecked(True)
+        formLayout.addRow(self.skipOccupied)
+
+        # The scanner types into this line, ending each barcode with Enter
+        self.scanText = Widgets.QLineEdit()
+        self.scanText.setPlaceholderText("Scan a barcode")
+        formLayout.addRow("Scan:", self.scanText)
+
+        self.status = Widgets.QLabel()
+        self.status.setWordWrap(True)
+        formLayout.addRow(self.status)
+
+        # Latest scans first
+        self.scans = Widgets.QListWidget()
+        formLayout.addRow(self.scans)
+
+        widget = Widgets.QWidget()
+        widget.setLayout(formLayout)
+        self.setWidget(widget)
+
+    def addScans(self, lines, limit):
+        """List New Scans Above the Earlier Ones, Keeping the Latest `limit`"""
+
+        for line in lines:
+            self.scans.insertItem(0, line)
+        while self.scans.count() > limit:
+            self.scans.takeItem(self.scans.count() - 1)
+
+# * Profiler Panel Class
+class ProfilerPanel(Widgets.QDockWidget):
+    """Dockable Table of Slot, Paint and Event-Loop Lag Timings"""
+
+    # Table columns
+    COLUMNS = ("Event", "Calls", "Median ms", "95% ms", "Max ms", "Histogram")
+
+    def __init__(self, parent=None):
+        """Class Initializer"""
+        super().__init__("Profiler", parent)
+        self.createPanel()
+
+    def createPanel(self):
+        """Create the Timing Table, its Status Line and Buttons"""
+
+        layout = Widgets.QVBoxLayout()
+        self.table = Widgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(Widgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.status = Widgets.QLabel()
+        layout.addWidget(self.status)
+
+        buttons = Widgets.QHBoxLayout()
+        self.clearBtn = Widgets.QPushButton("Clear")
+        self.dumpBtn = Widgets.QPushButton("Save JSON...")
+        buttons.addWidget(self.clearBtn)
+        buttons.addWidget(self.dumpBtn)
+        layout.addLayout(buttons)
+
+        widget = Widgets.QWidget()
+        widget.setLayout(layout)
+        self.setWidget(widget)
+
+    def showSummary(self, rows, status):
+        """List the Statistics of Every Event (see profiling.Profiler.summary)"""
+
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            cells = ["%s: %s" % (row["kind"], row["name"]), str(row["calls"])]
+            cells += ["%.2f" % row[key] if key in row else "" for key in ("median", "p95", "max")]
+            cells.append(histogramBars(row["histogram"]))
+            for c, text in enumerate(cells):
+                self.table.setItem(r, c, Widgets.QTableWidgetItem(text))
+        self.table.resizeColumnsToContents()
+        self.status.setText(status)
+
+# * Kinetic Plot Class
+class KineticPlot(Widgets.QWidget):
+    """Custom-Painted Time Series of One Well, Zoomed with the Mouse Wheel
+
+    The plot asks the well's kinetic read for about one point per pixel
+    over the range shown, so it draws the min-max bins of a downsampled
+    level until it is zoomed in to single timepoints.
+    """
+
+    # Emitted with a description of the range plotted whenever it changes
+    rangeChanged = pyqtSignal(str)
 
     def __init__(self):
         """View Initializer"""
+
+        super().__init__()
+        # Kinetic read and well plotted, and the timepoints shown
+        self.kinetics = None
+        self.well = None
+        self.title = ""
+        self.start = self.stop = 0
+        self.series = None
+        self.linePen = QPen(QColor(KINETIC_LINE), 1)
+        self.bandBrush = QBrush(QColor(KINETIC_BAND))
+        self.axisPen = QPen(QColor("dimgrey"))
+        self.setMinimumSize(320, 200)
+
+    def setSeries(self, kinetics, well=None, title=""):
+        """Plot One Well of a Kinetic Read (a kinetics.PlateKinetics), or None"""
+
+        self.kinetics = kinetics
+        self.well = well
+        self.title = title
+        self.start, self.stop = 0, kinetics.timepoints if kinetics else 0
+        self.refetch()
+
+    def refetch(self):
+        """Fetch the Range Shown at the Resolution the Plot's Width Needs"""
+
+        if self.kinetics is None or self.well is None:
+            self.series = None
+            self.rangeChanged.emit("")
+        else:
+            points = max(self.width() - 60, 2)
+            self.series = self.kinetics.series(self.well, self.start, self.stop, points)
+            binned = len(self.series[0]) < self.stop - self.start
+            self.rangeChanged.emit("Timepoints %d-%d of %d%s" % (
+                self.start + 1, self.stop, self.kinetics.timepoints,
+                " (binned; scroll to zoom)" if binned else ""
+            ))
+        self.update()
+
+    def plotArea(self):
+        """Return the Rectangle Inside the Axes"""
+        return QRectF(50, 20, max(self.width() - 60, 1), max(self.height() - 45, 1))
+
+    def resizeEvent(self, event):
+        """Refetch at the New Width"""
+        self.refetch()
+        super().resizeEvent(event)
+
+    def wheelEvent(self, event):
+        """Zoom the Time Range In or Out Around the Cursor"""
+
+        if self.series is None:
+            return
+        area = self.plotArea()
+        fraction = min(max((event.position().x() - area.left()) / area.width(), 0), 1)
+        span = self.stop - self.start
+        scale = 0.8 if event.angleDelta().y() > 0 else 1.25
+        newSpan = min(max(int(span * scale), KINETIC_MIN_SPAN), self.kinetics.timepoints)
+        centre = self.start + fraction * span
+        self.start = min(max(int(centre - fraction * newSpan), 0),
+                         self.kinetics.timepoints - newSpan)
+        self.stop = self.start + newSpan
+        self.refetch()
+
+    def mouseDoubleClickEvent(self, event):
+        """Zoom Back Out to the Whole Read"""
+
+        if self.kinetics is not None:
+            self.start, self.stop = 0, self.kinetics.timepoints
+            self.refetch()
+
+    def paintEvent(self, event):
+        """Paint the Min-Max Band, the Mean Line and the Axes"""
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        area = self.plotArea()
+        painter.setPen(self.axisPen)
+        painter.drawRect(area)
+        painter.drawText(QRectF(area.left(), 0, area.width(), 18),
+                         Qt.AlignmentFlag.AlignCenter, self.title)
+        if self.series is None:
+            return
+        times, low, high, mean = self.series
+        finite = np.isfinite(low) & np.isfinite(high)
+        if not finite.any():
+            return
+        t0, t1 = float(times[0]), float(max(times[-1], times[0] + 1e-9))
+        v0, v1 = float(low[finite].min()), float(high[finite].max())
+        v1 = max(v1, v0 + 1e-12)
+        xs = area.left() + (times - t0) / (t1 - t0) * area.width()
+        # Values grow upwards
+        def y(values):
+            return area.bottom() - (values - v0) / (v1 - v0) * area.height()
+
+        # Band: along the maxima, then back along the minima
+        x = xs[finite]
+        band = list(map(QPointF, x.tolist(), y(high[finite]).tolist()))
+        band += list(map(QPointF, x[::-1].tolist(), y(low[finite])[::-1].tolist()))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.bandBrush)
+        painter.drawPolygon(QPolygonF(band))
+        keep = np.isfinite(mean)
+        painter.setPen(self.linePen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPolyline(QPolygonF(
+            list(map(QPointF, xs[keep].tolist(), y(mean[keep]).tolist()))
+        ))
+        # Axis labels: value range on the left, time range below
+        painter.setPen(self.axisPen)
+        right = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        painter.drawText(QRectF(0, area.top() - 8, 46, 16), right, "%.3g" % v1)
+        painter.drawText(QRectF(0, area.bottom() - 8, 46, 16), right, "%.3g" % v0)
+        below = QRectF(area.left(), area.bottom() + 2, area.width(), 18)
+        painter.drawText(below, Qt.AlignmentFlag.AlignLeft, "%g s" % t0)
+        painter.drawText(below, Qt.AlignmentFlag.AlignRight, "%g s" % t1)
+
+# * Plate Overview Class
+class PlateOverview(Widgets.QDockWidget):
+    """Dockable Overview of Every Plate Open in the Session
+
+    Plates are shown as thumbnails drawn from their sample data, so no
+    plate widget exists for plates that are not on screen. A thumbnail
+    is redrawn after its plate changes, once per event-loop tick, and
+    only while the overview is visible.
+    """
+
+    # Emitted with the plate model whose thumbnail was activated
+    plateActivated = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        """Class Initializer"""
+        super().__init__("Plates", parent)
+        # Plates listed, in order, and those whose thumbnail is out of date
+        self.plates = []
+        self.stale = set()
+        self.refreshPending = False
+        self.createList()
+
+    def createList(self):
+        """Create the Thumbnail List"""
+
+        self.thumbnails = Widgets.QListWidget()
+        self.thumbnails.setViewMode(Widgets.QListView.ViewMode.IconMode)
+        self.thumbnails.setIconSize(QSize(*THUMBNAIL_SIZE))
+        self.thumbnails.setResizeMode(Widgets.QListView.ResizeMode.Adjust)
+        self.thumbnails.setMovement(Widgets.QListView.Movement.Static)
+        self.thumbnails.setUniformItemSizes(True)
+        self.thumbnails.setSpacing(4)
+        self.thumbnails.itemClicked.connect(
+            lambda item: self.plateActivated.emit(
+                self.plates[self.thumbnails.row(item)]
+            )
+        )
+        self.setWidget(self.thumbnails)
+
+    def addPlate(self, plate):
+        """List a Plate, Following its Changes"""
+
+        if plate in self.plates:
+            return
+        self.plates.append(plate)
+        self.thumbnails.addItem(Widgets.QListWidgetItem())
+        plate.addListener(self.plateChanged)
+        self.markStale(plate)
+
+    def setCurrent(self, plate):
+        """Mark the Plate Shown in the Main Window"""
+        self.thumbnails.setCurrentRow(self.plates.index(plate))
+
+    def plateChanged(self, change):
+        """Redraw the Thumbnail of a Plate whose Wells Changed Appearance"""
+        if any(field in STYLE_FIELDS for field in change.fields):
+            self.markStale(change.plate)
+
+    def markStale(self, plate):
+        """Queue a Thumbnail for Redrawing"""
+
+        self.stale.add(plate)
+        if self.isVisible() and not self.refreshPending:
+            self.refreshPending = True
+            QTimer.singleShot(0, self.refreshThumbnails)
+
+    def refreshThumbnails(self):
+        """Redraw Every Out-of-Date Thumbnail"""
+
+        self.refreshPending = False
+        for plate in self.stale:
+            item = self.thumbnails.item(self.plates.index(plate))
+            item.setText("%s\n%d wells" % (plate.barcode or "Untitled", plate.wells))
+            item.setIcon(QIcon(QPixmap.fromImage(renderThumbnail(plate))))
+        self.stale.clear()
+
+    def showEvent(self, event):
+        """Catch Up on Thumbnails that Changed While Hidden"""
+        super().showEvent(event)
+        if self.stale:
+            self.refreshThumbnails()
+
+# * Well Plate Interface Class
+class PlateWidget(Widgets.QWidget):
+    """Custom-Painted Interface for Well Plates"""
+
+    # Emitted with the well name (e.g. "A1") whenever a well is clicked
+    wellClicked = pyqtSignal(str)
+    # Emitted when the user changes the selection (click, drag, row,
+    # column or corner label)
+    selectionChanged = pyqtSignal()
+
+    def __init__(self, wells=96):
+        """View Initializer"""
         super().__init__()
-        # Create 96-well interface
+        # Store plate format and its lookup tables
+        self.plateGeometry = geometry.getGeometry(wells)
+        self.wells = wells
+        self.rows, self.cols = self.plateGeometry.rows, self.plateGeometry.cols
+        # Plate model shown; well colours and flags are read from it
+        self.plate = None
+        # Heatmap image drawn over the wells instead of their colours
+        self.heatmap = None
+        # Kinetic curve of each well, scaled to 0-1, drawn inside the wells
+        self.sparklines = None
+        # Worst validation problem of each well: 0 none, 1 warning, 2 error
+        self.problems = np.zeros(wells, dtype=np.uint8)
+        # Create plate interface
         self.createPlate()
 
     def createPlate(self):
         """Create Plate Layout Interface"""
 
-        # Create dictionary to hold buttons
-        self.Wells = {}
-        # Create grid layout for wells (buttons)
-        wellLayout = Widgets.QGridLayout()
-
-        # Create dictionary to store well names (button texts)
-        buttons = {
-            " ": (0,0),  "1": (0,1),  "2": (0,2),  "3": (0,3),  "4": (0,4),  "5": (0,5),  "6": (0,6),  "7": (0,7),  "8": (0,8),  "9": (0,9),  "10": (0,10),  "11": (0,11),  "12": (0,12),
-            "A": (1,0), "A1": (1,1), "A2": (1,2), "A3": (1,3), "A4": (1,4), "A5": (1,5), "A6": (1,6), "A7": (1,7), "A8": (1,8), "A9": (1,9), "A10": (1,10), "A11": (1,11), "A12": (1,12),
-            "B": (2,0), "B1": (2,1), "B2": (2,2), "B3": (2,3), "B4": (2,4), "B5": (2,5), "B6": (2,6), "B7": (2,7), "B8": (2,8), "B9": (2,9), "B10": (2,10), "B11": (2,11), "B12": (2,12),
-            "C": (3,0), "C1": (3,1), "C2": (3,2), "C3": (3,3), "C4": (3,4), "C5": (3,5), "C6": (3,6), "C7": (3,7), "C8": (3,8), "C9": (3,9), "C10": (3,10), "C11": (3,11), "C12": (3,12),
-            "D": (4,0), "D1": (4,1), "D2": (4,2), "D3": (4,3), "D4": (4,4), "D5": (4,5), "D6": (4,6), "D7": (4,7), "D8": (4,8), "D9": (4,9), "D10": (4,10), "D11": (4,11), "D12": (4,12),
-            "E": (5,0), "E1": (5,1), "E2": (5,2), "E3": (5,3), "E4": (5,4), "E5": (5,5), "E6": (5,6), "E7": (5,7), "E8": (5,8), "E9": (5,9), "E10": (5,10), "E11": (5,11), "E12": (5,12),
-            "F": (6,0), "F1": (6,1), "F2": (6,2), "F3": (6,3), "F4": (6,4), "F5": (6,5), "F6": (6,6), "F7": (6,7), "F8": (6,8), "F9": (6,9), "F10": (6,10), "F11": (6,11), "F12": (6,12),
-            "G": (7,0), "G1": (7,1), "G2": (7,2), "G3": (7,3), "G4": (7,4), "G5": (7,5), "G6": (7,6), "G7": (7,7), "G8": (7,8), "G9": (7,9), "G10": (7,10), "G11": (7,11), "G12": (7,12),
-            "H": (8,0), "H1": (8,1), "H2": (8,2), "H3": (8,3), "H4": (8,4), "H5": (8,5), "H6": (8,6), "H7": (8,7), "H8": (8,8), "H9": (8,9), "H10": (8,10), "H11": (8,11), "H12": (8,12)
-        }
+        # Row/column labels and well names come from the plate geometry
+        self.rowLabels = self.plateGeometry.rowLabels
+        self.colLabels = self.plateGeometry.colLabels
+        self.wellNames = self.plateGeometry.names.tolist()
+        # Set drawing resources once; wells are painted, not styled.
+        # Brushes are indexed by well state: empty, one per sample type,
+        # then samples without a type
+        self.wellBrushes = [QBrush(QColor(c)) for c in TYPE_COLOURS]
+        self.wellBrushes.append(QBrush(QColor(FILLED_COLOUR)))
+        self.flagBrush = QBrush(QColor("crimson"))
+        self.highlightPen = QPen(QColor("orange"), 3)
+        self.highlighted = np.empty(0, dtype=np.intp)
+        self.selectPen = QPen(QColor("royalblue"), 3)
+        self.problemPens = [QPen(QColor(c), 2, Qt.PenStyle.DashLine) for c in PROBLEM_COLOURS]
+        self.selected = np.zeros(self.wells, dtype=bool)
+        # Wells waiting to be repainted at the next event-loop tick
+        self.dirty = np.zeros(self.wells, dtype=bool)
+        self.repaintPending = False
+        # Selection being dragged: anchor (row, column) and prior selection
+        self.dragAnchor = None
+        self.dragBase = None
+        self.wellPen = QPen(QColor("dimgrey"))
+        self.sparkPen = QPen(QColor(KINETIC_LINE), 1)
+        self.labelFont = QFont()
+        self.labelFont.setBold(True)
+        self.wellFont = QFont()
+        # Leave room for the header row and column, at 36x22 px per well
+        self.setMinimumSize(
+            min(36 * (self.cols + 1), 1000), min(22 * (self.rows + 1), 600)
+        )
+        self.layoutWells()
+
+    def layoutWells(self):
+        """Compute Well Rectangles for the Current Widget Size"""
+
+        # Each cell (header or well) gets an equal share of the widget
+        self.cellW = self.width() / (self.cols + 1)
+        self.cellH = self.height() / (self.rows + 1)
+        # Leave a small gap between neighbouring wells
+        gapX, gapY = self.cellW * 0.08, self.cellH * 0.1
+        self.wellRects = [
+            QRectF(
+                (col + 1) * self.cellW + gapX, (row + 1) * self.cellH + gapY,
+                self.cellW - 2 * gapX, self.cellH - 2 * gapY
+            )
+            for row in range(self.rows) for col in range(self.cols)
+        ]
+        # Scale fonts with the cell size
+        self.labelFont.setPixelSize(max(int(self.cellH * 0.6), 6))
+        self.wellFont.setPixelSize(max(int(self.cellH * 0.45), 6))
+
+    def setPlate(self, plate):
+        """Show a Plate Model, Following its Changes (None to Detach)"""
+
+        if self.plate is not None:
+            self.plate.removeListener(self.plateChanged)
+        self.plate = plate
+        if plate is not None:
+            plate.addListener(self.plateChanged)
+        self.update()
+
+    def plateChanged(self, change):
+        """Repaint the Wells Whose Appearance a Change Affects"""
+        if any(field in STYLE_FIELDS for field in change.fields):
+            self.markDirty(change.indices)
+
+    def markDirty(self, indices):
+        """Queue Wells for Repainting
+
+        Every well marked during one pass of the event loop is repainted
+        together, by a single update of the area they cover.
+        """
+
+        self.dirty[indices] = True
+        if not self.repaintPending:
+            self.repaintPending = True
+            QTimer.singleShot(0, self.repaintDirty)
+
+    def repaintDirty(self):
+        """Repaint the Area Covering Every Queued Well"""
+
+        self.repaintPending = False
+        indices = np.flatnonzero(self.dirty)
+        if not len(indices):
+            return
+        self.dirty[:] = False
+        rows = self.plateGeometry.row[indices]
+        cols = self.plateGeometry.col[indices]
+        row0, row1 = int(rows.min()), int(rows.max())
+        col0, col1 = int(cols.min()), int(cols.max())
+        area = QRectF(
+            (col0 + 1) * self.cellW, (row0 + 1) * self.cellH,
+            (col1 - col0 + 1) * self.cellW, (row1 - row0 + 1) * self.cellH
+        )
+        # Leave room for the outline pens
+        self.update(area.toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    def setHeatmap(self, image):
+        """Colour the Wells by a Heatmap Image (see renderHeatmap), or None"""
+
+        self.heatmap = image
+        self.update()
 
-        # Create wells (buttons) and add them to the grid layout
-        for txt, pos in buttons.items():
-            if 0 in pos:
-                self.Wells[txt] = Widgets.QLabel(txt)
-                self.Wells[txt].setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.Wells[txt].setFixedSize(50, 30)
-                self.Wells[txt].setStyleSheet("""
-                    background-color: white; font-weight: bold;
-                    font-size: 20px
-                """)
+    def setSparklines(self, lines):
+        """Draw a (Wells, Points) Array of 0-1 Curves in the Wells, or None"""
+
+        self.sparklines = lines
+        self.update()
+
+    def drawSparklines(self, painter, indices):
+        """Draw the Kinetic Curves of Wells, Each Scaled to Fill its Well"""
+
+        lines = self.sparklines[indices]
+        tables = self.plateGeometry
+        gapX, gapY = self.cellW * 0.2, self.cellH * 0.25
+        left = (tables.col[indices] + 1) * self.cellW + gapX
+        bottom = (tables.row[indices] + 2) * self.cellH - gapY
+        xs = left[:, None] + np.linspace(0, self.cellW - 2 * gapX, lines.shape[1])
+        ys = bottom[:, None] - lines * (self.cellH - 2 * gapY)
+        finite = np.isfinite(ys)
+        painter.setPen(self.sparkPen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for x, y, keep in zip(xs, ys, finite):
+            painter.drawPolyline(QPolygonF(
+                list(map(QPointF, x[keep].tolist(), y[keep].tolist()))
+            ))
+
+    def setProblems(self, problems, indices=None):
+        """Outline Wells by their Worst Validation Problem (0, 1 or 2)
+
+        Only the given wells are repainted, or every well by default.
+        """
+
+        self.problems = problems
+        if indices is None:
+            self.update()
+        else:
+            self.markDirty(indices)
+
+    def setHighlighted(self, indices):
+        """Outline the Given Wells (e.g. Search Matches)"""
+
+        indices = np.asarray(indices, dtype=np.intp)
+        self.markDirty(np.union1d(self.highlighted, indices))
+        self.highlighted = indices
+
+    def setSelection(self, indices, notify=True):
+        """Select the Given Wells"""
+
+        selected = np.zeros(self.wells, dtype=bool)
+        selected[indices] = True
+        self.showSelected(selected)
+        if notify:
+            self.selectionChanged.emit()
+
+    def showSelected(self, selected):
+        """Replace the Selection Mask, Repainting Only the Wells that Changed"""
+
+        self.markDirty(np.flatnonzero(selected ^ self.selected))
+        self.selected = selected
+
+    def selection(self):
+        """Return the Indices of the Selected Wells"""
+        return np.flatnonzero(self.selected)
+
+    def cellAt(self, pos):
+        """Return the (Row, Column) Under `pos`; -1 is the Label Row/Column"""
+        return int(pos.y() // self.cellH) - 1, int(pos.x() // self.cellW) - 1
+
+    def wellAt(self, pos):
+        """Return the Index of the Well Under `pos`, or None"""
+
+        col = int(pos.x() // self.cellW) - 1
+        row = int(pos.y() // self.cellH) - 1
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            index = int(self.plateGeometry.index(row, col))
+            if self.wellRects[index].contains(pos):
+                return index
+        return None
+
+    def resizeEvent(self, event):
+        """Recompute Well Geometry on Resize"""
+        self.layoutWells()
+        super().resizeEvent(event)
+
+    def mousePressEvent(self, event):
+        """Hit-Test Clicks and Start Selections"""
+
+        if event.button() != Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+        # Ctrl adds to the current selection
+        add = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        row, col = self.cellAt(event.position())
+        tables = self.plateGeometry
+
+        # Label clicks select a whole row, column, or (corner) the plate
+        if row == -1 and col == -1:
+            indices = np.arange(self.wells)
+        elif row == -1 and 0 <= col < self.cols:
+            indices = tables.colIndices(col)
+        elif col == -1 and 0 <= row < self.rows:
+            indices = tables.rowIndices(row)
+        else:
+            index = self.wellAt(event.position())
+            if index is None:
+                return super().mousePressEvent(event)
+            # Start a rectangle selection at this well
+            self.dragAnchor = (row, col)
+            self.dragBase = self.selected.copy() if add else None
+            if add:
+                self.selected[index] = not self.selected[index]
+                self.markDirty([index])
             else:
-                self.Wells[txt] = Widgets.QPushButton(txt)
-                self.Wells[txt].setFixedSize(50, 30)
-                self.Wells[txt].setStyleSheet("background-color: grey; font-size: 14px")
-            # Set style for empty cell
-            self.Wells[" "].setStyleSheet("background-color: none")
-            # Add button/label to layout
-            wellLayout.addWidget(self.Wells[txt], pos[0], pos[1])
-        # Add button layout to base well layout
-        self.setLayout(wellLayout)
+                self.setSelection([index], notify=False)
+            return
+        if add:
+            indices = np.union1d(self.selection(), indices)
+        self.setSelection(indices)
+
+    def mouseMoveEvent(self, event):
+        """Extend a Rectangle Selection While Dragging"""
+
+        if self.dragAnchor is None:
+            return super().mouseMoveEvent(event)
+        row, col = self.cellAt(event.position())
+        row = min(max(row, 0), self.rows - 1)
+        col = min(max(col, 0), self.cols - 1)
+        if (row, col) == self.dragAnchor:
+            return
+        selected = (
+            np.zeros(self.wells, dtype=bool) if self.dragBase is None
+            else self.dragBase.copy()
+        )
+        selected[self.plateGeometry.rectIndices(*self.dragAnchor, row, col)] = True
+        self.showSelected(selected)
+
+    def mouseReleaseEvent(self, event):
+        """Finish a Click or Rectangle Selection"""
+
+        if self.dragAnchor is None:
+            return super().mouseReleaseEvent(event)
+        anchor, self.dragAnchor = self.dragAnchor, None
+        # A plain click on a single well still reports that well
+        selection = self.selection()
+        if self.dragBase is None and len(selection) == 1:
+            self.wellClicked.emit(self.wellNames[selection[0]])
+        self.dragBase = None
+        self.selectionChanged.emit()
+
+    def exposedWells(self, rect):
+        """Return the Indices of the Wells Overlapping a Widget Rectangle"""
+
+        row0 = max(int(rect.top() // self.cellH) - 1, 0)
+        row1 = min(int(rect.bottom() // self.cellH) - 1, self.rows - 1)
+        col0 = max(int(rect.left() // self.cellW) - 1, 0)
+        col1 = min(int(rect.right() // self.cellW) - 1, self.cols - 1)
+        if row0 > row1 or col0 > col1:
+            return np.empty(0, dtype=np.intp)
+        return self.plateGeometry.rectIndices(row0, col0, row1, col1)
+
+    def paintEvent(self, event):
+        """Paint the Labels and Wells Inside the Exposed Area"""
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        center = Qt.AlignmentFlag.AlignCenter
+        exposed = event.rect()
+
+        # Draw row and column labels
+        painter.setFont(self.labelFont)
+        if exposed.top() < self.cellH:
+            for col, txt in enumerate(self.colLabels):
+                painter.drawText(
+                    QRectF((col + 1) * self.cellW, 0, self.cellW, self.cellH),
+                    center, txt
+                )
+        if exposed.left() < self.cellW:
+            for row, txt in enumerate(self.rowLabels):
+                painter.drawText(
+                    QRectF(0, (row + 1) * self.cellH, self.cellW, self.cellH),
+                    center, txt
+                )
+
+        # Draw exposed wells, one brush at a time
+        indices = self.exposedWells(exposed)
+        if not len(indices):
+            return
+        if self.heatmap is not None:
+            # One scaled draw colours every well
+            painter.drawImage(QRectF(
+                self.cellW, self.cellH, self.cols * self.cellW, self.rows * self.cellH
+            ), self.heatmap)
+        else:
+            if self.plate is None:
+                states = np.zeros(len(indices), dtype=np.intp)
+            else:
+                states = wellStates(self.plate, indices)
+            painter.setPen(self.wellPen)
+            for state in np.unique(states).tolist():
+                painter.setBrush(self.wellBrushes[state])
+                for index in indices[states == state].tolist():
+                    painter.drawRoundedRect(self.wellRects[index], 3, 3)
+
+        if self.sparklines is not None:
+            self.drawSparklines(painter, indices)
+
+        # Mark flagged wells with a dot in their top-right corner
+        if self.plate is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.flagBrush)
+            radius = min(self.cellW, self.cellH) * 0.15
+            for index in indices[self.plate.flagged[indices]].tolist():
+                rect = self.wellRects[index]
+                painter.drawEllipse(
+                    QPointF(rect.right() - radius, rect.top() + radius),
+                    radius, radius
+                )
+
+        # Outline search matches and the selection, over any problems
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        problems = self.problems[indices]
+        for level, pen in enumerate(self.problemPens, 1):
+            painter.setPen(pen)
+            for index in indices[problems == level].tolist():
+                painter.drawRoundedRect(self.wellRects[index], 3, 3)
+        painter.setPen(self.highlightPen)
+        shown = np.zeros(self.wells, dtype=bool)
+        shown[indices] = True
+        for index in self.highlighted[shown[self.highlighted]].tolist():
+            painter.drawRoundedRect(self.wellRects[index], 3, 3)
+        painter.setPen(self.selectPen)
+        for index in indices[self.selected[indices]].tolist():
+            painter.drawRoundedRect(self.wellRects[index], 3, 3)
+
+        # Well names, if there is room for them
+        if self.cellW >= 40:
+            painter.setFont(self.wellFont)
+            painter.setPen(QColor("black"))
+            for index in indices.tolist():
+                painter.drawText(self.wellRects[index], center, self.wellNames[index])
+
+# * 96-Well Plate Interface Class
+class Plate96(PlateWidget):
+    """Interface for 96-Well Plates"""
+
+    def __init__(self):
+        """View Initializer"""
+        super().__init__(96)
 
 # * 384-Well Plate Interface Class
-class Plate384(Widgets.QWidget):
+class Plate384(PlateWidget):
     """Interface for 384-Well Plates"""
 
     def __init__(self):
-        super().__init__()
-        # Create 384-well interface
-        self.createPlate()
-
-    def createPlate(self):
-        """Create Plate Layout Interface"""
+        """View Initializer"""
+        super().__init__(384)
 
-        # Create dictionary to hold buttons
-        self.Wells = {}
-        # Create grid layout for wells (buttons)
-        wellLayout = Widgets.QGridLayout()
-
-        # Create dictionary to store well names (button texts)
-        buttons = {
-            " ": (0,0),   "1": (0,1),   "2": (0,2),   "3": (0,3),   "4": (0,4),   "5": (0,5),   "6": (0,6),   "7": (0,7),   "8": (0,8),   "9": (0,9),   "10": (0,10),   "11": (0,11),   "12": (0,12),   "13": (0,13),   "14": (0,14),   "15": (0,15),   "16": (0,16),   "17": (0,17),   "18": (0,18),   "19": (0,19),   "20": (0,20),   "21": (0,21),   "22": (0,22),   "23": (0,23),  " 24": (0,24),
-            "A": (1,0),  "A1": (1,1),  "A2": (1,2),  "A3": (1,3),  "A4": (1,4),  "A5": (1,5),  "A6": (1,6),  "A7": (1,7),  "A8": (1,8),  "A9": (1,9),  "A10": (1,10),  "A11": (1,11),  "A12": (1,12),  "A13": (1,13),  "A14": (1,14),  "A15": (1,15),  "A16": (1,16),  "A17": (1,17),  "A18": (1,18),  "A19": (1,19),  "A20": (1,20),  "A21": (1,21),  "A22": (1,22),  "A23": (1,23), " A24": (1,24),
-            "B": (2,0),  "B1": (2,1),  "B2": (2,2),  "B3": (2,3),  "B4": (2,4),  "B5": (2,5),  "B6": (2,6),  "B7": (2,7),  "B8": (2,8),  "B9": (2,9),  "B10": (2,10),  "B11": (2,11),  "B12": (2,12),  "B13": (2,13),  "B14": (2,14),  "B15": (2,15),  "B16": (2,16),  "B17": (2,17),  "B18": (2,18),  "B19": (2,19),  "B20": (2,20),  "B21": (2,21),  "B22": (2,22),  "B23": (2,23), " B24": (2,24),
-            "C": (3,0),  "C1": (3,1),  "C2": (3,2),  "C3": (3,3),  "C4": (3,4),  "C5": (3,5),  "C6": (3,6),  "C7": (3,7),  "C8": (3,8),  "C9": (3,9),  "C10": (3,10),  "C11": (3,11),  "C12": (3,12),  "C13": (3,13),  "C14": (3,14),  "C15": (3,15),  "C16": (3,16),  "C17": (3,17),  "C18": (3,18),  "C19": (3,19),  "C20": (3,20),  "C21": (3,21),  "C22": (3,22),  "C23": (3,23), " C24": (3,24),
-            "D": (4,0),  "D1": (4,1),  "D2": (4,2),  "D3": (4,3),  "D4": (4,4),  "D5": (4,5),  "D6": (4,6),  "D7": (4,7),  "D8": (4,8),  "D9": (4,9),  "D10": (4,10),  "D11": (4,11),  "D12": (4,12),  "D13": (4,13),  "D14": (4,14),  "D15": (4,15),  "D16": (4,16),  "D17": (4,17),  "D18": (4,18),  "D19": (4,19),  "D20": (4,20),  "D21": (4,21),  "D22": (4,22),  "D23": (4,23), " D24": (4,24),
-            "E": (5,0),  "E1": (5,1),  "E2": (5,2),  "E3": (5,3),  "E4": (5,4),  "E5": (5,5),  "E6": (5,6),  "E7": (5,7),  "E8": (5,8),  "E9": (5,9),  "E10": (5,10),  "E11": (5,11),  "E12": (5,12),  "E13": (5,13),  "E14": (5,14),  "E15": (5,15),  "E16": (5,16),  "E17": (5,17),  "E18": (5,18),  "E19": (5,19),  "E20": (5,20),  "E21": (5,21),  "E22": (5,22),  "E23": (5,23), " E24": (5,24),
-            "F": (6,0),  "F1": (6,1),  "F2": (6,2),  "F3": (6,3),  "F4": (6,4),  "F5": (6,5),  "F6": (6,6),  "F7": (6,7),  "F8": (6,8),  "F9": (6,9),  "F10": (6,10),  "F11": (6,11),  "F12": (6,12),  "F13": (6,13),  "F14": (6,14),  "F15": (6,15),  "F16": (6,16),  "F17": (6,17),  "F18": (6,18),  "F19": (6,19),  "F20": (6,20),  "F21": (6,21),  "F22": (6,22),  "F23": (6,23), " F24": (6,24),
-            "G": (7,0),  "G1": (7,1),  "G2": (7,2),  "G3": (7,3),  "G4": (7,4),  "G5": (7,5),  "G6": (7,6),  "G7": (7,7),  "G8": (7,8),  "G9": (7,9),  "G10": (7,10),  "G11": (7,11),  "G12": (7,12),  "G13": (7,13),  "G14": (7,14),  "G15": (7,15),  "G16": (7,16),  "G17": (7,17),  "G18": (7,18),  "G19": (7,19),  "G20": (7,20),  "G21": (7,21),  "G22": (7,22),  "G23": (7,23), " G24": (7,24),
-            "H": (8,0),  "H1": (8,1),  "H2": (8,2),  "H3": (8,3),  "H4": (8,4),  "H5": (8,5),  "H6": (8,6),  "H7": (8,7),  "H8": (8,8),  "H9": (8,9),  "H10": (8,10),  "H11": (8,11),  "H12": (8,12),  "H13": (8,13),  "H14": (8,14),  "H15": (8,15),  "H16": (8,16),  "H17": (8,17),  "H18": (8,18),  "H19": (8,19),  "H20": (8,20),  "H21": (8,21),  "H22": (8,22),  "H23": (8,23), " H24": (8,24),
-            "I": (9,0),  "I1": (9,1),  "I2": (9,2),  "I3": (9,3),  "I4": (9,4),  "I5": (9,5),  "I6": (9,6),  "I7": (9,7),  "I8": (9,8),  "I9": (9,9),  "I10": (9,10),  "I11": (9,11),  "I12": (9,12),  "I13": (9,13),  "I14": (9,14),  "I15": (9,15),  "I16": (9,16),  "I17": (9,17),  "I18": (9,18),  "I19": (9,19),  "I20": (9,20),  "I21": (9,21),  "I22": (9,22),  "I23": (9,23), " I24": (9,24),
-            "J": (10,0), "J1": (10,1), "J2": (10,2), "J3": (10,3), "J4": (10,4), "J5": (10,5), "J6": (10,6), "J7": (10,7), "J8": (10,8), "J9": (10,9), "J10": (10,10), "J11": (10,11), "J12": (10,12), "J13": (10,13), "J14": (10,14), "J15": (10,15), "J16": (10,16), "J17": (10,17), "J18": (10,18), "J19": (10,19), "J20": (10,20), "J21": (10,21), "J22": (10,22), "J23": (10,23), "J24": (10,24),
-            "K": (11,0), "K1": (11,1), "K2": (11,2), "K3": (11,3), "K4": (11,4), "K5": (11,5), "K6": (11,6), "K7": (11,7), "K8": (11,8), "K9": (11,9), "K10": (11,10), "K11": (11,11), "K12": (11,12), "K13": (11,13), "K14": (11,14), "K15": (11,15), "K16": (11,16), "K17": (11,17), "K18": (11,18), "K19": (11,19), "K20": (11,20), "K21": (11,21), "K22": (11,22), "K23": (11,23), "K24": (11,24),
-            "L": (12,0), "L1": (12,1), "L2": (12,2), "L3": (12,3), "L4": (12,4), "L5": (12,5), "L6": (12,6), "L7": (12,7), "L8": (12,8), "L9": (12,9), "L10": (12,10), "L11": (12,11), "L12": (12,12), "L13": (12,13), "L14": (12,14), "L15": (12,15), "L16": (12,16), "L17": (12,17), "L18": (12,18), "L19": (12,19), "L20": (12,20), "L21": (12,21), "L22": (12,22), "L23": (12,23), "L24": (12,24),
-            "M": (13,0), "M1": (13,1), "M2": (13,2), "M3": (13,3), "M4": (13,4), "M5": (13,5), "M6": (13,6), "M7": (13,7), "M8": (13,8), "M9": (13,9), "M10": (13,10), "M11": (13,11), "M12": (13,12), "M13": (13,13), "M14": (13,14), "M15": (13,15), "M16": (13,16), "M17": (13,17), "M18": (13,18), "M19": (13,19), "M20": (13,20), "M21": (13,21), "M22": (13,22), "M23": (13,23), "M24": (13,24),
-            "N": (14,0), "N1": (14,1), "N2": (14,2), "N3": (14,3), "N4": (14,4), "N5": (14,5), "N6": (14,6), "N7": (14,7), "N8": (14,8), "N9": (14,9), "N10": (14,10), "N11": (14,11), "N12": (14,12), "N13": (14,13), "N14": (14,14), "N15": (14,15), "N16": (14,16), "N17": (14,17), "N18": (14,18), "N19": (14,19), "N20": (14,20), "N21": (14,21), "N22": (14,22), "N23": (14,23), "N24": (14,24),
-            "O": (15,0), "O1": (15,1), "O2": (15,2), "O3": (15,3), "O4": (15,4), "O5": (15,5), "O6": (15,6), "O7": (15,7), "O8": (15,8), "O9": (15,9), "O10": (15,10), "O11": (15,11), "O12": (15,12), "O13": (15,13), "O14": (15,14), "O15": (15,15), "O16": (15,16), "O17": (15,17), "O18": (15,18), "O19": (15,19), "O20": (15,20), "O21": (15,21), "O22": (15,22), "O23": (15,23), "O24": (15,24),
-            "P": (16,0), "P1": (16,1), "P2": (16,2), "P3": (16,3), "P4": (16,4), "P5": (16,5), "P6": (16,6), "P7": (16,7), "P8": (16,8), "P9": (16,9), "P10": (16,10), "P11": (16,11), "P12": (16,12), "P13": (16,13), "P14": (16,14), "P15": (16,15), "P16": (16,16), "P17": (16,17), "P18": (16,18), "P19": (16,19), "P20": (16,20), "P21": (16,21), "P22": (16,22), "P23": (16,23), "P24": (16,24)
-        }
+# * 1536-Well Plate Interface Class
+class Plate1536(PlateWidget):
+    """Interface for 1536-Well Plates"""
 
-        # Create wells (buttons) anda dd them to the grid layout
-        for txt, pos in buttons.items():
-            if 0 in pos:
-                self.Wells[txt] = Widgets.QLabel(txt)
-                self.Wells[txt].setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.Wells[txt].setFixedSize(50, 30)
-                self.Wells[txt].setStyleSheet("""
-                    background-color: white; font-weight: bold;
-                    font-size: 20px
-                """)
-            else:
-                self.Wells[txt] = Widgets.QPushButton(txt)
-                self.Wells[txt].setFixedSize(50, 30)
-                self.Wells[txt].setStyleSheet("background-color: grey; font-size: 14px")
-            # Add button/label to layout
-            wellLayout.addWidget(self.Wells[txt], pos[0], pos[1])
-        # Add button layout to base well layout
-        self.setLayout(wellLayout)
\ No newline at end of file
+    def __init__(self):
+        """View Initializer"""
+        super().__init__(1536)
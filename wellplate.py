@@ -15,26 +15,99 @@
           operations, and returns an answer or result.
         - The controller receives the model's answer and updates the view accordingly.
         - The user finnally sees the requested result as an update on the view.
+
+    Run with a command (validate, convert, reformat, export or merge) it
+    works on plate files from the command line instead; see cli.py.
+    With --profile the GUI records how long its handlers, paints and
+    event-loop passes take (Help > Profiler); see profiling.py.
 """
 
 # Import modules
-from PyQt6.QtWidgets import QApplication
-import controller as ctrl
-import view
-import model
 import sys
+import time
+
+# Process start, for the start-up timing mode
+START = time.perf_counter()
+
+# * Startup Timer Class
+class StartupTimer:
+    """Record Start-Up Milestones and Report Them (`--timing`)
+
+    Times are measured from when this script started running: imports
+    done, QApplication created, main window first painted, and first
+    interactive - the first event-loop pass after that paint, when the
+    window can respond to the user.
+    """
+
+    def __init__(self):
+        """Class Initializer"""
+        self.marks = []
+
+    def mark(self, name):
+        """Record a Milestone"""
+        self.marks.append((name, time.perf_counter() - START))
+
+    def watch(self, window, app):
+        """Record the First Paint of `window`, then Report and Quit"""
+
+        from PyQt6.QtCore import QObject, QEvent, QTimer
+
+        timer = self
+
+        class FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    obj.removeEventFilter(self)
+                    timer.mark("first paint")
+                    QTimer.singleShot(0, interactive)
+                return False
+
+        def interactive():
+            timer.mark("first interactive")
+            timer.report()
+            app.quit()
+
+        self.filter = FirstPaint()
+        window.installEventFilter(self.filter)
+
+    def report(self):
+        """Print Every Milestone"""
+        for name, seconds in self.marks:
+            print("%-24s %8.1f ms" % (name, seconds * 1000))
 
 # Define Main Loop
 def main():
     """WellPlate Main Function"""
 
+    # Batch commands run headless, without importing Qt
+    import cli
+    if cli.wants(sys.argv[1:]):
+        sys.exit(cli.main(sys.argv[1:]))
+
+    timing = "--timing" in sys.argv
+    if timing:
+        sys.argv.remove("--timing")
+    profile = "--profile" in sys.argv
+    if profile:
+        sys.argv.remove("--profile")
+    timer = StartupTimer()
+
+    # Qt and the plate modules are only imported once they are needed
+    from PyQt6.QtWidgets import QApplication
+    import controller as ctrl
+    import view
+    timer.mark("imports")
+
     wellplate = QApplication(sys.argv)
+    timer.mark("QApplication")
     app_view = view.MainWindow()
+    if timing:
+        timer.watch(app_view, wellplate)
     app_view.show()
-    app_ctrl = ctrl.PlateCtrl(view=app_view, model=None)
-    
+    app_ctrl = ctrl.PlateCtrl(view=app_view, model=None, profile=profile)
+
     # Execute main loop
     sys.exit(wellplate.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
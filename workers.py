@@ -0,0 +1,209 @@
+"""
+    Filename: Workers.py
+
+    Background tasks for the I/O-heavy actions of WellPlate: reading and
+    writing plate files, importing sample manifests and kinetic reads,
+    writing worklists, and loading and storing plates in the plate database.
+
+    A task runs a function on Qt's global thread pool and reports back
+    through signals, which are delivered on the GUI thread:
+
+        - progress(done, total), sent at most every `interval` seconds;
+        - partial(items), the results produced since the last progress
+          report, so the GUI receives them in a few coalesced batches
+          rather than one signal per plate;
+        - result(value) or error(exception) or cancelled(), then finished().
+
+    The task function receives the task as its first argument and calls
+    `task.checkpoint(done, total)` as it goes; once the task has been
+    cancelled, the next checkpoint raises `Cancelled` and unwinds it.
+    Plates handed to a task must not be edited while it runs, so the
+    controller passes copies.
+"""
+
+# Import modules
+import os
+import time
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Seconds between progress reports (and partial result batches)
+INTERVAL = 0.05
+
+class Cancelled(Exception):
+    """Raised Inside a Task at its Next Checkpoint Once it is Cancelled"""
+
+# * Task Signals Class
+class TaskSignals(QObject):
+    """Signals of a Task (QRunnable Cannot Emit Signals Itself)"""
+
+    progress = pyqtSignal(int, int)
+    partial = pyqtSignal(object)
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+# * Task Class
+class Task(QRunnable):
+    """Run `fn(task, *args)` on a Worker Thread"""
+
+    def __init__(self, fn, *args, interval=INTERVAL):
+        """Class Initializer"""
+
+        super().__init__()
+        # Tasks are kept alive by the runner, not deleted by the pool
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.interval = interval
+        self.signals = TaskSignals()
+        self.isCancelled = False
+        self.lastReport = 0.0
+        self.pending = []
+
+    def cancel(self):
+        """Ask the Task to Stop at its Next Checkpoint"""
+        self.isCancelled = True
+
+    def checkpoint(self, done, total):
+        """Report Progress and Pending Results; Raise `Cancelled` if Cancelled"""
+
+        if self.isCancelled:
+            raise Cancelled()
+        now = time.monotonic()
+        if now - self.lastReport >= self.interval:
+            self.lastReport = now
+            self.flush()
+            self.signals.progress.emit(done, total)
+
+    def deliver(self, item):
+        """Queue a Partial Result, Sent with the Next Progress Report"""
+        self.pending.append(item)
+
+    def flush(self):
+        """Send the Queued Partial Results"""
+
+        if self.pending:
+            items, self.pending = self.pending, []
+            self.signals.partial.emit(items)
+
+    def run(self):
+        """Run the Task Function (on a Worker Thread)"""
+
+        try:
+            result = self.fn(self, *self.args)
+        except Cancelled:
+            self.flush()
+            self.signals.cancelled.emit()
+        except Exception as err:
+            self.signals.error.emit(err)
+        else:
+            self.flush()
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+# * Task Runner Class
+class TaskRunner:
+    """Start Tasks on the Thread Pool and Keep Track of Running Ones"""
+
+    def __init__(self, pool=None):
+        """Class Initializer"""
+
+        self.pool = QThreadPool.globalInstance() if pool is None else pool
+        self.tasks = set()
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def start(self, task):
+        """Start a Task; it is Forgotten Once Finished"""
+
+        self.tasks.add(task)
+        task.signals.finished.connect(lambda: self.tasks.discard(task))
+        self.pool.start(task)
+        return task
+
+    def shutdown(self, timeout=5000):
+        """Cancel Every Running Task and Wait for the Threads to Stop"""
+
+        for task in list(self.tasks):
+            task.cancel()
+        return self.pool.waitForDone(timeout)
+
+# Task functions: each takes the running task first
+
+def readPlates(task, path, index=None):
+    """Read the Plates of a File, or Only Plate `index` of a Library
+
+    Library plates are decoded one at a time and delivered as partial
+    results; a JSON file holds a single plate, a CSV file one per value
+    of its Plate column.
+    """
+
+    import plateio
+    if not path.lower().endswith(plateio.EXTENSION):
+        task.checkpoint(0, 1)
+        for plate in plateio.loadPlates(path):
+            task.deliver(plate)
+        return None
+    with plateio.PlateLibrary(path) as library:
+        indices = range(len(library)) if index is None else [index]
+        for done, i in enumerate(indices):
+            task.checkpoint(done, len(indices))
+            task.deliver(library[i])
+    return None
+
+def writePlate(task, path, plate):
+    """Write a Plate to a File"""
+
+    import plateio
+    task.checkpoint(0, 1)
+    plateio.savePlate(path, plate)
+    return path
+
+def loadStored(task, dbPath, barcode):
+    """Load a Plate from the Plate Database"""
+
+    import repository
+    task.checkpoint(0, 1)
+    # SQLite connections belong to one thread, so each task opens its own
+    with repository.PlateRepository(dbPath) as repo:
+        return repo.loadPlate(barcode)
+
+def storePlates(task, dbPath, plates):
+    """Save Plates to the Plate Database"""
+
+    import repository
+    with repository.PlateRepository(dbPath) as repo:
+        for done, plate in enumerate(plates):
+            task.checkpoint(done, len(plates))
+            repo.savePlate(plate)
+    return len(plates)
+
+def importManifest(task, path, wells, order, barcode):
+    """Import a Sample Manifest, Delivering Each Plate Once it is Filled"""
+
+    import importer
+    manifest = importer.ManifestImporter(wells, order, barcode)
+    # Progress is counted in KiB read, to stay within the signal's int range
+    size = os.path.getsize(path) // 1024
+    for plate in manifest.importFile(path):
+        task.checkpoint(manifest.bytesRead // 1024, size)
+        task.deliver(plate)
+    return manifest.samples
+
+def writeWorklist(task, path, transfers):
+    """Order a Worklist's Transfers and Write it; Return the Tips Used"""
+
+    task.checkpoint(0, 2)
+    transfers.optimize()
+    task.checkpoint(1, 2)
+    transfers.write(path)
+    return transfers.tipChanges()
+
+def importKinetics(task, path, storePath, wells):
+    """Import a Kinetic Read into a Kinetic Store; Return the Store's Path"""
+
+    import kinetics
+    return kinetics.importCSV(path, storePath, wells, task.checkpoint)
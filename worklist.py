@@ -0,0 +1,237 @@
+"""
+    Filename: Worklist.py
+
+    Transfer worklists for liquid handlers.
+
+    A worklist lists, in the order the robot should carry them out, every
+    transfer of a reformat: source plate and well, destination plate and
+    well, and volume. It is written as a generic CSV file that liquid
+    handler software can import.
+
+    Transfers are grouped by source and destination plate, so each pair of
+    plates is visited once, and ordered within a group to cut head travel
+    and tip changes: a nearest-neighbour tour first, then improved with
+    2-opt moves. The cost of going from one transfer to the next is the
+    head travel between their source wells plus the travel between their
+    destination wells, plus a fixed cost for fetching a new tip whenever
+    the source sample changes. Both steps work on chunks of a bounded
+    size and the 2-opt moves only reverse short runs of transfers, so
+    ordering stays close to linear in the number of transfers.
+"""
+
+# Import modules
+import csv
+import numpy as np
+import model
+
+# Travel (mm) charged for changing tips, i.e. for a new source sample
+TIP_TRAVEL = 200.0
+
+# Transfers per nearest-neighbour chunk; plate pairs with fewer
+# transfers keep their snake order and are left to 2-opt
+CHUNK = 1024
+NEAREST_MIN = 16
+
+# Longest run of transfers a 2-opt move reverses
+WINDOW = 32
+
+# Largest number of 2-opt passes over a worklist
+PASSES = 50
+
+# Column headers of the CSV worklist
+HEADER = ("Source Plate", "Source Well", "Destination Plate",
+          "Destination Well", "Volume")
+
+def wellPositions(tables, indices):
+    """Return the (x, y) Centres (mm) of Wells, from the Plate Geometry"""
+    return tables.x[indices].astype(np.float32), tables.y[indices].astype(np.float32)
+
+# * Worklist Class
+class Worklist:
+    """Transfers of a Reformat, in the Order they are Carried Out"""
+
+    def __init__(self, wellMap, volumes, sourceBarcodes, destBarcodes):
+        """Class Initializer
+
+        `volumes` holds the volume (uL) of each transfer of `wellMap`.
+        """
+
+        self.map = wellMap
+        self.volume = np.broadcast_to(
+            np.asarray(volumes, dtype=np.float64), (len(wellMap),)
+        )
+        self.sourceBarcodes = list(sourceBarcodes)
+        self.destBarcodes = list(destBarcodes)
+        self.order = np.arange(len(wellMap))
+        # Source sample of each transfer: a tip is reused only within one
+        self.sample = wellMap.srcPlate * wellMap.source.wells + wellMap.srcWell
+        self.srcX, self.srcY = wellPositions(wellMap.source, wellMap.srcWell)
+        self.dstX, self.dstY = wellPositions(wellMap.dest, wellMap.dstWell)
+
+    @classmethod
+    def fromPlates(cls, wellMap, sources, destBarcodes=None, volume=None):
+        """Build the Worklist of a Reformat from its Source Plates
+
+        Empty source wells are left out. Each transfer moves `volume` uL,
+        or by default the whole sample, as recorded in the source plates'
+        volume column.
+        """
+
+        if not isinstance(sources, model.PlateStack):
+            sources = model.PlateStack.fromPlates(sources)
+        occupied = sources.occupied()[wellMap.srcPlate, wellMap.srcWell]
+        keep = np.flatnonzero(occupied)
+        wellMap = type(wellMap)(
+            wellMap.source.wells, wellMap.dest.wells, wellMap.srcPlate[keep],
+            wellMap.srcWell[keep], wellMap.dstPlate[keep], wellMap.dstWell[keep],
+            wellMap.destPlates
+        )
+        if volume is None:
+            volume = sources.columns["volume"][wellMap.srcPlate, wellMap.srcWell]
+            missing = np.flatnonzero(np.isnan(volume))
+            if len(missing):
+                k = missing[0]
+                raise ValueError("Well %s of plate %s has no volume" % (
+                    wellMap.source.names[wellMap.srcWell[k]],
+                    sources.barcodes[wellMap.srcPlate[k]] or wellMap.srcPlate[k] + 1
+                ))
+        if destBarcodes is None:
+            destBarcodes = [""] * wellMap.destPlates
+        return cls(wellMap, volume, sources.barcodes, destBarcodes)
+
+    def __len__(self):
+        return len(self.order)
+
+    def edgeCost(self, a, b):
+        """Return the Cost of Going from Transfers `a` to Transfers `b`
+
+        The head moves along both axes at once, so a move takes as long as
+        its longer axis.
+        """
+
+        return (
+            np.maximum(np.abs(self.srcX[a] - self.srcX[b]), np.abs(self.srcY[a] - self.srcY[b]))
+            + np.maximum(np.abs(self.dstX[a] - self.dstX[b]), np.abs(self.dstY[a] - self.dstY[b]))
+            + TIP_TRAVEL * (self.sample[a] != self.sample[b])
+        )
+
+    def travel(self, order=None):
+        """Return the Total Cost of Carrying Out the Transfers in Order"""
+
+        order = self.order if order is None else order
+        return float(self.edgeCost(order[:-1], order[1:]).sum())
+
+    def tipChanges(self, order=None):
+        """Return the Number of Tips Used, One per Run of the Same Source Sample"""
+
+        order = self.order if order is None else order
+        return int(len(order) > 0) + int(np.count_nonzero(np.diff(self.sample[order])))
+
+    def optimize(self):
+        """Order the Transfers to Cut Head Travel and Tip Changes"""
+
+        wellMap = self.map
+        tables = wellMap.source
+        # Start from transfers sorted by source and destination plate, then
+        # along source rows (a snake, each row in the opposite direction)
+        row = tables.row[wellMap.srcWell].astype(np.intp)
+        col = tables.col[wellMap.srcWell].astype(np.intp)
+        order = np.lexsort((
+            wellMap.dstWell, np.where(row % 2, -col, col), row,
+            wellMap.dstPlate, wellMap.srcPlate
+        ))
+        # Each source/destination plate pair is visited once
+        pairs = wellMap.srcPlate[order] * (wellMap.destPlates + 1) + wellMap.dstPlate[order]
+        breaks = np.flatnonzero(np.diff(pairs)) + 1
+        starts = np.r_[0, breaks]
+        stops = np.r_[breaks, len(order)]
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            if stop - start >= NEAREST_MIN:
+                order[start:stop] = self.nearestNeighbour(order[start:stop])
+        group = np.repeat(np.arange(len(starts)), stops - starts)
+        self.order = self.twoOpt(order, group)
+        return self.order
+
+    def nearestNeighbour(self, transfers):
+        """Return a Nearest-Neighbour Tour of Transfers, Taken in Chunks
+
+        Each chunk of the given order is toured from the transfer nearest
+        to where the last chunk ended.
+        """
+
+        tour = []
+        for chunk in np.array_split(transfers, -(-len(transfers) // CHUNK)):
+            left = chunk.copy()
+            size = len(left)
+            k = int(np.argmin(self.edgeCost(tour[-1], left))) if tour else 0
+            while size:
+                current = left[k]
+                tour.append(current)
+                size -= 1
+                left[k] = left[size]
+                if size:
+                    k = int(np.argmin(self.edgeCost(current, left[:size])))
+        return np.array(tour, dtype=np.intp)
+
+    def twoOpt(self, tour, group, window=WINDOW, passes=PASSES):
+        """Improve a Tour by Reversing Runs of Up To `window` Transfers
+
+        Runs never cross from one plate pair (`group`) into the next. Each
+        pass scores every short reversal at once, then carries out as many
+        improving, non-overlapping ones as it can, best first.
+        """
+
+        tour = tour.copy()
+        if len(tour) < 4:
+            return tour
+        steps = np.arange(2, window + 1)
+        # Reversing tour[i + 1:j + 1] replaces edges (i, i+1) and (j, j+1)
+        # with (i, j) and (i+1, j+1)
+        i = np.arange(len(tour) - 3)[:, None]
+        j = np.minimum(i + steps, len(tour) - 2)
+        valid = (j > i + 1) & (group[i] == group[j + 1])
+        rows, cols = np.nonzero(valid)
+        i, j = rows, j[rows, cols]
+        for _ in range(passes):
+            edges = self.edgeCost(tour[:-1], tour[1:])
+            delta = (
+                self.edgeCost(tour[i], tour[j]) + self.edgeCost(tour[i + 1], tour[j + 1])
+                - edges[i] - edges[j]
+            )
+            candidates = np.flatnonzero(delta < -1e-9)
+            if not len(candidates):
+                break
+            candidates = candidates[np.argsort(delta[candidates])]
+            taken = np.zeros(len(tour), dtype=bool)
+            for start, stop in zip(i[candidates].tolist(), (j[candidates] + 1).tolist()):
+                if taken[start:stop + 1].any():
+                    continue
+                taken[start:stop + 1] = True
+                tour[start + 1:stop] = tour[start + 1:stop][::-1]
+            # Only reversals touching the runs just reversed can now improve
+            near = np.convolve(taken, np.ones(2 * window + 1, dtype=bool), "same") > 0
+            keep = near[i]
+            i, j = i[keep], j[keep]
+        return tour
+
+    def rows(self):
+        """Return the Transfers in Order, as CSV Rows"""
+
+        wellMap, order = self.map, self.order
+        srcPlate, dstPlate = wellMap.srcPlate[order], wellMap.dstPlate[order]
+        return zip(
+            [self.sourceBarcodes[p] or "Source%d" % (p + 1) for p in srcPlate.tolist()],
+            wellMap.source.names[wellMap.srcWell[order]].tolist(),
+            [self.destBarcodes[p] or "Dest%d" % (p + 1) for p in dstPlate.tolist()],
+            wellMap.dest.names[wellMap.dstWell[order]].tolist(),
+            # Written in full (shortest exact form), never rounded
+            [repr(v) for v in self.volume[order].tolist()],
+        )
+
+    def write(self, path):
+        """Write the Worklist as a Generic CSV File"""
+
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADER)
+            writer.writerows(self.rows())